@@ -7,6 +7,9 @@ Supports both GUI mode (default) and CLI-only diagnostic mode (--cli).
 Usage:
     python main.py          # Full GUI mode with camera window
     python main.py --cli    # CLI-only: runs diagnostics and exits
+    python main.py --compositor uint8   # Integer clone compositor
+    python main.py --input in.mp4 --output out.mp4   # Offline batch render
+    python main.py --source session:rec/ --fast       # Replay a recorded session
 """
 
 import cv2
@@ -15,9 +18,12 @@ import time
 import argparse
 import numpy as np
 import mediapipe as mp
-from src.utils.camera_check import probe_cameras
+from src.utils.camera_check import clear_camera_cache, open_camera
 from src.app.jutsu_engine import JutsuDetector
 from src.app.clone_engine import CloneRenderer
+from src.utils.frame_context import FrameContext
+from src.utils.frame_sources import open_source
+from src.utils.frame_trace import FrameTracer
 
 
 def log_startup_state(cam_idx, cap):
@@ -63,12 +69,7 @@ def run_cli_mode():
     # 2. Camera Probe
     print("\n[PROBE] Starting camera probe...")
     try:
-        cam_idx = probe_cameras()
-        cap = cv2.VideoCapture(cam_idx, cv2.CAP_DSHOW)
-
-        if not cap.isOpened():
-            print(f"[FAIL] Camera at index {cam_idx} failed to open.")
-            return 1
+        cam_idx, cap = open_camera()
 
         ret, frame = cap.read()
         if ret and frame is not None:
@@ -107,20 +108,27 @@ def run_cli_mode():
     return 0
 
 
-def run_gui_mode():
+def run_gui_mode(compositor="float", roi_tracking=False, source=None, fast=False):
     """
     Full GUI mode with camera window, hand tracking, and clone rendering.
+
+    Args:
+        compositor: CloneRenderer compositor, "float" or "uint8".
+        roi_tracking: Run steady-state hand inference on a crop around the hands.
+        source: Frame source spec instead of the webcam (see
+            src.utils.frame_sources): video file, image dir, synthetic, session.
+        fast: Replay `source` as fast as possible instead of at its FPS.
     """
     print("Initializing Shadow Clone Jutsu...")
 
     # 1. Camera Handling
     try:
-        cam_idx = probe_cameras()
-        cap = cv2.VideoCapture(cam_idx, cv2.CAP_DSHOW)
-
-        if not cap.isOpened():
-            print("FATAL: Camera opened but isOpened() returned False.")
-            return
+        if source is None:
+            # Cached probe; the returned capture is already open
+            cam_idx, cap = open_camera()
+        else:
+            label, cap = open_source(source, realtime=not fast)
+            cam_idx = label
 
     except Exception as e:
         print(f"FATAL: {e}")
@@ -130,41 +138,53 @@ def run_gui_mode():
     log_startup_state(cam_idx, cap)
 
     # 2. Engine Initialization
-    detector = JutsuDetector()
-    renderer = CloneRenderer()
+    detector = JutsuDetector(roi_tracking=roi_tracking)
+    renderer = CloneRenderer(compositor=compositor)
+    tracer = FrameTracer()
 
     # State
     jutsu_active = False
     debug_mode = False
 
     print("\nSystem Ready.")
-    print("Controls: 'q' to Quit, 'd' to toggle Debug Mode.")
+    print("Controls: 'q' to Quit, 'd' to toggle Debug Mode, 't' to dump a frame trace.")
     print("Perform the 'Ram' Seal (cross/touch fingers) to activate Jutsu!")
 
     prev_time = time.time()
     frame_count = 0
 
     while cap.isOpened():
+        t0 = time.perf_counter()
         ret, frame = cap.read()
         if not ret:
             print("Ignoring empty camera frame.")
             continue
 
         frame_count += 1
+        t1 = time.perf_counter()
+        tracer.span("capture", frame_count, t0, t1)
 
-        # Flip the image horizontally for a selfie-view display
-        frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Flip the image horizontally for a selfie-view display; the RGB view
+        # is converted once and shared by hand detection and segmentation
+        ctx = FrameContext(frame, frame_count, mirror=True)
+        frame, frame_rgb = ctx.frame, ctx.rgb
+        t2 = time.perf_counter()
+        tracer.span("flip+color", frame_count, t1, t2)
 
         # 3. Logic
         # A. Detect Seal
         active_now, hands_results = detector.detect_seal(frame_rgb)
+        t3 = time.perf_counter()
+        tracer.span("hands", frame_count, t2, t3)
 
         # Active while seal is detected (HOLD mode)
         jutsu_active = active_now
 
         # B. Render Clones
-        output_frame = renderer.render(frame, active=jutsu_active)
+        output_frame = renderer.render(frame, active=jutsu_active, frame_rgb=frame_rgb,
+                                       inplace=True)
+        t4 = time.perf_counter()
+        tracer.span("render", frame_count, t3, t4, active=jutsu_active)
 
         # 4. Debug UI
         if debug_mode:
@@ -195,20 +215,46 @@ def run_gui_mode():
             print(f"[PERF] Frame {frame_count} | FPS: {int(fps)} | Jutsu: {'ON' if jutsu_active else 'OFF'}")
 
         # Display
+        t5 = time.perf_counter()
         cv2.imshow('Shadow Clone Jutsu', output_frame)
 
         key = cv2.waitKey(5) & 0xFF
+        tracer.span("display", frame_count, t5, time.perf_counter())
         if key == ord('q'):
             break
         elif key == ord('d'):
             debug_mode = not debug_mode
             print(f"[UI] Debug Mode: {'ON' if debug_mode else 'OFF'}")
+        elif key == ord('t'):
+            path = f"jutsu_trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+            spans = tracer.dump(path)
+            print(f"[TRACE] Wrote {spans} spans to {path} (open in chrome://tracing)")
 
     print(f"\n[EXIT] Processed {frame_count} frames. Releasing camera.")
     cap.release()
     cv2.destroyAllWindows()
 
 
+def run_batch_mode(input_path, output_path, workers=None, compositor="float",
+                   flip=False, warmup=15, inference_width=640):
+    """
+    Offline batch mode: render recorded footage with a process pool.
+
+    Returns:
+        Process exit code.
+    """
+    from src.engines.batch_render import render_video
+
+    print(f"[BATCH MODE] {input_path} → {output_path}")
+    try:
+        render_video(input_path, output_path, workers=workers, warmup=warmup,
+                     compositor=compositor, flip=flip, inference_width=inference_width)
+    except Exception as e:
+        print(f"[FAIL] Batch render failed: {e}")
+        return 1
+    return 0
+
+
 def main():
     """Entry point with CLI argument parsing."""
     parser = argparse.ArgumentParser(
@@ -218,6 +264,8 @@ def main():
 Examples:
   python main.py          Full GUI mode with camera window
   python main.py --cli    CLI-only diagnostics (no GUI)
+  python main.py --input in.mp4 --output out.mp4 --workers 8
+                          Offline batch render of recorded footage
         """
     )
     parser.add_argument(
@@ -225,14 +273,85 @@ Examples:
         action='store_true',
         help='Run in CLI-only diagnostic mode (no GUI window)'
     )
+    parser.add_argument(
+        '--compositor',
+        choices=('float', 'uint8'),
+        default='float',
+        help='Clone compositor (GUI and batch mode): float (reference) or uint8 '
+             '(fixed-point, faster)'
+    )
+    parser.add_argument(
+        '--roi-tracking',
+        action='store_true',
+        help='Track hands on a crop around their last position (faster steady state)'
+    )
+
+    parser.add_argument(
+        '--reprobe',
+        action='store_true',
+        help='Ignore the cached camera probe and scan indices 0-4 again'
+    )
+    parser.add_argument(
+        '--source',
+        help='GUI mode frame source instead of the webcam: video file, image dir, '
+             'synthetic[:WxH], session:DIR or camera:N'
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Replay --source as fast as possible (throughput measurement)'
+    )
+    parser.add_argument(
+        '--input',
+        help='Offline batch mode: video file to process instead of the camera'
+    )
+    parser.add_argument(
+        '--output',
+        help='Batch mode output video (default: <input>_jutsu.mp4)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Batch mode worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--warmup',
+        type=int,
+        default=15,
+        help='Batch mode tracking warm-up frames replayed before each chunk'
+    )
+    parser.add_argument(
+        '--flip',
+        action='store_true',
+        help='Batch mode: mirror frames horizontally (selfie view)'
+    )
+    parser.add_argument(
+        '--inference-width',
+        type=int,
+        default=640,
+        help='Batch mode: max width of the frame fed to hand and segmentation '
+             'inference (default: 640, 0 = full resolution)'
+    )
 
     args = parser.parse_args()
 
-    if args.cli:
+    if args.reprobe:
+        clear_camera_cache()
+
+    if args.input:
+        output = args.output or f"{args.input.rsplit('.', 1)[0]}_jutsu.mp4"
+        sys.exit(run_batch_mode(args.input, output, workers=args.workers,
+                                compositor=args.compositor, flip=args.flip,
+                                warmup=args.warmup, inference_width=args.inference_width))
+    elif args.output:
+        parser.error('--output requires --input')
+    elif args.cli:
         exit_code = run_cli_mode()
         sys.exit(exit_code)
     else:
-        run_gui_mode()
+        run_gui_mode(compositor=args.compositor, roi_tracking=args.roi_tracking,
+                     source=args.source, fast=args.fast)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+"""
+Shadow Clone Jutsu — Benchmark Runner
+======================================
+Camera-free per-stage benchmarks (see src/utils/benchmark.py).
+
+Usage:
+    python run_bench.py                              # all stages, 480p/720p/1080p
+    python run_bench.py --resolutions 720p --stages composite.uint8,jpeg.encode
+    python run_bench.py --save-baseline              # → benchmarks/baseline.json
+    python run_bench.py --compare                    # run, diff against baseline
+    python run_bench.py --compare-files old.json new.json
+
+Baselines are machine-specific, so none is committed: on a fresh checkout
+(or a new machine) run --save-baseline once before using --compare.
+"""
+
+import argparse
+import os
+import sys
+
+from src.utils.benchmark import (
+    DEFAULT_BASELINE, RESOLUTIONS, STAGES, compare_reports, format_comparison,
+    load_report, run_benchmarks, save_report,
+)
+
+
+def _csv(value, allowed, what):
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown {what}: {', '.join(unknown)}")
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shadow Clone Jutsu Benchmarks")
+    parser.add_argument('--resolutions', default=",".join(RESOLUTIONS),
+                        type=lambda v: _csv(v, RESOLUTIONS, "resolution"),
+                        help='Comma-separated: 480p,720p,1080p')
+    parser.add_argument('--stages', default=",".join(STAGES),
+                        type=lambda v: _csv(v, STAGES, "stage"),
+                        help=f'Comma-separated subset of: {",".join(STAGES)}')
+    parser.add_argument('--iterations', type=int, default=100, help='Timed iterations per stage')
+    parser.add_argument('--warmup', type=int, default=10, help='Untimed warm-up iterations')
+    parser.add_argument('--fixtures', help='Directory of fixture frames (name.png + optional name_mask.png)')
+    parser.add_argument('--json', help='Write the full report to this path')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE,
+                        help=f'Store the report as a baseline (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE,
+                        help='Compare the run against a baseline; exit 1 on regression')
+    parser.add_argument('--compare-files', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='Compare two stored reports without running anything')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Allowed slowdown before flagging a regression (default: 0.10)')
+    parser.add_argument('--metric', default='p50_ms',
+                        choices=('mean_ms', 'p50_ms', 'p90_ms', 'p99_ms'),
+                        help='Latency metric used for comparisons')
+    args = parser.parse_args()
+
+    if args.compare and not os.path.exists(args.compare):
+        # Fail before a multi-minute run, not after it
+        print(f"[BENCH] No baseline at {args.compare}. Create one on this machine first:\n"
+              f"        python run_bench.py --save-baseline {args.compare}")
+        return 2
+
+    if args.compare_files:
+        baseline, current = (load_report(p) for p in args.compare_files)
+    else:
+        current = run_benchmarks(args.resolutions, args.stages, args.iterations,
+                                 args.warmup, args.fixtures)
+        if args.json:
+            save_report(current, args.json)
+        if args.save_baseline:
+            save_report(current, args.save_baseline)
+            print(f"[BENCH] Baseline saved to {args.save_baseline}")
+        if not args.compare:
+            return 0
+        baseline = load_report(args.compare)
+
+    rows, regressions = compare_reports(baseline, current, args.tolerance, args.metric)
+    print(format_comparison(rows, args.metric))
+    if regressions:
+        print(f"[BENCH] {len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    print("[BENCH] No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
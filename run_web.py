@@ -6,19 +6,92 @@ Starts the FastAPI server with uvicorn.
 Usage:
     python run_web.py              # http://localhost:8000
     python run_web.py --port 9000  # http://localhost:9000
+    python run_web.py --reprobe    # ignore the cached camera probe
+    python run_web.py --source synthetic:1280x720 --fast   # headless load test
+    python run_web.py --sources door=camera:0,desk=camera:1  # /streams/door/..., /streams/desk/...
+    python run_web.py --inference-processes 2  # MediaPipe in worker processes
+    python run_web.py --roi-tracking --adaptive-rate --mask-reuse 3 --compositor uint8
 """
 
 import argparse
+import os
 import uvicorn
 
+from src.utils.camera_check import clear_camera_cache
+
 
 def main():
     parser = argparse.ArgumentParser(description="Shadow Clone Jutsu Web Server")
     parser.add_argument('--host', default='0.0.0.0', help='Bind address (default: 0.0.0.0)')
     parser.add_argument('--port', type=int, default=8000, help='Port (default: 8000)')
     parser.add_argument('--reload', action='store_true', help='Enable auto-reload for development')
+    parser.add_argument('--reprobe', action='store_true', help='Ignore the cached camera probe and scan again')
+    parser.add_argument('--source', help='Frame source instead of the webcam: video file, image dir, '
+                                         'synthetic[:WxH], session:DIR or camera:N')
+    parser.add_argument('--fast', action='store_true', help='Replay the --source as fast as possible')
+    parser.add_argument('--sources', help='Several cameras/sources, comma-separated, optionally named '
+                                          '(id=spec); served under /streams/{id}/')
+    parser.add_argument('--inference-workers', type=int,
+                        help='Shared MediaPipe worker threads (default: 2 with several sources, '
+                             '0 = private models per camera)')
+    parser.add_argument('--inference-processes', type=int,
+                        help='Run shared MediaPipe inference in N worker processes '
+                             '(frames passed through shared memory)')
+    parser.add_argument('--target-fps', type=float,
+                        help='Enable adaptive quality: step quality down while the output FPS '
+                             'misses this target (default: off)')
+    parser.add_argument('--roi-tracking', action='store_true',
+                        help='Track hands on a crop around their last position')
+    parser.add_argument('--adaptive-rate', action='store_true',
+                        help='Poll hand inference slowly while no hands are in view')
+    parser.add_argument('--seal-sequences', action='store_true',
+                        help='Recognize multi-seal jutsu sequences (effect holds after release)')
+    parser.add_argument('--mask-reuse', type=int,
+                        help='Max frames served by one segmentation mask (default: 1)')
+    parser.add_argument('--motion-threshold', type=float,
+                        help='Motion score that forces a fresh mask while reusing (default: off)')
+    parser.add_argument('--compositor', choices=('float', 'uint8'),
+                        help='Clone compositor: float (reference, default) or uint8 (fixed-point, faster)')
+    parser.add_argument('--inference-width', type=int,
+                        help='Max width of the frame fed to hand and segmentation inference '
+                             '(default: 640, 0 = full resolution)')
+    parser.add_argument('--encode-workers', type=int,
+                        help='JPEG encoder threads per camera for the subscribed renditions (default: 2)')
     args = parser.parse_args()
 
+    # Read by the camera thread (the app is imported by uvicorn, not called)
+    if args.source:
+        os.environ["JUTSU_SOURCE"] = args.source
+    if args.fast:
+        os.environ["JUTSU_SOURCE_FAST"] = "1"
+    if args.sources:
+        os.environ["JUTSU_SOURCES"] = args.sources
+    if args.inference_workers is not None:
+        os.environ["JUTSU_INFERENCE_WORKERS"] = str(args.inference_workers)
+    if args.inference_processes is not None:
+        os.environ["JUTSU_INFERENCE_PROCESSES"] = str(args.inference_processes)
+    if args.target_fps is not None:
+        os.environ["JUTSU_TARGET_FPS"] = str(args.target_fps)
+    if args.roi_tracking:
+        os.environ["JUTSU_ROI_TRACKING"] = "1"
+    if args.adaptive_rate:
+        os.environ["JUTSU_ADAPTIVE_RATE"] = "1"
+    if args.seal_sequences:
+        os.environ["JUTSU_SEAL_SEQUENCES"] = "1"
+    if args.mask_reuse is not None:
+        os.environ["JUTSU_MASK_REUSE"] = str(args.mask_reuse)
+    if args.motion_threshold is not None:
+        os.environ["JUTSU_MOTION_THRESHOLD"] = str(args.motion_threshold)
+    if args.compositor:
+        os.environ["JUTSU_COMPOSITOR"] = args.compositor
+    if args.inference_width is not None:
+        os.environ["JUTSU_INFERENCE_WIDTH"] = str(args.inference_width)
+    if args.encode_workers is not None:
+        os.environ["JUTSU_ENCODE_WORKERS"] = str(args.encode_workers)
+
+    if args.reprobe:
+        clear_camera_cache()
+
     print("=" * 60)
     print("  🥷 SHADOW CLONE JUTSU — Web Mode")
     print(f"  Open: http://localhost:{args.port}")
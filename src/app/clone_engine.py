@@ -2,28 +2,44 @@ import cv2
 import numpy as np
 import mediapipe as mp
 
+from src.engines.compositor import check_compositor, expand_weight, make_gain_lut, mask_to_uint8
+from src.utils.buffer_arena import BufferArena
+
 class CloneRenderer:
     """
     Handles background segmentation and the 'Shadow Clone' rendering effect.
     Uses NumPy slicing for performance instead of looping or full array rolling.
     """
-    def __init__(self):
+    def __init__(self, compositor="float"):
         self.mp_selfie_segmentation = mp.solutions.selfie_segmentation
         # UDPATE: Use generic model (0 or 1), 0 is general, 1 is landscape. 
         self.segmentation = self.mp_selfie_segmentation.SelfieSegmentation(model_selection=1)
         self.offset_x = 300 # Pixel shift for clones
+        # "float" (original math) or "uint8" (saturating integer adds + LUT)
+        self.compositor = check_compositor(compositor)
+        # Blue boost (x1.5) and 0.6 clone opacity folded into one LUT
+        self._clone_lut = make_gain_lut((1.5 * 0.6, 0.6, 0.6))
+        # Frame-sized scratch buffers, allocated once per resolution
+        self.arena = BufferArena()
 
-    def render(self, frame, active=False):
+    def render(self, frame, active=False, frame_rgb=None, inplace=False):
         """
         Applies the clone effect if active.
+        Composites into a copy of `frame` (scratch from self.arena) and returns
+        it; with inplace=True `frame` itself is overwritten (it must be
+        writable and owned by the caller).
+        Pass `frame_rgb` (e.g. FrameContext.rgb) to reuse an existing RGB copy.
         """
         if not active:
             return frame
+        if not inplace:
+            frame = frame.copy()
 
         height, width, _ = frame.shape
         
         # 1. Get Segmentation Mask
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if frame_rgb is None:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = self.segmentation.process(frame_rgb)
         mask = results.segmentation_mask
         
@@ -34,78 +50,67 @@ class CloneRenderer:
         # Blur the mask to soften edges (Ghostly effect)
         # Using 5x5 Gaussian Blur as 3x3 might be too subtle for 1080p
         blurred_mask = cv2.GaussianBlur(binary_mask, (5, 5), 0)
+
+        if self.compositor == "uint8":
+            return self._render_uint8(frame, blurred_mask)
         
         # Expand dimensions to match frame for broadcasting
-        # mask is (H, W), need (H, W, 3)
-        mask_3d = np.repeat(blurred_mask[:, :, np.newaxis], 3, axis=2)
+        # mask is (H, W), (H, W, 1) broadcasts against (H, W, 3)
+        mask_3d = blurred_mask[:, :, np.newaxis]
+        arena = self.arena
         
         # 3. Create the extracted user (Foreground)
         # We multiply the frame by the mask. 
         # Background pixels become black (0), User pixels remain.
-        foreground = frame * mask_3d
-        
-        # 4. Generate Clones using Slicing
-        # Instead of np.roll (which wraps around), we want to SHIFT and CLIP.
-        # Shift Left: User moves Left.   [User  ] -> [User  ] (Wait, shift left means x decreases)
-        # Shift Right: User moves Right. [  User] 
+        foreground = arena.get("foreground", (height, width, 3), np.float32)
+        np.multiply(frame, mask_3d, out=foreground)
         
-        # Initialize canvas with the original frame (Background + Real User)
-        # Note: If we want real user ON TOP of clones, we draw clones first.
-        # Logic:
-        # Base = Current Frame (Background + Real User)
-        # Clone Layer = Shifted Foreground
-        # Composite = Base + Clone (where Clone exists)
+        # 4. Tinting + opacity, applied once to the shared foreground
+        # Tint clones blue-ish for "Chakra" effect (Boost Blue x1.5),
+        # then scale by the 0.6 clone opacity used by addWeighted before.
+        foreground[:, :, 0] *= 1.5
+        foreground *= 0.6
         
-        # We'll create a black canvas for the clones to avoid messing up the background logic
-        left_clone = np.zeros_like(frame, dtype=np.float32)
-        right_clone = np.zeros_like(frame, dtype=np.float32)
+        # 5. Composition (additive blending, clones drawn via slicing)
+        # Instead of np.roll (which wraps around), we SHIFT and CLIP:
+        # only the destination columns of each clone are touched.
+        output = arena.get("output", (height, width, 3), np.float32)
+        np.copyto(output, frame)
         
-        fw = width
-        fh = height
         off = self.offset_x
-        
-        # Create Left Clone (Shift User to Left by 'off')
-        # Target: [0 : W-off] receives Source: [off : W]
-        if off < fw:
-            # We take the pixels from 'off' to 'width' and place them at '0' to 'width-off'
-            # This moves the image LEFT.
-            left_clone[:, :fw-off] = foreground[:, off:]
-            
-        # Create Right Clone (Shift User to Right by 'off')
-        # Target: [off : W] receives Source: [0 : W-off]
-        if off < fw:
-            # This moves the image RIGHT.
-            right_clone[:, off:] = foreground[:, :fw-off]
-            
-        # 5. Tinting (Optional but cool)
-        # Tint clones blue-ish for "Chakra" effect
-        # BGR: Increase B, reduce G/R
-        left_clone[:, :, 0] *= 1.5 # Boost Blue
-        right_clone[:, :, 0] *= 1.5 # Boost Blue
-        
-        # 6. Composition
-        # We overload the clones onto the main frame.
-        # We use cv2.addWeighted for transparency/blending
-        
-        output = frame.astype(np.float32)
-        
-        # Add Left Clone (0.5 opacity)
-        output = cv2.addWeighted(output, 1.0, left_clone, 0.6, 0.0)
-        
-        # Add Right Clone (0.5 opacity)
-        output = cv2.addWeighted(output, 1.0, right_clone, 0.6, 0.0)
-        
-        # 7. Re-draw Real User on top? 
-        # The 'frame' already contains the real user.
-        # However, adding the clones might have brightened the background or the user.
-        # Since 'left_clone' has black background (0), adding it to the real background (non-zero) works fine (additive blending).
-        # But wait, additive blending (addWeighted) will make the overlapping parts brighter (blow out).
-        # A proper alpha blend is better:
-        # Result = Clone * Alpha + Background * (1-Alpha)
-        # But constructing that is complex with raw numpy in one go.
-        # Given "Performance" constraint:
-        # Additive blending is fastest. Let's stick to it but maybe clamp to 255.
-        
-        output = np.clip(output, 0, 255).astype(np.uint8)
-        
-        return output
+        if off < width:
+            # Left Clone: Target [0 : W-off] receives Source [off : W]
+            output[:, :width - off] += foreground[:, off:]
+            # Right Clone: Target [off : W] receives Source [0 : W-off]
+            output[:, off:] += foreground[:, :width - off]
+        
+        # Additive blending can blow out overlaps, so clamp to 255
+        # (written back into the caller's frame, no new allocation).
+        np.clip(output, 0, 255, out=output)
+        np.copyto(frame, output, casting="unsafe")
+        
+        return frame
+
+    def _render_uint8(self, frame, blurred_mask):
+        """
+        Same additive effect as render(), in uint8: foreground via a scaled
+        integer multiply, tint + opacity via one LUT, clones added in place
+        into `frame` with saturating cv2.add (which also replaces np.clip).
+        """
+        height, width, _ = frame.shape
+        off = self.offset_x
+        if off >= width:
+            return frame
+
+        arena = self.arena
+        mask_u8 = mask_to_uint8(blurred_mask, dst=arena.get("mask_u8", (height, width)))
+        mask_3d = expand_weight(mask_u8, dst=arena.get("mask3", (height, width, 3)))
+        foreground = cv2.multiply(frame, mask_3d, dst=arena.get("foreground_u8", (height, width, 3)),
+                                  scale=1.0 / 255.0)
+        clone = cv2.LUT(foreground, self._clone_lut, dst=foreground)
+
+        # Left clone: src[off:] → dst[:W-off]
+        cv2.add(frame[:, :width - off], clone[:, off:], dst=frame[:, :width - off])
+        # Right clone: src[:W-off] → dst[off:]
+        cv2.add(frame[:, off:], clone[:, :width - off], dst=frame[:, off:])
+        return frame
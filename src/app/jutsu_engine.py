@@ -1,60 +1,52 @@
 import mediapipe as mp
-import math
+
+from src.engines.hand_roi import HandRoiTracker
+from src.engines.seal_classifier import SealClassifier, landmarks_array
 
 class JutsuDetector:
     """
     Detects the 'Ram' seal (Hand Clasp / Cross) using MediaPipe Hands.
     Logic: Checks if Index Finger Tip (8) and Middle Finger Tip (12) are touching/crossed.
+    With roi_tracking=True, steady-state frames run on a crop around the hands;
+    both graphs then run in static image mode, since neither sees a steady
+    full-frame video stream.
     """
-    def __init__(self):
+    def __init__(self, roi_tracking=False):
         self.mp_hands = mp.solutions.hands
         # OPTIMIZATION: model_complexity=0 for speed on Windows Python
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
+        self.hands = self._make_hands(static_image_mode=roi_tracking)
+        # Threshold for "touching" in normalized coordinates
+        self.TOUCH_THRESHOLD = 0.04 
+        # Crop-around-last-hands tracking (landmarks mapped back to full frame)
+        self.tracker = HandRoiTracker(self.hands, self._make_hands(static_image_mode=True)) if roi_tracking else None
+        # Vectorized seal templates (Ram = any index tip near any middle tip)
+        self.classifier = SealClassifier()
+        self._ram = self.classifier.index("ram")
+        self._landmarks = landmarks_array(None)
+
+    def _make_hands(self, static_image_mode=False):
+        return self.mp_hands.Hands(
+            static_image_mode=static_image_mode,
             max_num_hands=2,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5,
             model_complexity=0
         )
-        # Threshold for "touching" in normalized coordinates
-        self.TOUCH_THRESHOLD = 0.04 
 
     def detect_seal(self, frame_rgb):
         """
         Processes frame and returns (jutsu_active, results).
         """
-        results = self.hands.process(frame_rgb)
+        if self.tracker is not None:
+            results = self.tracker.process(frame_rgb)
+        else:
+            results = self.hands.process(frame_rgb)
         jutsu_active = False
 
         if results.multi_hand_landmarks:
-            # Check for the specific gesture
-            # We need at least one hand, but ideally we check if fingers are crossed.
-            # Simplified "Ram" Seal: Index and Middle fingers of the SAME hand or DIFFERENT hands are close.
-            # Let's support a single hand 'crossing' fingers (easy) or two hands touching (Naruto style).
-            # For robustness, we'll check if ANY Index Tip is close to ANY Middle Tip (on same or different hand).
-            
-            # Extract all tips
-            tips = []
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Landmark 8: Index Tip
-                # Landmark 12: Middle Tip
-                tips.append((hand_landmarks.landmark[8], hand_landmarks.landmark[12]))
-
-            # Check intra-hand (crossing fingers on one hand)
-            for index_tip, middle_tip in tips:
-                dist = math.hypot(index_tip.x - middle_tip.x, index_tip.y - middle_tip.y)
-                if dist < self.TOUCH_THRESHOLD:
-                    jutsu_active = True
-                    break
-            
-            # If not active yet, check inter-hand (if 2 hands detected)
-            if not jutsu_active and len(tips) == 2:
-                # Hand 1 Index to Hand 2 Middle
-                dist_1 = math.hypot(tips[0][0].x - tips[1][1].x, tips[0][0].y - tips[1][1].y)
-                # Hand 2 Index to Hand 1 Middle
-                dist_2 = math.hypot(tips[1][0].x - tips[0][1].x, tips[1][0].y - tips[0][1].y)
-                
-                if dist_1 < self.TOUCH_THRESHOLD or dist_2 < self.TOUCH_THRESHOLD:
-                    jutsu_active = True
+            # Simplified "Ram" Seal: ANY Index Tip close to ANY Middle Tip (same or different hand).
+            landmarks = landmarks_array(results, out=self._landmarks)
+            distances = self.classifier.distances(landmarks)
+            jutsu_active = bool(distances[self._ram] < self.TOUCH_THRESHOLD)
 
         return jutsu_active, results
@@ -0,0 +1,217 @@
+"""
+Batch Render — Offline Multi-Process Video Processing
+======================================================
+Runs the gesture and clone engines over a recorded video instead of a live
+camera. The frame range is split into contiguous chunks, one per task in a
+process pool; every worker opens the input itself, owns its own MediaPipe
+graphs, and writes its chunk to a temporary part file. The parts are then
+stitched, in order, into the output.
+
+Parts are written with a lossless codec (FFV1), so stitching performs the
+only lossy encode — the output is one generation away from the rendered
+frames, as in a sequential run. The price is temporary disk space: about
+a third of the raw frame size for the whole video.
+
+    [warm-up | chunk 0] [warm-up | chunk 1] ... → part files → output
+
+MediaPipe's hand tracking and the temporal mask cache depend on previous
+frames, so each chunk starts `warmup` frames early: those frames are run
+through the engines but not written, so the first written frame of a chunk
+sees the same tracking state it would in a sequential run.
+"""
+
+import cv2
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.engines.clone_engine import CloneEngine
+from src.engines.gesture_engine import GestureEngine
+from src.utils.frame_context import FrameContext
+from src.utils.frame_ops import scale_for_width
+
+
+FOURCC = "mp4v"          # output
+PART_FOURCC = "FFV1"     # lossless intermediate parts
+PART_EXT = ".avi"
+
+
+def probe_video(path):
+    """(frame_count, fps, width, height) of a video file."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video '{path}'")
+    info = (
+        int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        cap.get(cv2.CAP_PROP_FPS) or 30.0,
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+    )
+    cap.release()
+    return info
+
+
+def plan_chunks(total_frames, chunks, warmup=15):
+    """
+    Split [0, total_frames) into `chunks` contiguous ranges.
+
+    Returns:
+        list of (warm_start, start, end): frames [warm_start, start) only
+        warm the engines up, frames [start, end) are written.
+    """
+    chunks = max(1, min(chunks, total_frames))
+    bounds = [total_frames * i // chunks for i in range(chunks + 1)]
+    return [
+        (max(0, start - warmup), start, end)
+        for start, end in zip(bounds[:-1], bounds[1:])
+        if end > start
+    ]
+
+
+def _seek(cap, index):
+    """Position `cap` on frame `index` (falls back to grabbing forward)."""
+    if index == 0:
+        return
+    cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+    pos = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    if pos != index:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        for _ in range(index):
+            if not cap.grab():
+                break
+
+
+def render_chunk(task):
+    """
+    Process-pool entry point: render one chunk to a part file.
+
+    Args:
+        task: dict with input, part, warm_start, start, end, fps, options.
+
+    Returns:
+        (part path, frames written, frames with the jutsu active)
+    """
+    opts = task["options"]
+    cap = cv2.VideoCapture(task["input"])
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video '{task['input']}'")
+    _seek(cap, task["warm_start"])
+
+    w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    scale = opts["inference_scale"] or scale_for_width(w, opts["inference_width"])
+
+    gesture = GestureEngine(touch_threshold=opts["touch_threshold"])
+    cloner = CloneEngine(compositor=opts["compositor"], inference_scale=scale)
+    writer = cv2.VideoWriter(task["part"], cv2.VideoWriter_fourcc(*PART_FOURCC),
+                             task["fps"], (w, h))
+    if not writer.isOpened():
+        raise RuntimeError(f"Cannot write lossless part '{task['part']}' ({PART_FOURCC})")
+
+    written = active_frames = 0
+    for index in range(task["warm_start"], task["end"]):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        ctx = FrameContext(frame, index, mirror=opts["flip"], inference_scale=scale)
+        active, _ = gesture.detect(ctx.small_rgb)
+        # Warm-up frames go through the engines too (mask cache state), unwritten
+        # Each read() decodes into a fresh array: composite in place
+        output = cloner.render(ctx.frame, active=active, frame_rgb=ctx.small_rgb, inplace=True)
+        if index < task["start"]:
+            continue
+        writer.write(output)
+        written += 1
+        active_frames += int(active)
+
+    writer.release()
+    cap.release()
+    return task["part"], written, active_frames
+
+
+def stitch(parts, output, fps, size):
+    """Concatenate the lossless part files, in order, into `output` (one encode)."""
+    writer = cv2.VideoWriter(output, cv2.VideoWriter_fourcc(*FOURCC), fps, size)
+    frames = 0
+    for part in parts:
+        cap = cv2.VideoCapture(part)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            writer.write(frame)
+            frames += 1
+        cap.release()
+    writer.release()
+    return frames
+
+
+def render_video(input_path, output_path, workers=None, chunks=None, warmup=15,
+                 compositor="float", flip=False, touch_threshold=0.05,
+                 inference_scale=None, inference_width=640, log=print):
+    """
+    Render `input_path` with the clone effect into `output_path`.
+
+    Args:
+        workers: Process count (default: os.cpu_count()).
+        chunks: Number of chunks (default: 2 x workers, for load balance).
+        warmup: Frames replayed before each chunk to warm up tracking.
+        compositor: CloneEngine compositor, "float" or "uint8".
+        flip: Mirror frames horizontally (footage recorded from a webcam).
+        inference_scale: Inference downscale (default: from inference_width).
+        inference_width: Max inference width in px (0 = full resolution).
+
+    Returns:
+        dict with frames, active_frames, seconds and speed (x real-time).
+    """
+    total, fps, w, h = probe_video(input_path)
+    if total <= 0:
+        raise RuntimeError(f"'{input_path}' reports no frames")
+    workers = workers or os.cpu_count() or 1
+    chunks = chunks or workers * 2
+    options = {
+        "compositor": compositor,
+        "flip": flip,
+        "touch_threshold": touch_threshold,
+        "inference_scale": inference_scale,
+        "inference_width": inference_width,
+    }
+
+    plan = plan_chunks(total, chunks, warmup)
+    log(f"[BATCH] {input_path}: {total} frames @ {fps:.1f} FPS, {w}x{h} "
+        f"→ {len(plan)} chunks on {workers} workers (warm-up {warmup})")
+
+    tmpdir = tempfile.mkdtemp(prefix="jutsu_batch_")
+    t0 = time.perf_counter()
+    try:
+        tasks = [
+            {
+                "input": input_path,
+                "part": os.path.join(tmpdir, f"part_{i:04d}{PART_EXT}"),
+                "warm_start": warm_start, "start": start, "end": end,
+                "fps": fps, "options": options,
+            }
+            for i, (warm_start, start, end) in enumerate(plan)
+        ]
+        active_frames = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, so parts stay in frame order
+            for part, written, active in pool.map(render_chunk, tasks):
+                active_frames += active
+                log(f"[BATCH] {os.path.basename(part)}: {written} frames")
+        frames = stitch([t["part"] for t in tasks], output_path, fps, (w, h))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    seconds = time.perf_counter() - t0
+    speed = (frames / fps) / seconds if seconds > 0 else 0.0
+    log(f"[BATCH] Wrote {frames} frames to {output_path} in {seconds:.1f}s "
+        f"({speed:.1f}x real-time, jutsu active on {active_frames} frames)")
+    return {
+        "frames": frames,
+        "active_frames": active_frames,
+        "seconds": seconds,
+        "speed": speed,
+    }
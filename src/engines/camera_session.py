@@ -0,0 +1,429 @@
+"""
+Camera Sessions — One Pipeline per Camera, Shared Inference
+============================================================
+A CameraSession is everything the web server needs to serve one camera:
+its frame source, engines, FramePipeline, rendition encoder and
+broadcasters, WebSocket client ladders, metrics and trace buffer. A SessionRegistry holds the sessions of
+one server, keyed by stream id, and optionally an InferencePool that all of
+them share (see src.engines.inference_pool), so adding a camera adds a
+capture/render pipeline but no new MediaPipe graphs.
+
+Sources are configured as a comma-separated list of frame source specs
+(src.utils.frame_sources), each optionally named:
+
+    camera:0,camera:1                   → streams "0" and "1"
+    door=camera:0,desk=synthetic:640x480  → streams "door" and "desk"
+
+The first session is the default one, served by the legacy single-camera
+routes.
+
+An UploadSession is the same engines without a local camera: a browser
+sends its webcam frames over a WebSocket and gets the composited frames
+back. Upload sessions call MediaPipe through MicroBatchers, which group the
+calls of many browsers into shared pool jobs (run one image at a time).
+"""
+
+import cv2
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from src.engines.clone_engine import CloneEngine
+from src.engines.gesture_engine import GestureEngine
+from src.engines.pipeline import FramePipeline
+from src.engines.quality_controller import QualityController
+from src.engines.rendition_encoder import DEFAULT_RENDITION, RenditionEncoder
+from src.engines.seal_sequence import JUTSU, SealSequenceRecognizer
+from src.utils.camera_check import open_camera
+from src.utils.frame_context import FrameContext
+from src.utils.frame_ops import scale_for_width
+from src.utils.frame_sources import open_source
+from src.utils.frame_trace import FrameTracer
+from src.utils.metrics import MetricsRegistry
+
+
+# Opt-in engine modes for web streams (run_web.py flags / JUTSU_* settings).
+# The defaults are the engines' own: every mode off, reference compositor.
+ENGINE_OPTIONS = {
+    "roi_tracking": False,      # GestureEngine hand crop tracking
+    "adaptive_rate": False,     # GestureEngine activity-driven inference rate
+    "seal_sequences": False,    # SealSequenceRecognizer for JUTSU + effect hold
+    "mask_reuse": 1,            # CloneEngine mask_reuse_interval
+    "motion_threshold": None,   # CloneEngine motion gate for mask reuse
+    "compositor": "float",      # CloneEngine compositor
+    "inference_width": 640,     # hands + segmentation input width cap (px, 0 = full)
+}
+
+
+def build_engines(hands=None, segmentor=None, options=None):
+    """
+    The web server's GestureEngine + CloneEngine configuration. `options`
+    overrides ENGINE_OPTIONS. `hands` and `segmentor` replace the engines'
+    private MediaPipe graphs (pooled or batched models); per-stream state
+    stays in the returned engines.
+    """
+    opts = dict(ENGINE_OPTIONS, **(options or {}))
+    sequences = None
+    if opts["seal_sequences"]:
+        sequences = SealSequenceRecognizer(window=4.0)
+        for name, seals in JUTSU.items():
+            sequences.register(name, seals)
+    gesture = GestureEngine(touch_threshold=0.05, roi_tracking=opts["roi_tracking"],
+                            adaptive_rate=opts["adaptive_rate"], sequences=sequences,
+                            hands=hands)
+    cloner = CloneEngine(offset_x=350, clone_alpha=0.7, tint_bgr=(255, 100, 100),
+                         mask_reuse_interval=opts["mask_reuse"],
+                         motion_threshold=opts["motion_threshold"],
+                         compositor=opts["compositor"], segmentor=segmentor)
+    return gesture, cloner
+
+
+def inference_scale_for(width, options=None):
+    """Inference downscale for `width` px frames under `options` (see ENGINE_OPTIONS)."""
+    opts = dict(ENGINE_OPTIONS, **(options or {}))
+    return scale_for_width(width, opts["inference_width"])
+
+
+def parse_sources(text):
+    """
+    "a=spec,spec2" → [("a", "spec"), ("1", "spec2")]. An empty or missing
+    list means one stream on the default camera: [("0", None)].
+    """
+    entries = [part.strip() for part in (text or "").split(",") if part.strip()]
+    if not entries:
+        return [("0", None)]
+    streams = []
+    for i, entry in enumerate(entries):
+        name, sep, spec = entry.partition("=")
+        # "=" only names a stream when the left side is a plain identifier
+        if sep and name.isidentifier():
+            streams.append((name, spec))
+        else:
+            streams.append((str(i), entry))
+    ids = [stream_id for stream_id, _ in streams]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate stream ids in '{text}'")
+    return streams
+
+
+class CameraSession:
+    """
+    One camera's pipeline and client-facing state.
+
+    Args:
+        stream_id: Identifier used in /streams/{id}/... routes.
+        spec: Frame source spec (None → cached camera probe).
+        realtime: Pace non-camera sources to their native FPS.
+        pool: Optional shared InferencePool for hands and segmentation.
+        metrics: MetricsRegistry to record into (default: a private one).
+        tracer: FrameTracer for per-frame spans (default: a private one).
+        target_fps: Adaptive quality target (None = fixed quality).
+        encode_workers: Threads encoding the subscribed JPEG renditions.
+        engine_options: Overrides for ENGINE_OPTIONS (see build_engines).
+    """
+
+    def __init__(self, stream_id, spec=None, realtime=True, pool=None, metrics=None,
+                 tracer=None, target_fps=None, encode_workers=2, engine_options=None):
+        self.id = stream_id
+        self.spec = spec
+        self.realtime = realtime
+        self.pool = pool
+        self.engine_options = engine_options
+        self.target_fps = target_fps
+        self.controller = None
+        self.state = {
+            "jutsu_active": False,
+            "fps": 0,
+            "debug_mode": False,
+            "camera_index": -1,
+            "source": "none",
+            "resolution": "unknown",
+            "running": False,
+        }
+        self.ws_clients = {}        # id(websocket) → ClientQualityLadder
+        self.ws_skipped = 0         # rendition frames WebSocket clients never received
+        self.pipeline = None
+        self.cloner = None
+        self.gesture = None
+        self._thread = None
+
+        self.tracer = tracer if tracer is not None else FrameTracer()
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        # One JPEG broadcaster per rendition, encoded only while subscribed
+        self.encoder = RenditionEncoder(encode_workers, metrics=self.metrics, tracer=self.tracer)
+        self.broadcaster = self.encoder.broadcaster(DEFAULT_RENDITION)
+        self._register_metrics(self.metrics)
+
+    def _register_metrics(self, metrics):
+        self.stage_seconds = metrics.histogram(
+            "jutsu_stage_seconds", "Time spent per pipeline stage.", ("stage",))
+        self.ws_backpressure = metrics.counter(
+            "jutsu_ws_backpressure_skips_total",
+            "Frames skipped for WebSocket clients at the in-flight limit.")
+        metrics.gauge("jutsu_clients", "Connected video clients.", ("transport",)).set_function(
+            lambda: {("mjpeg",): self.mjpeg_clients, ("websocket",): len(self.ws_clients)})
+        metrics.counter(
+            "jutsu_client_skipped_frames_total", "Frames a slow client never received.", ("transport",)
+        ).set_function(lambda: {("mjpeg",): sum(b.skipped for b in self.encoder.broadcasters.values()),
+                                ("websocket",): self.ws_skipped})
+        metrics.gauge("jutsu_fps", "Output FPS (last frame interval).").set_function(
+            lambda: self.state["fps"])
+        metrics.gauge("jutsu_active", "1 while the jutsu is active.").set_function(
+            lambda: int(bool(self.state["jutsu_active"])))
+
+    # ============================================================
+    # Lifecycle
+    # ============================================================
+    def start(self, loop):
+        """Attach the broadcasters to the server loop and start the camera thread."""
+        self.encoder.attach(loop)
+        self.encoder.start()
+        self._thread = threading.Thread(target=self.run, name=f"camera-{self.id}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=3.0):
+        self.state["running"] = False
+        self.encoder.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def run(self):
+        """
+        Camera thread: opens the source and drives a FramePipeline, which
+        captures frames, runs gesture detection and clone rendering on
+        separate stage threads, and hands the output to the rendition encoder.
+        """
+        # 1. Camera Init
+        try:
+            if self.spec is None:
+                # Cached probe → the capture comes back already open (no reopen)
+                cam_idx, cap = open_camera()
+                label = f"camera:{cam_idx}"
+            else:
+                label, cap = open_source(self.spec, realtime=self.realtime)
+                cam_idx = int(label.split(":")[1]) if label.startswith("camera:") else -1
+        except Exception as e:
+            print(f"[FATAL] [{self.id}] Camera probe failed: {e}")
+            return
+
+        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.state["camera_index"] = cam_idx
+        self.state["source"] = label
+        self.state["resolution"] = f"{w}x{h}"
+        self.state["running"] = True
+
+        print(f"[CAMERA] [{self.id}] {label} | {w}x{h} | Backend: {cap.getBackendName()}")
+
+        # 2. Engine Init (per-stream state; MediaPipe graphs from the pool if shared)
+        if self.pool is not None:
+            self.gesture, self.cloner = build_engines(self.pool.model("hands"),
+                                                      self.pool.model("segmentation"),
+                                                      self.engine_options)
+        else:
+            self.gesture, self.cloner = build_engines(options=self.engine_options)
+
+        # 3. Staged pipeline: capture → hands → clones → JPEG renditions
+        # Inference runs at ≤inference_width px, so 1080p costs about what 480p does;
+        # with a target FPS the quality controller moves that (and more) per tier
+        if self.target_fps:
+            self.controller = QualityController(self.target_fps)
+        self.pipeline = FramePipeline(
+            cap, self.gesture, self.cloner, self.state, on_frame=None,
+            inference_scale=inference_scale_for(w, self.engine_options), metrics=self.metrics, tracer=self.tracer,
+            controller=self.controller, encoder=self.encoder,
+        )
+        self.pipeline.start()
+
+        while self.state["running"]:
+            time.sleep(0.1)
+
+        self.pipeline.stop()
+        self.pipeline = None
+        cap.release()
+        print(f"[CAMERA] [{self.id}] Released.")
+
+    # ============================================================
+    # Introspection
+    # ============================================================
+    @property
+    def last_output_id(self):
+        pipeline = self.pipeline
+        return pipeline.last_output_id if pipeline is not None else 0
+
+    @property
+    def mjpeg_clients(self):
+        return sum(b.clients for b in self.encoder.broadcasters.values())
+
+    def status(self):
+        """JSON-ready snapshot: jutsu state, FPS, queues and engine counters."""
+        state, pipeline, gesture, cloner = self.state, self.pipeline, self.gesture, self.cloner
+        return {
+            "stream": self.id,
+            "jutsu_active": state["jutsu_active"],
+            "fps": state["fps"],
+            "debug_mode": state["debug_mode"],
+            "camera_index": state["camera_index"],
+            "source": state["source"],
+            "resolution": state["resolution"],
+            "running": state["running"],
+            "clients": self.mjpeg_clients,
+            "ws_clients": [ladder.snapshot() for ladder in list(self.ws_clients.values())],
+            "pipeline": pipeline.queue_depths() if pipeline is not None else {},
+            "inference_scale": pipeline.inference_scale if pipeline is not None else 1.0,
+            "quality": self.controller.snapshot() if self.controller is not None else None,
+            "renditions": self.encoder.stats(),
+            "shared_inference": self.pool is not None,
+            "hand_roi": gesture.tracker.stats() if gesture is not None and gesture.tracker else {},
+            "gesture_rate": (gesture.rate_stats() or {}) if gesture is not None else {},
+            "seal": gesture.last_seal if gesture is not None else None,
+            "sequences": gesture.sequences.stats() if gesture is not None and gesture.sequences else {},
+            "mask_cache": cloner.mask_stats() if cloner is not None else {},
+            "arena": cloner.arena.stats() if cloner is not None else {},
+        }
+
+
+class SessionRegistry:
+    """
+    Stream id → CameraSession, in configuration order (first = default).
+
+    Args:
+        pool: Optional InferencePool shared by every session added.
+        engine_options: ENGINE_OPTIONS overrides for every session added.
+    """
+
+    def __init__(self, pool=None, engine_options=None):
+        self.pool = pool
+        self.engine_options = engine_options
+        self._sessions = {}
+
+    def add(self, stream_id, spec=None, realtime=True, metrics=None, tracer=None,
+            target_fps=None, encode_workers=2):
+        if stream_id in self._sessions:
+            raise ValueError(f"Stream '{stream_id}' already registered")
+        session = CameraSession(stream_id, spec, realtime, pool=self.pool,
+                                metrics=metrics, tracer=tracer, target_fps=target_fps,
+                                encode_workers=encode_workers,
+                                engine_options=self.engine_options)
+        self._sessions[stream_id] = session
+        return session
+
+    def use_pool(self, pool):
+        """Share `pool` among all sessions, present and future (before start())."""
+        self.pool = pool
+        for session in self:
+            session.pool = pool
+
+    def get(self, stream_id):
+        """Session for `stream_id`, or None."""
+        return self._sessions.get(stream_id)
+
+    @property
+    def default(self):
+        return next(iter(self._sessions.values()), None)
+
+    def ids(self):
+        return list(self._sessions)
+
+    def __iter__(self):
+        return iter(list(self._sessions.values()))
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def start(self, loop):
+        """Start the shared pool (if any), then every session's camera thread."""
+        if self.pool is not None:
+            self.pool.start()
+        for session in self:
+            session.start(loop)
+
+    def stop(self, timeout=3.0):
+        """Stop the sessions first (their stages may be waiting on the pool)."""
+        for session in self:
+            session.state["running"] = False
+        for session in self:
+            session.stop(timeout)
+        if self.pool is not None:
+            self.pool.stop(timeout)
+
+
+class UploadSession:
+    """
+    One browser that uploads its own webcam frames.
+
+    process() turns an uploaded JPEG into the composited JPEG. It is called
+    from a worker thread (never concurrently for one session); the MediaPipe
+    calls block on the shared MicroBatchers.
+
+    Args:
+        hands, segmentor: Shared models (MicroBatcher or PooledModel).
+        max_width: Uploads wider than this are downscaled on arrival.
+        jpeg_quality: Quality of the returned frames.
+        engine_options: Overrides for ENGINE_OPTIONS (see build_engines).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, hands, segmentor, max_width=960, jpeg_quality=80, engine_options=None):
+        self.id = next(self._ids)
+        self.gesture, self.cloner = build_engines(hands, segmentor, engine_options)
+        self.engine_options = engine_options
+        self.max_width = max_width
+        self.jpeg_quality = jpeg_quality
+        self.state = {"jutsu_active": False, "fps": 0, "debug_mode": False,
+                      "resolution": "unknown"}
+        self.frames = 0
+        self.dropped = 0        # uploads superseded before they were processed
+        self.last_latency_ms = 0.0
+        self._prev_output = None
+
+    def process(self, jpeg):
+        """Uploaded JPEG bytes → (composited JPEG bytes or None, jutsu_active)."""
+        t0 = time.perf_counter()
+        frame = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            return None, self.state["jutsu_active"]
+        h, w = frame.shape[:2]
+        if w > self.max_width:
+            frame = cv2.resize(frame, (self.max_width, h * self.max_width // w),
+                               interpolation=cv2.INTER_AREA)
+            h, w = frame.shape[:2]
+        self.state["resolution"] = f"{w}x{h}"
+
+        self.frames += 1
+        ctx = FrameContext(frame, self.frames, mirror=True,
+                           inference_scale=inference_scale_for(w, self.engine_options))
+        active, hand_results = self.gesture.detect(ctx.small_rgb)
+        output = self.cloner.render(ctx.frame, active=active, frame_rgb=ctx.small_rgb,
+                                    inplace=True)
+        if self.state["debug_mode"]:
+            output = self.gesture.draw_landmarks(output, hand_results)
+        ok, encoded = cv2.imencode('.jpg', output, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+
+        now = time.perf_counter()
+        if self._prev_output is not None and now > self._prev_output:
+            self.state["fps"] = round(1.0 / (now - self._prev_output), 1)
+        self._prev_output = now
+        self.state["jutsu_active"] = active
+        self.last_latency_ms = (now - t0) * 1000.0
+        return (encoded.tobytes() if ok else None), active
+
+    def status(self):
+        return {
+            "upload": self.id,
+            "jutsu_active": self.state["jutsu_active"],
+            "fps": self.state["fps"],
+            "debug_mode": self.state["debug_mode"],
+            "resolution": self.state["resolution"],
+            "running": True,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "process_ms": round(self.last_latency_ms, 1),
+            "seal": self.gesture.last_seal,
+            "gesture_rate": self.gesture.rate_stats() or {},
+            "mask_cache": self.cloner.mask_stats(),
+        }
@@ -1,16 +1,62 @@
 """
 Clone Engine — Shadow Clone Rendering
 ======================================
-Extracts user via SelfieSegmentation, generates two horizontally-shifted
-clones with blue chakra tint and smooth alpha blending.
+Extracts user via SelfieSegmentation, generates shifted/scaled clones with
+chakra tint and smooth alpha blending. The default is the classic two
+clones at ±offset_x; any list of CloneSpec entries can be rendered instead
+(e.g. a 6- or 10-clone "multi shadow clone" formation).
 
 Performance: NumPy slicing only. Zero Python loops in the render path.
+Optional temporal mask reuse skips SelfieSegmentation on frames where the
+user has barely moved, serving (and optionally shifting) the cached mask.
+Segmentation and mask refinement can run at a reduced inference scale; the
+mask is upscaled only at compositing time.
 """
 
 import cv2
+import time
 import numpy as np
 import mediapipe as mp
 
+from src.engines.compositor import (
+    blend_uint8, check_compositor, expand_weight, make_gain_lut, make_scale_lut,
+    mask_to_uint8,
+)
+from src.utils.buffer_arena import BufferArena
+from src.utils.frame_ops import inference_rgb
+
+
+class CloneSpec:
+    """
+    One shadow clone: placement, size and look.
+
+    Args:
+        offset_x, offset_y: Shift of the clone relative to the user (px).
+        scale: Size relative to the user; scaled clones keep their feet on
+            the user's baseline (bottom-center anchored) plus offset_y.
+        alpha: Clone opacity in [0, 1].
+        tint_bgr: BGR tint color; each channel multiplies by tint / 255.
+    """
+
+    def __init__(self, offset_x=0, offset_y=0, scale=1.0, alpha=0.7,
+                 tint_bgr=(255, 100, 100)):
+        if scale <= 0:
+            raise ValueError(f"CloneSpec scale must be positive, got {scale}")
+        self.offset_x = int(offset_x)
+        self.offset_y = int(offset_y)
+        self.scale = float(scale)
+        self.alpha = float(alpha)
+        self.tint_bgr = tuple(tint_bgr)
+        # Precomputed per-clone tint (float vector + uint8 LUT) and alpha LUT
+        gains = tuple(c / 255.0 for c in self.tint_bgr)
+        self.tint_vec = np.array(gains, dtype=np.float32)
+        self.tint_lut = make_gain_lut(gains)
+        self.alpha_lut = make_scale_lut(self.alpha)
+
+    def __repr__(self):
+        return (f"CloneSpec(offset_x={self.offset_x}, offset_y={self.offset_y}, "
+                f"scale={self.scale}, alpha={self.alpha}, tint_bgr={self.tint_bgr})")
+
 
 class CloneEngine:
     """
@@ -20,106 +66,425 @@ class CloneEngine:
         1. SelfieSegmentation → raw mask
         2. Binary threshold → Gaussian blur (edge smoothing)
         3. Extract foreground
-        4. Slice-shift to ±offset positions
-        5. Apply blue tint + alpha blend
-        6. Composite: Background → Clones → Real User (layered)
+        4. Slice-shift (and optionally scale) to each clone's position
+        5. Apply chakra tint + alpha blend
+        6. Composite: Background → Clones (in list order) → Real User
+
+    Steps 3-6 only touch the user's bounding box and the clones' destination
+    boxes, so compositing cost scales with the person's size. Destination
+    regions for all clones are computed in one vectorized step per frame,
+    then blended in a single ordered pass (list order = back to front).
+
+    Clones:
+        clones: List of CloneSpec. Defaults to two clones at ±offset_x with
+            clone_alpha and tint_bgr. See CloneEngine.formation() for an
+            N-clone layout.
+
+    Mask reuse (steps 1-2 skipped on a cache hit):
+        mask_reuse_interval: Max consecutive frames served by one
+            segmentation (1 = segment every frame, the default).
+        motion_threshold: If set, refresh early when the mean absolute
+            difference of a 64x48 grayscale thumbnail against the last
+            segmented frame exceeds this value (0-255 scale).
+        mask_warp: Shift the cached mask by the global translation
+            (phase correlation on the thumbnails) before reusing it.
+
+    Reduced-resolution inference:
+        inference_scale: Downscale factor applied before segmentation when
+            render() isn't handed a pre-scaled `frame_rgb`. Threshold + blur
+            run at that resolution; the mask is upscaled for compositing.
+
+    Shared inference:
+        segmentor: Object with .process(rgb) → .segmentation_mask to use
+            instead of a private SelfieSegmentation (e.g. a PooledModel from
+            src.engines.inference_pool).
+
+    Compositor:
+        compositor: "float" (reference float32 math) or "uint8" (fixed-point
+            blend with in-place uint16 accumulators and a pre-tinted LUT —
+            visually equivalent, no full-frame float32 temporaries).
     """
 
-    def __init__(self, offset_x=350, clone_alpha=0.7, tint_bgr=(255, 100, 100)):
+    # Thumbnail size for the cheap motion score
+    MOTION_SIZE = (64, 48)
+
+    def __init__(self, offset_x=350, clone_alpha=0.7, tint_bgr=(255, 100, 100),
+                 mask_reuse_interval=1, motion_threshold=None, mask_warp=False,
+                 inference_scale=1.0, compositor="float", clones=None, segmentor=None):
         self.mp_seg = mp.solutions.selfie_segmentation
         # model_selection=1 is landscape-optimized
-        self.segmentor = self.mp_seg.SelfieSegmentation(model_selection=1)
+        self.segmentor = segmentor or self.mp_seg.SelfieSegmentation(model_selection=1)
         self.offset_x = offset_x
         self.clone_alpha = clone_alpha
-        # BGR tint color for "chakra" effect
-        self.tint_b = tint_bgr[0] / 255.0
-        self.tint_g = tint_bgr[1] / 255.0
-        self.tint_r = tint_bgr[2] / 255.0
+        self.tint_bgr = tuple(tint_bgr)
+        self.set_clones(clones)
+
+        self.inference_scale = inference_scale
+
+        # Compositor: "float" (reference) or "uint8" (fixed-point, in-place)
+        self.compositor = check_compositor(compositor)
+
+        # Frame-sized scratch buffers, allocated once per resolution
+        self.arena = BufferArena()
+
+        # Temporal mask reuse
+        self.mask_reuse_interval = max(1, int(mask_reuse_interval))
+        self.motion_threshold = motion_threshold
+        self.mask_warp = mask_warp
+        self._cached_mask = None
+        self._cached_thumb = None
+        self._frames_since_seg = 0
+        self.seg_runs = 0      # cache misses (segmentation executed)
+        self.mask_reuses = 0   # cache hits (segmentation skipped)
+        self.last_motion = 0.0
+        self.last_roi_fraction = 0.0
+        # Seconds spent in the last active render(), for per-stage metrics
+        self.last_timings = {"segmentation": 0.0, "compositing": 0.0}
+
+    def set_clones(self, clones=None):
+        """Replace the clone list (None → the default ±offset_x pair)."""
+        if clones is None:
+            clones = [
+                CloneSpec(-self.offset_x, 0, 1.0, self.clone_alpha, self.tint_bgr),
+                CloneSpec(self.offset_x, 0, 1.0, self.clone_alpha, self.tint_bgr),
+            ]
+        self.clones = list(clones)
+        # Spec columns as arrays, so per-frame placement is one vector op
+        self._spec_ox = np.array([c.offset_x for c in self.clones], dtype=np.int64)
+        self._spec_oy = np.array([c.offset_y for c in self.clones], dtype=np.int64)
+        self._spec_scale = np.array([c.scale for c in self.clones], dtype=np.float64)
+
+    @staticmethod
+    def formation(count, spacing=220, depth_scale=0.88, depth_rise=-12,
+                  alpha=0.7, tint_bgr=(255, 100, 100)):
+        """
+        Symmetric "multi shadow clone" layout of `count` clones.
+
+        Clones alternate right/left in rows of two; each row further out is
+        spaced by `spacing`, scaled by `depth_scale` and raised by
+        `depth_rise` px for a sense of depth. Returned back-to-front (outer
+        rows first) so nearer clones are drawn over farther ones.
+        """
+        specs = []
+        for i in range(count):
+            row = i // 2 + 1
+            side = 1 if i % 2 == 0 else -1
+            specs.append(CloneSpec(
+                offset_x=side * row * spacing,
+                offset_y=(row - 1) * depth_rise,
+                scale=depth_scale ** (row - 1),
+                alpha=alpha,
+                tint_bgr=tint_bgr,
+            ))
+        return sorted(specs, key=lambda c: c.scale)
 
-    def render(self, frame, active=False):
+    def mask_stats(self):
+        """Segmentation cache hit/miss counters."""
+        total = self.seg_runs + self.mask_reuses
+        return {
+            "seg_runs": self.seg_runs,
+            "mask_reuses": self.mask_reuses,
+            "hit_ratio": round(self.mask_reuses / total, 3) if total else 0.0,
+            "last_motion": round(self.last_motion, 2),
+            "roi_fraction": round(self.last_roi_fraction, 3),
+        }
+
+    def _motion_thumb(self, frame_rgb):
+        """Tiny float32 grayscale thumbnail for motion scoring."""
+        gray = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2GRAY)
+        thumb = cv2.resize(gray, self.MOTION_SIZE, interpolation=cv2.INTER_AREA)
+        return thumb.astype(np.float32)
+
+    def _segment(self, frame_rgb):
+        """
+        Returns the refined (thresholded + blurred) float32 mask at the
+        resolution of `frame_rgb`, either from a fresh SelfieSegmentation
+        pass or from the temporal cache.
+        """
+        h, w, _ = frame_rgb.shape
+        cacheable = self.mask_reuse_interval > 1 or self.motion_threshold is not None
+        thumb = self._motion_thumb(frame_rgb) if cacheable else None
+
+        if cacheable and self._cached_mask is not None and self._cached_mask.shape == (h, w):
+            reuse = self._frames_since_seg < self.mask_reuse_interval - 1
+            if self.motion_threshold is not None:
+                self.last_motion = float(cv2.absdiff(thumb, self._cached_thumb).mean())
+                if self.mask_reuse_interval == 1:
+                    # Motion-only gating: reuse until the scene moves
+                    reuse = True
+                reuse = reuse and self.last_motion < self.motion_threshold
+            if reuse:
+                self._frames_since_seg += 1
+                self.mask_reuses += 1
+                if not self.mask_warp:
+                    return self._cached_mask
+                # Global shift since the segmented frame, scaled to mask res
+                (dx, dy), _ = cv2.phaseCorrelate(self._cached_thumb, thumb)
+                dx *= w / self.MOTION_SIZE[0]
+                dy *= h / self.MOTION_SIZE[1]
+                shift = np.float32([[1, 0, dx], [0, 1, dy]])
+                return cv2.warpAffine(self._cached_mask, shift, (w, h))
+
+        # --- Segmentation ---
+        seg_result = self.segmentor.process(frame_rgb)
+        raw_mask = seg_result.segmentation_mask  # float32 (H, W), range [0, 1]
+
+        # --- Mask Refinement (Edge Smoothing) ---
+        # Binary threshold to kill weak confidence areas
+        _, binary_mask = cv2.threshold(raw_mask, 0.5, 1.0, cv2.THRESH_BINARY)
+        # 3x3 Gaussian blur on mask edges for smooth "ghostly" boundaries
+        smooth_mask = cv2.GaussianBlur(binary_mask, (3, 3), 0)
+
+        self.seg_runs += 1
+        if cacheable:
+            self._cached_mask = smooth_mask
+            self._cached_thumb = thumb
+            self._frames_since_seg = 0
+        return smooth_mask
+
+    def render(self, frame, active=False, frame_rgb=None, mask=None, inplace=False):
         """
         Applies the shadow clone effect if active.
 
+        Scratch space comes from the engine's BufferArena. By default the
+        composite goes into a copy of `frame`, which is left untouched (it
+        may be read-only, e.g. a memory-mapped session frame); with
+        inplace=True it is written into `frame` itself, so a steady-state
+        frame allocates nothing frame-sized.
+
         Args:
             frame: BGR numpy array from camera.
             active: Whether JUTSU_ACTIVE is True.
+            frame_rgb: Optional RGB copy of `frame` for segmentation, at any
+                (typically reduced) resolution — lets the caller share one
+                downscaled frame between hand inference and segmentation.
+            mask: Optional precomputed refined float32 mask (any resolution)
+                — skips segmentation entirely (fixtures, external inference).
+            inplace: Composite into `frame` (must be writable and owned by
+                the caller) instead of a copy.
 
         Returns:
-            Composited BGR frame.
+            Composited BGR frame (`frame` itself when inactive or inplace).
         """
         if not active:
+            # A mask cached before the jutsu was released is stale by now
+            self._cached_mask = None
             return frame
 
         h, w, _ = frame.shape
-        off = self.offset_x
+        t0 = time.perf_counter()
 
-        # --- Layer 0: Background (original frame) ---
-        # We'll use this as the base canvas.
+        # --- Segmentation + Refinement (possibly served from cache) ---
+        if mask is not None:
+            smooth_mask = mask
+        else:
+            if frame_rgb is None:
+                frame_rgb = inference_rgb(frame, self.inference_scale)
+            smooth_mask = self._segment(frame_rgb)
+        t1 = time.perf_counter()
+        self.last_timings["segmentation"] = t1 - t0
 
-        # --- Segmentation ---
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        seg_result = self.segmentor.process(frame_rgb)
-        raw_mask = seg_result.segmentation_mask  # float32 (H, W), range [0, 1]
+        # --- Person bounding box: everything below touches only this box
+        #     and its shifted copies, never the whole frame ---
+        roi = self._mask_roi(smooth_mask, w, h)
+        if roi is None:
+            # Nobody in frame → nothing to clone
+            self.last_roi_fraction = 0.0
+            self.last_timings["compositing"] = time.perf_counter() - t1
+            return frame
+        box, mask_roi = roi
+        self.last_roi_fraction = (box[2] - box[0]) * (box[3] - box[1]) / float(w * h)
+        if not inplace:
+            frame = frame.copy()
 
-        # --- Mask Refinement (Edge Smoothing) ---
-        # Binary threshold to kill weak confidence areas
-        _, binary_mask = cv2.threshold(raw_mask, 0.5, 1.0, cv2.THRESH_BINARY)
-        # 3x3 Gaussian blur on mask edges for smooth "ghostly" boundaries
-        smooth_mask = cv2.GaussianBlur(binary_mask, (3, 3), 0)
-        # Expand to 3-channel for broadcasting: (H, W) → (H, W, 3)
-        mask_3d = smooth_mask[:, :, np.newaxis]  # broadcasts automatically with *
-
-        # --- Layer 2: Extract Foreground (Real User) ---
-        fg = frame.astype(np.float32)
-        foreground = fg * mask_3d  # user pixels only, background = 0
-
-        # --- Layer 1: Generate Clones via Slicing ---
-        # Left clone: shift user pixels LEFT by 'off'
-        # Right clone: shift user pixels RIGHT by 'off'
-        left_clone = np.zeros_like(fg)
-        right_clone = np.zeros_like(fg)
-
-        if off < w:
-            # Left: src[off:] → dst[:w-off]  (move image leftward)
-            left_clone[:, :w - off] = foreground[:, off:]
-            # Right: src[:w-off] → dst[off:]  (move image rightward)
-            right_clone[:, off:] = foreground[:, :w - off]
-
-        # --- Blue Chakra Tint ---
-        # Multiply each channel by the tint ratio
-        # BGR order: index 0=B, 1=G, 2=R
-        left_clone[:, :, 0] *= self.tint_b   # Blue
-        left_clone[:, :, 1] *= self.tint_g   # Green
-        left_clone[:, :, 2] *= self.tint_r   # Red
-        right_clone[:, :, 0] *= self.tint_b
-        right_clone[:, :, 1] *= self.tint_g
-        right_clone[:, :, 2] *= self.tint_r
-
-        # --- Compositing (Layered Alpha Blend) ---
-        # Build clone masks for proper alpha compositing
-        # Clone mask = shifted version of the user mask
-        left_mask = np.zeros_like(smooth_mask)
-        right_mask = np.zeros_like(smooth_mask)
-        if off < w:
-            left_mask[:, :w - off] = smooth_mask[:, off:]
-            right_mask[:, off:] = smooth_mask[:, :w - off]
-
-        left_mask_3d = left_mask[:, :, np.newaxis] * self.clone_alpha
-        right_mask_3d = right_mask[:, :, np.newaxis] * self.clone_alpha
-        user_mask_3d = mask_3d  # full opacity for real user
-
-        # Start with background
-        output = fg.copy()
-
-        # Blend left clone: output = output * (1 - alpha) + clone * alpha  (where clone exists)
-        output = output * (1 - left_mask_3d) + left_clone * left_mask_3d
-
-        # Blend right clone
-        output = output * (1 - right_mask_3d) + right_clone * right_mask_3d
+        if self.compositor == "uint8":
+            frame = self._composite_uint8(frame, box, mask_roi)
+        else:
+            frame = self._composite_float(frame, box, mask_roi)
+        self.last_timings["compositing"] = time.perf_counter() - t1
+        return frame
 
-        # Re-draw real user on TOP (full opacity over clones)
-        output = output * (1 - user_mask_3d) + fg * user_mask_3d
+    def _mask_roi(self, smooth_mask, w, h):
+        """
+        Bounding box of the user at frame resolution, plus the mask cropped
+        to that box (uint8 or float32 to match the compositor).
+
+        The box is found on the inference-resolution mask (cheap), padded by
+        one low-res pixel for the bilinear upscale, and only the cropped
+        region is upscaled.
+
+        Returns:
+            ((x0, y0, x1, y1), mask_roi) or None when the mask is empty.
+        """
+        arena = self.arena
+        mh, mw = smooth_mask.shape
+        mask_u8 = mask_to_uint8(smooth_mask, dst=arena.get("mask_u8_lowres", (mh, mw)))
+        bx, by, bw, bh = cv2.boundingRect(mask_u8)
+        if bw == 0 or bh == 0:
+            return None
+
+        lx0, ly0 = max(0, bx - 1), max(0, by - 1)
+        lx1, ly1 = min(mw, bx + bw + 1), min(mh, by + bh + 1)
+        sx, sy = w / float(mw), h / float(mh)
+        x0, y0 = int(lx0 * sx), int(ly0 * sy)
+        x1, y1 = min(w, int(np.ceil(lx1 * sx))), min(h, int(np.ceil(ly1 * sy)))
+
+        if self.compositor == "uint8":
+            src, dtype = mask_u8[ly0:ly1, lx0:lx1], np.uint8
+        else:
+            src, dtype = smooth_mask[ly0:ly1, lx0:lx1], np.float32
+        rw, rh = x1 - x0, y1 - y0
+        if src.shape == (rh, rw):
+            return (x0, y0, x1, y1), src
+        # Upscale the low-res crop only now, for compositing. The affine map
+        # reproduces cv2.resize's pixel-center sampling of the FULL mask, so
+        # the crop lines up exactly; output goes into a view of a frame-sized
+        # arena buffer, so box size changes don't reallocate.
+        to_src = np.float32([
+            [1.0 / sx, 0.0, (x0 + 0.5) / sx - 0.5 - lx0],
+            [0.0, 1.0 / sy, (y0 + 0.5) / sy - 0.5 - ly0],
+        ])
+        dst = arena.get("mask_roi", (h, w), dtype)[:rh, :rw]
+        mask_roi = cv2.warpAffine(src, to_src, (rw, rh), dst=dst,
+                                  flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                                  borderMode=cv2.BORDER_REPLICATE)
+        return (x0, y0, x1, y1), mask_roi
+
+    def _clone_regions(self, box, w, h):
+        """
+        Destination regions for every clone, computed with array ops.
+
+        Returns a list of (spec, size, dst, src) where `size` is the scaled
+        box (sw, sh), `dst` = (y0, y1, x0, x1) in the frame and `src` =
+        (r0, r1, c0, c1) in the scaled box. Off-frame clones are skipped.
+        """
+        x0, y0, x1, y1 = box
+        rw, rh = x1 - x0, y1 - y0
 
-        # Clamp and convert
-        output = np.clip(output, 0, 255).astype(np.uint8)
-        return output
+        sw = np.maximum(1, np.rint(rw * self._spec_scale)).astype(np.int64)
+        sh = np.maximum(1, np.rint(rh * self._spec_scale)).astype(np.int64)
+        # Bottom-center anchor: scale == 1 reduces to a plain (ox, oy) shift
+        dx0 = x0 + self._spec_ox + (rw - sw) // 2
+        dy0 = y0 + self._spec_oy + (rh - sh)
+        cx0, cx1 = np.maximum(dx0, 0), np.minimum(dx0 + sw, w)
+        cy0, cy1 = np.maximum(dy0, 0), np.minimum(dy0 + sh, h)
+        visible = (cx1 > cx0) & (cy1 > cy0)
+
+        regions = []
+        for i in np.flatnonzero(visible):
+            regions.append((
+                self.clones[i],
+                (int(sw[i]), int(sh[i])),
+                (int(cy0[i]), int(cy1[i]), int(cx0[i]), int(cx1[i])),
+                (int(cy0[i] - dy0[i]), int(cy1[i] - dy0[i]),
+                 int(cx0[i] - dx0[i]), int(cx1[i] - dx0[i])),
+            ))
+        return regions
+
+    def _scaled(self, cache, name, src, size, frame_shape):
+        """
+        `src` resized to `size` (w, h), memoized per frame in `cache` so
+        clones sharing a scale share the resize. Output lives in a frame-sized
+        arena buffer (grown only for clones larger than the frame).
+        """
+        if size == (src.shape[1], src.shape[0]):
+            return src
+        key = (name, size)
+        if key not in cache:
+            sw, sh = size
+            shape = (max(sh, frame_shape[0]), max(sw, frame_shape[1])) + src.shape[2:]
+            buf = self.arena.get(f"{name}_{len(cache)}", shape, src.dtype)[:sh, :sw]
+            cache[key] = cv2.resize(src, size, dst=buf, interpolation=cv2.INTER_LINEAR)
+        return cache[key]
+
+    def _composite_float(self, frame, box, mask_roi):
+        """
+        Reference float32 compositor (steps 3-6), restricted to the person
+        box and the clones' destination regions, in place on arena buffers:
+            clone:  dst += (foreground * tint - dst) * mask * alpha
+            user:   box += (original - box) * mask
+        """
+        h, w, _ = frame.shape
+        x0, y0, x1, y1 = box
+        rh, rw = y1 - y0, x1 - x0
+        arena = self.arena
+
+        # --- Layer 2: Extract Foreground (Real User), box only ---
+        fg = arena.get("fg", (h, w, 3), np.float32)[:rh, :rw]
+        np.copyto(fg, frame[y0:y1, x0:x1])
+        foreground = arena.get("foreground", (h, w, 3), np.float32)[:rh, :rw]
+        np.multiply(fg, mask_roi[:, :, np.newaxis], out=foreground)  # background = 0
+
+        # --- Layer 1: Clones, one ordered pass (shift/scale + tint + blend) ---
+        scaled = {}
+        for spec, size, (dy0, dy1, dx0, dx1), (r0, r1, c0, c1) in self._clone_regions(box, w, h):
+            ch, cw = dy1 - dy0, dx1 - dx0
+            fore_s = self._scaled(scaled, "fore", foreground, size, frame.shape)[r0:r1, c0:c1]
+            mask_s = self._scaled(scaled, "mask", mask_roi, size, frame.shape)[r0:r1, c0:c1]
+
+            dst = frame[dy0:dy1, dx0:dx1]
+            lay = arena.get("layer", (h, w, 3), np.float32)[:ch, :cw]
+            cl = arena.get("clone", (h, w, 3), np.float32)[:ch, :cw]
+            cwt = arena.get("clone_w", (h, w, 1), np.float32)[:ch, :cw]
+            np.copyto(lay, dst)
+            np.multiply(fore_s, spec.tint_vec, out=cl)
+            np.multiply(mask_s[:, :, np.newaxis], spec.alpha, out=cwt)
+            # lay = lay * (1 - a) + clone * a  ==  lay += (clone - lay) * a
+            np.subtract(cl, lay, out=cl)
+            cl *= cwt
+            lay += cl
+            np.clip(lay, 0, 255, out=lay)
+            np.copyto(dst, lay, casting="unsafe")
+
+        # --- Re-draw real user on TOP (full opacity over clones) ---
+        dst, lay = frame[y0:y1, x0:x1], arena.get("layer", (h, w, 3), np.float32)[:rh, :rw]
+        np.copyto(lay, dst)
+        np.subtract(fg, lay, out=foreground)
+        foreground *= mask_roi[:, :, np.newaxis]
+        lay += foreground
+        np.clip(lay, 0, 255, out=lay)
+        np.copyto(dst, lay, casting="unsafe")
+        return frame
+
+    def _composite_uint8(self, frame, box, mask_roi):
+        """
+        Integer compositor (steps 3-6) — same layering as _composite_float,
+        but in uint8 fixed point with in-place uint16 accumulators and
+        per-clone tint/alpha LUTs, restricted to the person box and the
+        clones' destination regions.
+        """
+        h, w, _ = frame.shape
+        x0, y0, x1, y1 = box
+        rh, rw = y1 - y0, x1 - x0
+        arena = self.arena
+
+        acc = arena.get("acc", (h, w, 3), np.uint16)
+        tmp = arena.get("tmp", (h, w, 3), np.uint16)
+        inv3 = arena.get("inv3", (h, w, 3))
+        tinted = arena.get("tinted", (h, w, 3))
+        clone_w3 = arena.get("clone_w3", (h, w, 3))
+        mask3 = expand_weight(mask_roi, dst=arena.get("mask3", (h, w, 3))[:rh, :rw])
+
+        # The user layer is re-drawn from an untouched copy of the box
+        original = arena.get("original", (h, w, 3))[:rh, :rw]
+        np.copyto(original, frame[y0:y1, x0:x1])
+        # Clones sample the mask-premultiplied foreground (background = 0),
+        # as in _composite_float, so soft mask edges darken the same way
+        foreground = cv2.multiply(original, mask3, dst=arena.get("fore_u8", (h, w, 3))[:rh, :rw],
+                                  scale=1.0 / 255.0)
+
+        # --- Clones, one ordered pass (shift/scale + LUT tint + blend) ---
+        scaled = {}
+        for spec, size, (dy0, dy1, dx0, dx1), (r0, r1, c0, c1) in self._clone_regions(box, w, h):
+            ch, cw = dy1 - dy0, dx1 - dx0
+            pix_s = self._scaled(scaled, "pix", foreground, size, frame.shape)[r0:r1, c0:c1]
+            mask_s = self._scaled(scaled, "mask3", mask3, size, frame.shape)[r0:r1, c0:c1]
+            tint = cv2.LUT(pix_s, spec.tint_lut, dst=tinted[:ch, :cw])
+            weight = cv2.LUT(mask_s, spec.alpha_lut, dst=clone_w3[:ch, :cw])
+            blend_uint8(frame[dy0:dy1, dx0:dx1], tint, weight,
+                        acc[:ch, :cw], tmp[:ch, :cw], inv3[:ch, :cw])
+
+        # Re-draw real user on TOP (full opacity over clones)
+        blend_uint8(frame[y0:y1, x0:x1], original, mask3,
+                    acc[:rh, :rw], tmp[:rh, :rw], inv3[:rh, :rw])
+        return frame
@@ -0,0 +1,75 @@
+"""
+Compositor — Integer (uint8) Blending Primitives
+=================================================
+Fixed-point building blocks for the clone compositors. Everything stays in
+uint8 (pixels, masks) with uint16 accumulators written in place, so a frame
+is composited without any full-frame float32 temporaries.
+
+Fixed-point convention: weights are uint8 in [0, 255] where 255 == 1.0.
+    dst = (dst * (255 - w) + src * w) / 255        (rounded)
+The sum never exceeds 255 * 255 = 65025, so it fits a uint16 accumulator.
+All arithmetic goes through OpenCV's saturating SIMD kernels with explicit
+`dst=` views, so nothing is allocated inside a blend.
+"""
+
+import cv2
+import numpy as np
+
+
+COMPOSITORS = ("float", "uint8")
+
+
+def check_compositor(name):
+    """Validate a compositor name (shared by CloneEngine / CloneRenderer)."""
+    if name not in COMPOSITORS:
+        raise ValueError(f"Unknown compositor '{name}' (expected one of {COMPOSITORS})")
+    return name
+
+
+def make_gain_lut(gains_bgr):
+    """
+    Per-channel lookup table implementing `pixel * gain` (saturated).
+
+    Returns a (256, 1, 3) uint8 table for cv2.LUT, so tinting a frame is a
+    single table lookup per pixel instead of three float multiplies.
+    """
+    ramp = np.arange(256, dtype=np.float32)
+    lut = np.empty((256, 1, 3), dtype=np.uint8)
+    for c, gain in enumerate(gains_bgr):
+        lut[:, 0, c] = np.clip(np.rint(ramp * gain), 0, 255).astype(np.uint8)
+    return lut
+
+
+def make_scale_lut(scale):
+    """Single-channel lookup table implementing `weight * scale` (e.g. clone alpha)."""
+    ramp = np.arange(256, dtype=np.float32)
+    return np.clip(np.rint(ramp * scale), 0, 255).astype(np.uint8)
+
+
+def mask_to_uint8(mask, dst=None):
+    """float32 [0, 1] mask → uint8 [0, 255] (rounded, saturated)."""
+    return cv2.convertScaleAbs(mask, dst=dst, alpha=255.0)
+
+
+def expand_weight(weight, dst=None):
+    """uint8 (H, W) weight → (H, W, 3), so every blend op is a plain SIMD cv2 call."""
+    return cv2.merge((weight, weight, weight), dst=dst)
+
+
+def blend_uint8(dst, src, weight3, acc, tmp, inv3):
+    """
+    In-place fixed-point alpha blend: dst = dst * (1 - w) + src * w.
+
+    Args:
+        dst: uint8 (H, W, 3) view, overwritten with the result.
+        src: uint8 (H, W, 3) view of the layer being blended in.
+        weight3: uint8 (H, W, 3) weight view, 255 == fully opaque.
+        acc, tmp: uint16 (H, W, 3) scratch views (same shape as dst).
+        inv3: uint8 (H, W, 3) scratch view for 255 - weight.
+    """
+    cv2.bitwise_not(weight3, dst=inv3)          # 255 - w for uint8
+    cv2.multiply(dst, inv3, dst=acc, dtype=cv2.CV_16U)
+    cv2.multiply(src, weight3, dst=tmp, dtype=cv2.CV_16U)
+    cv2.add(acc, tmp, dst=acc)
+    # Rounded, saturated divide by 255 straight back into the uint8 view
+    cv2.convertScaleAbs(acc, dst=dst, alpha=1.0 / 255.0)
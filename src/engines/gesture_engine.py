@@ -3,10 +3,17 @@ Gesture Engine — Ram Seal Detection
 ====================================
 Detects the 'Ram' seal (Index Tip ID 8 + Middle Tip ID 12 proximity)
 using MediaPipe Hands with model_complexity=0 for maximum throughput.
+Optional ROI tracking runs steady-state inference on a crop around the
+last known hands (see src.engines.hand_roi), and an optional adaptive
+schedule skips inference on quiet frames (see src.engines.gesture_scheduler).
 """
 
 import mediapipe as mp
-import math
+import time
+
+from src.engines.gesture_scheduler import GestureScheduler
+from src.engines.hand_roi import HandRoiTracker
+from src.engines.seal_classifier import SealClassifier, landmarks_array
 
 
 class GestureEngine:
@@ -15,63 +22,122 @@ class GestureEngine:
 
     Trigger condition: Index Finger Tip (landmark 8) and Middle Finger Tip
     (landmark 12) of the SAME hand within normalized distance of 0.05.
-    Also supports two-hand cross detection.
+    Also supports two-hand cross detection. Every other seal in the
+    template library (src.engines.seal_classifier) is scored on the same
+    landmark array; the best match is exposed as `last_seal`.
+
+    ROI tracking (roi_tracking=True): after hands are found, inference runs
+    on a margin-padded crop around them, with a full-frame re-detection every
+    `redetect_interval` frames or as soon as the crop loses them. Landmarks
+    are always returned in full-frame coordinates. Both graphs then run in
+    static image mode, since neither sees a continuous video stream.
+
+    Adaptive rate (adaptive_rate=True): with no hands in view inference is
+    polled at `idle_hz`; it runs every frame once hands appear or the seal
+    is near the threshold, and re-checks only every `active_hold` seconds
+    while the jutsu is active. Skipped frames return the previous result.
+
+    Shared inference (hands=PooledModel): hand inference is handed to an
+    src.engines.inference_pool.InferencePool instead of graphs owned by
+    this engine; the same pooled model serves full frames and ROI crops.
+
+    Seal sequences (sequences=SealSequenceRecognizer): each inferred frame's
+    best seal is streamed into the recognizer, and a completed sequence
+    keeps the jutsu active for `effect_duration` seconds even after the
+    hands are released.
     """
 
-    def __init__(self, touch_threshold=0.05):
+    def __init__(self, touch_threshold=0.05, roi_tracking=False, roi_margin=0.5,
+                 redetect_interval=30, adaptive_rate=False, idle_hz=5.0,
+                 active_hold=0.1, sequences=None, effect_duration=5.0, hands=None):
         self.mp_hands = mp.solutions.hands
         # OPTIMIZATION: model_complexity=0 — lightest model for 60FPS
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
+        self.pooled = hands is not None
+        self.hands = hands if self.pooled else self._make_hands(static_image_mode=roi_tracking)
+        self.TOUCH_THRESHOLD = touch_threshold
+        self.mp_drawing = mp.solutions.drawing_utils
+
+        self.tracker = None
+        if roi_tracking:
+            self.tracker = HandRoiTracker(
+                # Pooled graphs are stateless per call, so one proxy serves both
+                self.hands,
+                self.hands if self.pooled else self._make_hands(static_image_mode=True),
+                margin=roi_margin, redetect_interval=redetect_interval,
+            )
+
+        self.classifier = SealClassifier()
+        self._ram = self.classifier.index("ram")
+        self._landmarks = landmarks_array(None)
+        self.last_seal = None
+
+        self.sequences = sequences
+        self.effect_duration = effect_duration
+        self._effect_until = 0.0
+
+        self.scheduler = None
+        if adaptive_rate:
+            self.scheduler = GestureScheduler(idle_hz=idle_hz, active_hold=active_hold)
+        self._last = (False, None)
+
+    def _make_hands(self, static_image_mode=False):
+        return self.mp_hands.Hands(
+            static_image_mode=static_image_mode,
             max_num_hands=2,
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5,
             model_complexity=0
         )
-        self.TOUCH_THRESHOLD = touch_threshold
-        self.mp_drawing = mp.solutions.drawing_utils
 
     def detect(self, frame_rgb):
         """
         Processes an RGB frame and returns (jutsu_active, hand_results).
 
         Args:
-            frame_rgb: numpy array in RGB format.
+            frame_rgb: numpy array in RGB format. May be downscaled (see
+                src.utils.frame_ops.inference_rgb) — landmarks are
+                normalized, so the seal check is resolution-independent.
 
         Returns:
             (bool, mediapipe results): Whether the seal is active, and raw results.
         """
-        results = self.hands.process(frame_rgb)
-        jutsu_active = False
+        now = time.monotonic()
+        if self.scheduler is not None and self._last[1] is not None \
+                and not self.scheduler.should_run(now):
+            self.scheduler.skip()
+            held, results = self._last
+            return held or now < self._effect_until, results
 
+        if self.tracker is not None:
+            results = self.tracker.process(frame_rgb)
+        else:
+            results = self.hands.process(frame_rgb)
+
+        # Closest index/middle tip distance across all seal checks
+        min_dist = None
+        self.last_seal = None
         if results.multi_hand_landmarks:
-            # Collect all (index_tip, middle_tip) pairs
-            tips = []
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Landmark 8: Index Finger Tip
-                # Landmark 12: Middle Finger Tip
-                tips.append((hand_landmarks.landmark[8], hand_landmarks.landmark[12]))
-
-            # Intra-hand check: fingers crossed on same hand
-            for index_tip, middle_tip in tips:
-                dist = math.hypot(
-                    index_tip.x - middle_tip.x,
-                    index_tip.y - middle_tip.y
-                )
-                if dist < self.TOUCH_THRESHOLD:
-                    jutsu_active = True
-                    break
-
-            # Inter-hand check: two hands touching (Naruto style)
-            if not jutsu_active and len(tips) == 2:
-                # Hand 1 Index → Hand 2 Middle
-                d1 = math.hypot(tips[0][0].x - tips[1][1].x, tips[0][0].y - tips[1][1].y)
-                # Hand 2 Index → Hand 1 Middle
-                d2 = math.hypot(tips[1][0].x - tips[0][1].x, tips[1][0].y - tips[0][1].y)
-                if d1 < self.TOUCH_THRESHOLD or d2 < self.TOUCH_THRESHOLD:
-                    jutsu_active = True
-
-        return jutsu_active, results
+            landmarks = landmarks_array(results, out=self._landmarks)
+            distances = self.classifier.distances(landmarks)
+            min_dist = float(distances[self._ram])
+            self.last_seal = self.classifier.classify(landmarks, distances)
+
+        held = min_dist is not None and min_dist < self.TOUCH_THRESHOLD
+
+        if self.sequences is not None and self.sequences.feed(self.last_seal, now):
+            self._effect_until = now + self.effect_duration
+
+        if self.scheduler is not None:
+            self.scheduler.update(
+                bool(results.multi_hand_landmarks), min_dist,
+                self.TOUCH_THRESHOLD, held, now,
+            )
+        self._last = (held, results)
+        return held or now < self._effect_until, results
+
+    def rate_stats(self):
+        """Adaptive schedule state, or None when every frame is inferred."""
+        return self.scheduler.stats() if self.scheduler is not None else None
 
     def draw_landmarks(self, frame, results):
         """Draws hand landmarks onto the frame (debug mode)."""
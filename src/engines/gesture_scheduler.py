@@ -0,0 +1,88 @@
+"""
+Gesture Scheduler — Activity-Driven Hand Inference Rate
+========================================================
+Decides, per frame, whether hand inference must run or the previous result
+can be reused:
+
+    idle     → no hands for `idle_after` s: poll at `idle_hz`
+    tracking → hands seen recently: every frame
+    near     → seal distance within `near_factor` x threshold: every frame
+    hold     → jutsu active: re-check every `active_hold` s, keep the result
+
+The measured inference rate is tracked over a sliding one-second window.
+"""
+
+import time
+from collections import deque
+
+
+class GestureScheduler:
+    """Per-frame run/skip decision for GestureEngine.detect()."""
+
+    def __init__(self, idle_hz=5.0, idle_after=1.0, active_hold=0.1, near_factor=2.0):
+        self.idle_interval = 1.0 / idle_hz if idle_hz > 0 else 0.0
+        self.idle_after = idle_after
+        self.active_hold = active_hold
+        self.near_factor = near_factor
+
+        self.mode = "idle"
+        self._last_run = None
+        self._last_hands = None
+        self._runs = deque()
+        self.runs = 0
+        self.skipped = 0
+
+    def should_run(self, now=None):
+        """True if inference must run on this frame."""
+        now = time.monotonic() if now is None else now
+        if self._last_run is None:
+            return True
+        since = now - self._last_run
+        if self.mode == "hold":
+            return since >= self.active_hold
+        if self.mode == "idle":
+            return since >= self.idle_interval
+        return True
+
+    def skip(self):
+        """Record a frame served from the previous result."""
+        self.skipped += 1
+
+    def update(self, hands_seen, min_distance, threshold, active, now=None):
+        """Feed the outcome of an inference run and pick the next mode."""
+        now = time.monotonic() if now is None else now
+        self._last_run = now
+        self.runs += 1
+        self._runs.append(now)
+        self._trim(now)
+
+        if hands_seen:
+            self._last_hands = now
+
+        if active:
+            self.mode = "hold"
+        elif min_distance is not None and min_distance < threshold * self.near_factor:
+            self.mode = "near"
+        elif self._last_hands is not None and now - self._last_hands < self.idle_after:
+            self.mode = "tracking"
+        else:
+            self.mode = "idle"
+
+    def inference_hz(self, now=None):
+        """Inference runs during the last second."""
+        self._trim(time.monotonic() if now is None else now)
+        return len(self._runs)
+
+    def _trim(self, now):
+        # Drop runs outside the one-second window
+        while self._runs and now - self._runs[0] > 1.0:
+            self._runs.popleft()
+
+    def stats(self):
+        """JSON-friendly scheduler state."""
+        return {
+            "mode": self.mode,
+            "inference_hz": self.inference_hz(),
+            "runs": self.runs,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,117 @@
+"""
+Hand ROI Tracker — Crop-Based Steady-State Hand Inference
+==========================================================
+Once hands have been found, the next frame only needs to be searched near
+where they were. The tracker crops a margin-padded box around the last
+landmarks, runs MediaPipe Hands on that crop, and maps the landmarks back
+to full-frame normalized coordinates — callers see ordinary full-frame
+results. A full-frame pass still runs every `redetect_interval` frames (to
+pick up hands entering elsewhere) and whenever the crop loses the hands.
+"""
+
+import numpy as np
+
+
+class HandRoiTracker:
+    """
+    Wraps two MediaPipe Hands graphs: one for full frames, one for crops.
+
+    Both should run with static_image_mode=True. The crop moves and changes
+    size from frame to frame, and the full-frame graph only sees a frame at
+    each re-detection, so neither input stream is continuous enough for
+    MediaPipe's own landmark tracking; the tracker's crop replaces it.
+
+    Args:
+        full_hands: Hands instance used for full-frame (re-)detection.
+        roi_hands: Hands instance used on crops.
+        margin: Padding around the landmark box, as a fraction of its size.
+        min_size: Minimum crop side in pixels (small hands still get context).
+        redetect_interval: Max consecutive crop-only frames.
+    """
+
+    def __init__(self, full_hands, roi_hands, margin=0.5, min_size=128,
+                 redetect_interval=30):
+        self.full_hands = full_hands
+        self.roi_hands = roi_hands
+        self.margin = margin
+        self.min_size = min_size
+        self.redetect_interval = max(1, int(redetect_interval))
+
+        self._roi = None
+        self._since_full = 0
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.last_roi_fraction = 1.0
+
+    def process(self, frame_rgb):
+        """Drop-in for Hands.process(): results in full-frame coordinates."""
+        h, w = frame_rgb.shape[:2]
+        results = None
+
+        if self._roi is not None and self._since_full < self.redetect_interval:
+            x0, y0, x1, y1 = self._roi
+            crop = np.ascontiguousarray(frame_rgb[y0:y1, x0:x1])
+            results = self.roi_hands.process(crop)
+            if results.multi_hand_landmarks:
+                self._to_frame_coords(results, x0, y0, x1 - x0, y1 - y0, w, h)
+                self._since_full += 1
+                self.roi_frames += 1
+                self.last_roi_fraction = (x1 - x0) * (y1 - y0) / float(w * h)
+            else:
+                # Lost the hands inside the crop → full-frame pass this frame
+                results = None
+
+        if results is None:
+            results = self.full_hands.process(frame_rgb)
+            self._since_full = 0
+            self.full_frames += 1
+            self.last_roi_fraction = 1.0
+
+        self._roi = self._roi_from(results, w, h)
+        return results
+
+    def reset(self):
+        """Forget the current ROI (next frame runs full-frame detection)."""
+        self._roi = None
+
+    def stats(self):
+        """Crop vs full-frame inference counters."""
+        total = self.roi_frames + self.full_frames
+        return {
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "roi_ratio": round(self.roi_frames / total, 3) if total else 0.0,
+            "last_roi_fraction": round(self.last_roi_fraction, 3),
+        }
+
+    @staticmethod
+    def _to_frame_coords(results, x0, y0, cw, ch, w, h):
+        """Rewrite crop-normalized landmarks as frame-normalized, in place."""
+        sx, sy = cw / float(w), ch / float(h)
+        ox, oy = x0 / float(w), y0 / float(h)
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                # z shares x's scale in MediaPipe's convention
+                lm.z = lm.z * sx
+
+    def _roi_from(self, results, w, h):
+        """Margin-padded pixel box around all detected landmarks, or None."""
+        if not results.multi_hand_landmarks:
+            return None
+        xs = np.array([lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark])
+        ys = np.array([lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark])
+        bx0, bx1 = xs.min() * w, xs.max() * w
+        by0, by1 = ys.min() * h, ys.max() * h
+
+        side = max(bx1 - bx0, by1 - by0) * (1.0 + 2.0 * self.margin)
+        side = max(side, self.min_size)
+        cx, cy = (bx0 + bx1) / 2.0, (by0 + by1) / 2.0
+        x0 = int(max(0, cx - side / 2.0))
+        y0 = int(max(0, cy - side / 2.0))
+        x1 = int(min(w, cx + side / 2.0))
+        y1 = int(min(h, cy + side / 2.0))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
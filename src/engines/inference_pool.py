@@ -0,0 +1,344 @@
+"""
+Inference Pool — Shared, Bounded MediaPipe Workers
+===================================================
+Every GestureEngine / CloneEngine normally owns its own MediaPipe graphs
+(two Hands graphs with ROI tracking, plus SelfieSegmentation), and every
+camera adds a FramePipeline with its own stage threads on top. With several
+cameras per host the model instances and their internal threads add up.
+
+An InferencePool runs a fixed number of worker threads, each owning ONE set
+of models. Pipelines hand their hand/segmentation calls to the pool through
+PooledModel objects, which are drop-in replacements for the MediaPipe
+solution objects (same .process(image) → results):
+
+    pool = InferencePool(workers=2)
+    pool.start()
+    gesture = GestureEngine(roi_tracking=True, hands=pool.model("hands"))
+    cloner = CloneEngine(segmentor=pool.model("segmentation"))
+
+Any worker can serve any stream, so pooled Hands graphs run with
+static_image_mode=True (no tracking state shared between cameras). Per-stream
+temporal state — the hand ROI crop, the adaptive schedule, the mask cache —
+stays in each stream's own engines, so crop inference and mask reuse still
+work per camera.
+
+The job queue is bounded: when every worker is busy and the queue is full,
+process() blocks, and the calling stage's latest-wins queue drops stale
+frames instead of building latency. Each stage has at most one call in
+flight, so the FIFO queue serves the cameras round-robin.
+
+With many small producers (e.g. one per browser upload session), a
+MicroBatcher sits in front of the pool: calls arriving within `max_wait`
+of each other are grouped into one job of up to `max_batch` images. This is
+not batched inference — MediaPipe's solution graphs take one image per
+call, so a single worker still runs the group's images one after another.
+What grouping saves is the per-call queue handoffs and thread wake-ups; the
+added latency is bounded by `max_wait`.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import mediapipe as mp
+
+
+MODEL_KINDS = ("hands", "segmentation")
+# How often a caller blocked on a full queue re-checks that the pool is running
+SUBMIT_POLL_SECONDS = 0.1
+
+
+def _make_model(kind):
+    """One MediaPipe solution instance for a pool worker."""
+    if kind == "hands":
+        return mp.solutions.hands.Hands(
+            static_image_mode=True,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            model_complexity=0,
+        )
+    if kind == "segmentation":
+        return mp.solutions.selfie_segmentation.SelfieSegmentation(model_selection=1)
+    raise ValueError(f"Unknown model kind '{kind}' (expected one of {MODEL_KINDS})")
+
+
+class PooledModel:
+    """`.process(image)` proxy that runs the call on an InferencePool worker."""
+
+    def __init__(self, pool, kind):
+        if kind not in MODEL_KINDS:
+            raise ValueError(f"Unknown model kind '{kind}' (expected one of {MODEL_KINDS})")
+        self.pool = pool
+        self.kind = kind
+
+    def process(self, image):
+        return self.pool.process(self.kind, image)
+
+    def close(self):
+        """No-op: the pool owns the graphs (mirrors the solution API)."""
+
+
+class InferencePool:
+    """
+    Fixed set of worker threads sharing a bounded job queue.
+
+    Args:
+        workers: Worker threads; each lazily builds one instance of each
+            model kind it is asked for.
+        max_pending: Queued (not yet running) jobs before process() blocks
+            (default: 2 per worker).
+    """
+
+    def __init__(self, workers=2, max_pending=None):
+        self.workers = max(1, int(workers))
+        self._jobs = queue.Queue(maxsize=max_pending or self.workers * 2)
+        self._threads = []
+        self.running = False
+        self._lock = threading.Lock()
+        self.calls = {kind: 0 for kind in MODEL_KINDS}
+        self.busy_seconds = {kind: 0.0 for kind in MODEL_KINDS}
+        self.wait_seconds = 0.0
+        self.models_built = 0
+        self.batches = 0
+        self.batched_images = 0
+
+    # ============================================================
+    # Lifecycle
+    # ============================================================
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"inference-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self, timeout=3.0):
+        self.running = False
+        # One sentinel per worker; queued jobs make room for them and fail
+        sentinels = len(self._threads)
+        while sentinels:
+            try:
+                self._jobs.put_nowait(None)
+                sentinels -= 1
+            except queue.Full:
+                self._fail_queued(limit=1)
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads = []
+        # Fail whatever is still queued so no caller waits forever
+        self._fail_queued()
+
+    def _fail_queued(self, limit=None):
+        while limit is None or limit > 0:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if limit is not None:
+                limit -= 1
+            if job is not None and job[3].set_running_or_notify_cancel():
+                job[3].set_exception(RuntimeError("InferencePool stopped"))
+
+    # ============================================================
+    # Calls
+    # ============================================================
+    def model(self, kind):
+        """PooledModel for `kind` ("hands" or "segmentation")."""
+        return PooledModel(self, kind)
+
+    def submit(self, kind, image):
+        """Queue one inference; blocks while the queue is full. Returns a Future."""
+        return self._submit(kind, [image], batched=False)
+
+    def submit_batch(self, kind, images):
+        """Queue `images` as ONE job for a single worker. The Future yields a list."""
+        return self._submit(kind, list(images), batched=True)
+
+    def _submit(self, kind, images, batched):
+        if not self.running:
+            raise RuntimeError("InferencePool is not running")
+        future = Future()
+        job = (kind, images, batched, future, time.perf_counter())
+        while True:
+            try:
+                self._jobs.put(job, timeout=SUBMIT_POLL_SECONDS)
+                break
+            except queue.Full:
+                if not self.running:
+                    raise RuntimeError("InferencePool stopped")
+        # stop() may have drained the queue while put() was blocked; a job that
+        # no worker or drain has claimed yet is withdrawn here instead
+        if not self.running and future.cancel():
+            raise RuntimeError("InferencePool stopped")
+        return future
+
+    def process(self, kind, image):
+        """Run one inference on a worker and wait for the results."""
+        return self.submit(kind, image).result()
+
+    def pending(self):
+        return self._jobs.qsize()
+
+    def stats(self):
+        """Calls, busy time and queueing delay per model kind."""
+        with self._lock:
+            total = sum(self.calls.values())
+            return {
+                "workers": self.workers,
+                "pending": self._jobs.qsize(),
+                "models": self.models_built,
+                "calls": dict(self.calls),
+                "busy_ms": {k: round(v * 1000.0, 1) for k, v in self.busy_seconds.items()},
+                "avg_wait_ms": round(self.wait_seconds / total * 1000.0, 2) if total else 0.0,
+                "batches": self.batches,
+                "avg_batch": round(self.batched_images / self.batches, 2) if self.batches else 0.0,
+            }
+
+    # ============================================================
+    # Worker
+    # ============================================================
+    def _worker(self):
+        # Graphs are built and used on this thread only
+        models = {}
+        while self.running:
+            job = self._jobs.get()
+            if job is None:
+                break
+            kind, images, batched, future, t_queued = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            t0 = time.perf_counter()
+            try:
+                model = models.get(kind)
+                if model is None:
+                    model = models[kind] = _make_model(kind)
+                    with self._lock:
+                        self.models_built += 1
+                outputs = []
+                for image in images:
+                    results = model.process(image)
+                    if kind == "segmentation" and results.segmentation_mask is not None:
+                        # The mask is a view into the graph's output packet, which
+                        # the next call on this worker releases — hand out a copy
+                        results.segmentation_mask = results.segmentation_mask.copy()
+                    outputs.append(results)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            t1 = time.perf_counter()
+            with self._lock:
+                self.calls[kind] += len(images)
+                self.busy_seconds[kind] += t1 - t0
+                self.wait_seconds += (t0 - t_queued) * len(images)
+                if batched:
+                    self.batches += 1
+                    self.batched_images += len(images)
+            future.set_result(outputs if batched else outputs[0])
+        for model in models.values():
+            model.close()
+
+
+class MicroBatcher:
+    """
+    Groups single-image calls from many threads into pool jobs.
+
+    The images of a group still run one by one on the worker (MediaPipe has
+    no batched solution API). The first call opens a group; it is dispatched
+    after `max_wait` seconds
+    or as soon as `max_batch` images are waiting, whichever comes first.
+    Drop-in for a solution object: `.process(image)` blocks for the result.
+
+    Args:
+        pool: Running InferencePool.
+        kind: Model kind ("hands" or "segmentation").
+        max_batch: Images per pool job.
+        max_wait: Seconds a call may wait for others to join its batch.
+    """
+
+    def __init__(self, pool, kind, max_batch=8, max_wait=0.004):
+        if kind not in MODEL_KINDS:
+            raise ValueError(f"Unknown model kind '{kind}' (expected one of {MODEL_KINDS})")
+        self.pool = pool
+        self.kind = kind
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max_wait
+        self._pending = []          # (image, future)
+        self._cond = threading.Condition()
+        self._thread = None
+        self.running = False
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self._thread = threading.Thread(target=self._collect, name=f"batcher-{self.kind}",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=3.0):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._cond:
+            pending, self._pending = self._pending, []
+        for _, future in pending:
+            future.set_exception(RuntimeError("MicroBatcher stopped"))
+
+    def process(self, image):
+        future = Future()
+        with self._cond:
+            if not self.running:
+                raise RuntimeError("MicroBatcher is not running")
+            self._pending.append((image, future))
+            self._cond.notify()
+        return future.result()
+
+    def close(self):
+        """No-op: the pool owns the graphs (mirrors the solution API)."""
+
+    def _collect(self):
+        while True:
+            with self._cond:
+                while self.running and not self._pending:
+                    self._cond.wait(0.1)
+                if not self.running:
+                    return
+                # Batch opened by the oldest call: wait for company, bounded
+                deadline = time.perf_counter() + self.max_wait
+                while self.running and len(self._pending) < self.max_batch:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                self._pending = self._pending[self.max_batch:]
+            if not batch:
+                continue
+            try:
+                # Blocks while the pool queue is full (backpressure)
+                job = self.pool.submit_batch(self.kind, [image for image, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            job.add_done_callback(lambda done, batch=batch: self._deliver(done, batch))
+
+    @staticmethod
+    def _deliver(done, batch):
+        error = done.exception()
+        if error is not None:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        for (_, future), results in zip(batch, done.result()):
+            future.set_result(results)
@@ -0,0 +1,344 @@
+"""
+Frame Pipeline — Staged Multi-Threaded Processing
+==================================================
+Splits the per-frame work into independent stages, each on its own thread,
+connected by bounded latest-wins queues:
+
+    capture → [infer] → hand inference → [render] → segmentation/compositing
+            → [encode] → JPEG encode → on_frame(jpeg_bytes)
+
+OpenCV and MediaPipe release the GIL inside their native calls, so the
+stages overlap across cores and throughput is bounded by the SLOWEST stage
+instead of the sum of all stages. When a stage falls behind, its input
+queue drops the stale frame rather than queuing latency.
+
+Each frame travels as a FrameContext (src.utils.frame_context), so the
+mirrored frame and the downscaled RGB are computed once and shared by hand
+inference and segmentation.
+
+With a MetricsRegistry attached, every step (capture, flip, color, hands,
+segmentation, compositing, encode) is recorded in the
+`jutsu_stage_seconds{stage=...}` histogram, alongside capture-to-output
+latency and frame/drop counters. With a FrameTracer attached, the same
+steps are also recorded as per-frame spans for Chrome trace export.
+
+With a QualityController attached (src.engines.quality_controller), each
+stage thread reports its per-frame work time, and whenever the controller
+changes tier the pipeline applies it: inference scale, the cloner's mask
+reuse interval, JPEG quality and output resolution.
+
+With a RenditionEncoder attached (src.engines.rendition_encoder), the
+encode stage hands the finished frame to the encoder's thread pool instead
+of calling cv2.imencode itself; the pool encodes only the renditions that
+have subscribers, in parallel with the next frame.
+"""
+
+import cv2
+import time
+import threading
+
+from src.utils.frame_context import FrameContext
+from src.utils.frame_ops import scale_for_width
+from src.utils.latest_queue import LatestQueue
+
+
+class FramePipeline:
+    """
+    Owns the stage threads for one camera.
+
+    Args:
+        cap: Opened cv2.VideoCapture.
+        gesture: GestureEngine instance (used only by the inference stage).
+        cloner: CloneEngine instance (used only by the render stage).
+        state: Shared state dict; `jutsu_active`, `fps` and `debug_mode` are
+            read/written here so the web layer sees live values.
+        on_frame: Callback receiving each encoded JPEG as bytes (unused,
+            may be None, when an encoder is given).
+        on_output: Optional callback receiving the final BGR frame (after
+            on_frame), for consumers that re-encode at their own quality.
+        jpeg_quality: cv2.IMWRITE_JPEG_QUALITY for the encode stage.
+        queue_size: Depth of each inter-stage queue (1 = always freshest).
+        inference_scale: Downscale factor for the single RGB frame shared by
+            hand inference and segmentation (1.0 = full resolution).
+        metrics: Optional src.utils.metrics.MetricsRegistry to record into.
+        tracer: Optional src.utils.frame_trace.FrameTracer for per-frame spans.
+        output_scale: Resize factor for the published frame (1.0 = as captured).
+        controller: Optional QualityController that adjusts the knobs above
+            (and the cloner's mask reuse) to hold its target FPS.
+        encoder: Optional RenditionEncoder that encodes off the encode thread.
+    """
+
+    STAGES = ("infer", "render", "encode")
+
+    # Back-off after a failed read (camera hiccup, exhausted file): doubles
+    # from the first value up to the second so a dead source doesn't spin
+    READ_RETRY_DELAY = (0.005, 0.5)
+
+    def __init__(self, cap, gesture, cloner, state, on_frame, on_output=None,
+                 jpeg_quality=85, queue_size=1, inference_scale=1.0, metrics=None,
+                 tracer=None, output_scale=1.0, controller=None, encoder=None):
+        self.cap = cap
+        self.gesture = gesture
+        self.cloner = cloner
+        self.state = state
+        self.on_frame = on_frame
+        self.on_output = on_output
+        self.jpeg_quality = jpeg_quality
+        self.inference_scale = inference_scale
+        self.output_scale = output_scale
+        self.controller = controller
+        self.encoder = encoder
+        self._encoder_busy = 0.0
+
+        self.queues = {name: LatestQueue(queue_size) for name in self.STAGES}
+        self.running = False
+        self._threads = []
+
+        self.frames_captured = 0
+        self.frames_output = 0
+        self.last_output_id = 0
+        self._prev_output_time = None
+
+        self.tracer = tracer
+        self._stage_seconds = None
+        if metrics is not None:
+            self._register_metrics(metrics)
+        # Configured knobs: quality tiers only ever lower them from here
+        self._configured = (inference_scale, cloner.mask_reuse_interval, jpeg_quality)
+        if controller is not None:
+            self.apply_quality(controller.tier)
+
+    def _register_metrics(self, metrics):
+        self._stage_seconds = metrics.histogram(
+            "jutsu_stage_seconds", "Time spent per pipeline stage.", ("stage",))
+        self._latency_seconds = metrics.histogram(
+            "jutsu_frame_latency_seconds", "Capture-to-encoded latency per output frame.")
+        metrics.counter(
+            "jutsu_frames_captured_total", "Frames read from the camera."
+        ).set_function(lambda: self.frames_captured)
+        metrics.counter(
+            "jutsu_frames_output_total", "Frames encoded and published."
+        ).set_function(lambda: self.frames_output)
+        metrics.counter(
+            "jutsu_dropped_frames_total", "Frames dropped by a full stage queue.", ("queue",)
+        ).set_function(lambda: {(name,): q.dropped for name, q in self.queues.items()})
+        metrics.gauge(
+            "jutsu_queue_depth", "Current stage input queue depth.", ("queue",)
+        ).set_function(lambda: {(name,): q.qsize() for name, q in self.queues.items()})
+        if self.controller is not None:
+            metrics.gauge(
+                "jutsu_quality_level", "Adaptive quality tier (0 = best)."
+            ).set_function(lambda: self.controller.level)
+
+    def apply_quality(self, tier):
+        """
+        Apply a QualityController tier (takes effect from the next frame).
+        Each knob is the cheaper of the tier's and the configured value; a
+        None tier value restores the configured one.
+        """
+        scale, reuse, quality = self._configured
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        if tier["inference_width"] is not None and width:
+            scale = min(scale, scale_for_width(width, tier["inference_width"]))
+        if tier["mask_reuse"] is not None:
+            reuse = max(reuse, tier["mask_reuse"])
+        if tier["jpeg_quality"] is not None:
+            quality = min(quality, tier["jpeg_quality"])
+        self.inference_scale = scale
+        self.cloner.mask_reuse_interval = reuse
+        self.jpeg_quality = quality
+        self.output_scale = tier["output_scale"]
+
+    def _budget(self, stage, t_start):
+        """Report a stage thread's work time for this frame to the controller."""
+        if self.controller is not None:
+            self.controller.observe(stage, time.perf_counter() - t_start)
+
+    def _budget_encode(self, t_start):
+        """
+        Encode budget: this thread's time plus, with an encoder, the pool's
+        busy time since the last frame spread over its workers.
+        """
+        seconds = time.perf_counter() - t_start
+        if self.encoder is not None:
+            busy = self.encoder.busy_seconds
+            seconds += (busy - self._encoder_busy) / self.encoder.workers
+            self._encoder_busy = busy
+        self.controller.observe("encode", seconds)
+
+    def _observe(self, stage, frame_id, t_start, t_end):
+        if self._stage_seconds is not None:
+            self._stage_seconds.observe(t_end - t_start, stage=stage)
+        if self.tracer is not None:
+            self.tracer.span(stage, frame_id, t_start, t_end)
+
+    # ============================================================
+    # Lifecycle
+    # ============================================================
+    def start(self):
+        """Spawn one daemon thread per stage."""
+        self.running = True
+        targets = (
+            ("capture", self._capture_stage),
+            ("infer", self._infer_stage),
+            ("render", self._render_stage),
+            ("encode", self._encode_stage),
+        )
+        self._threads = [
+            threading.Thread(target=fn, name=f"pipeline-{name}", daemon=True)
+            for name, fn in targets
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout=3.0):
+        """Signal all stages to exit and wait for them."""
+        self.running = False
+        for q in self.queues.values():
+            q.close()
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads = []
+
+    def queue_depths(self):
+        """Per-stage input queue depth and cumulative dropped-frame counts."""
+        return {
+            name: {"depth": q.qsize(), "dropped": q.dropped}
+            for name, q in self.queues.items()
+        }
+
+    # ============================================================
+    # Stages
+    # ============================================================
+    def _capture_stage(self):
+        """Grab + mirror frames as fast as the camera delivers them."""
+        out = self.queues["infer"]
+        first_delay, max_delay = self.READ_RETRY_DELAY
+        delay = first_delay
+        while self.running:
+            t0 = time.perf_counter()
+            ret, frame = self.cap.read()
+            if not ret:
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
+                continue
+            delay = first_delay
+            t1 = time.perf_counter()
+            self.frames_captured += 1
+            ctx = FrameContext(frame, self.frames_captured, mirror=True,
+                               inference_scale=self.inference_scale, t_capture=time.time())
+            ctx.frame  # mirror here, on the capture thread
+            self._observe("capture", ctx.frame_id, t0, t1)
+            self._observe("flip", ctx.frame_id, t1, time.perf_counter())
+            out.put({"id": ctx.frame_id, "t_capture": ctx.t_capture, "ctx": ctx})
+
+    def _infer_stage(self):
+        """Downscale + color conversion (memoized on the FrameContext) + MediaPipe Hands."""
+        inp, out = self.queues["infer"], self.queues["render"]
+        while self.running:
+            item = inp.get(timeout=0.1)
+            if item is None:
+                continue
+            t0 = time.perf_counter()
+            frame_rgb = item["ctx"].small_rgb
+            t1 = time.perf_counter()
+            active, hand_results = self.gesture.detect(frame_rgb)
+            self._observe("color", item["id"], t0, t1)
+            self._observe("hands", item["id"], t1, time.perf_counter())
+            self._budget("infer", t0)
+            self.state["jutsu_active"] = active
+            item["active"] = active
+            item["hand_results"] = hand_results
+            out.put(item)
+
+    def _render_stage(self):
+        """Segmentation, clone compositing and optional debug overlay."""
+        inp, out = self.queues["render"], self.queues["encode"]
+        while self.running:
+            item = inp.get(timeout=0.1)
+            if item is None:
+                continue
+            active = item["active"]
+            t0 = time.perf_counter()
+            ctx = item["ctx"]
+            # ctx.frame is the capture stage's mirrored copy: composite in place
+            output = self.cloner.render(ctx.frame, active=active, frame_rgb=ctx.small_rgb,
+                                        inplace=True)
+            if active:
+                timings = self.cloner.last_timings
+                t_seg = t0 + timings["segmentation"]
+                self._observe("segmentation", item["id"], t0, t_seg)
+                self._observe("compositing", item["id"], t_seg, t_seg + timings["compositing"])
+
+            if self.state.get("debug_mode"):
+                output = self.gesture.draw_landmarks(output, item["hand_results"])
+                status_color = (0, 255, 0) if active else (0, 0, 255)
+                label = "JUTSU: ACTIVE" if active else "JUTSU: INACTIVE"
+                cv2.putText(output, label, (10, 60),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
+
+            self._budget("render", t0)
+            item["output"] = output
+            out.put(item)
+
+    def _encode_stage(self):
+        """FPS accounting, FPS overlay and JPEG encode."""
+        inp = self.queues["encode"]
+        while self.running:
+            item = inp.get(timeout=0.1)
+            if item is None:
+                continue
+            output = item["output"]
+            t_start = time.perf_counter()
+            if self.output_scale != 1.0:
+                output = cv2.resize(output, None, fx=self.output_scale, fy=self.output_scale,
+                                    interpolation=cv2.INTER_AREA)
+
+            # FPS (measured at the pipeline output)
+            now = time.time()
+            if self._prev_output_time is None:
+                fps = 0.0
+            else:
+                elapsed = now - self._prev_output_time
+                fps = 1.0 / elapsed if elapsed > 0 else 0
+            self._prev_output_time = now
+            self.state["fps"] = round(fps, 1)
+            self.frames_output += 1
+
+            cv2.putText(output, f"FPS: {int(fps)}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+
+            t0 = time.perf_counter()
+            if self.encoder is not None:
+                # Encoded (per subscribed rendition) on the encoder's threads
+                self.encoder.submit(output, item["id"], self.jpeg_quality)
+                ok = False
+            else:
+                ok, jpeg = cv2.imencode('.jpg', output,
+                                        [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            t1 = time.perf_counter()
+            self._observe("encode" if self.encoder is None else "encode_submit",
+                          item["id"], t0, t1)
+            if self._stage_seconds is not None:
+                self._latency_seconds.observe(time.time() - item["t_capture"])
+            # Lets consumers tag what they send with the pipeline frame id
+            self.last_output_id = item["id"]
+            if ok:
+                self.on_frame(jpeg.tobytes())
+            if self.on_output is not None:
+                self.on_output(output)
+            if self.tracer is not None:
+                self.tracer.span("publish", item["id"], t1, time.perf_counter())
+            if self.controller is not None:
+                self._budget_encode(t_start)
+                bottleneck, seconds = self.controller.bottleneck()
+                if self.controller.update():
+                    self.apply_quality(self.controller.tier)
+                    print(f"[QUALITY] Tier → {self.controller.tier['name']} "
+                          f"({bottleneck} {seconds * 1000.0:.1f}ms per frame)")
+
+            # Periodic log
+            if self.frames_output % 300 == 0:
+                latency_ms = (now - item["t_capture"]) * 1000.0
+                print(f"[PERF] Frame {self.frames_output} | FPS: {int(fps)} | "
+                      f"Latency: {latency_ms:.0f}ms | Jutsu: {'ON' if item['active'] else 'OFF'}")
@@ -0,0 +1,404 @@
+"""
+Process Inference — MediaPipe in Worker Processes, Shared-Memory Handoff
+=========================================================================
+The thread-based InferencePool (src.engines.inference_pool) still runs every
+MediaPipe call inside the web process, whose Python-level work (result
+unpacking, landmark protobufs) competes for one GIL with the event loop.
+ProcessInferencePool runs the graphs in worker processes instead and is a
+drop-in replacement: same model()/process()/submit()/submit_batch()/stats().
+
+Pixels never go through pickle. Two multiprocessing.shared_memory blocks
+are split into a ring of slots:
+
+    inputs   slot i: one uint8 image (up to max_pixels x 3 channels)
+    outputs  slot i: float32 segmentation mask (up to max_pixels), or
+                     hand landmarks (MAX_HANDS x 21 x 3) + handedness
+
+A call takes a free slot (blocking while all are in use — the bound),
+copies its image in, and sends (job, kind, slot, shape) over a queue. The
+worker reads the image in place, runs the model, writes the output into
+the same slot and answers with (job, slot, count). The parent copies the
+output out, releases the slot and rebuilds MediaPipe-compatible results
+(landmark protobufs / a mask array), so the engines can't tell the
+difference.
+
+Workers are spawned (not forked), so they start clean of the parent's
+threads and MediaPipe state, and each owns one set of graphs. They ignore
+Ctrl+C (the parent shuts them down after its pipelines); a worker that dies
+anyway is replaced, and the calls it never answered fail.
+"""
+
+import multiprocessing as mp_proc
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.engines.inference_pool import MODEL_KINDS, PooledModel
+from src.engines.seal_classifier import MAX_HANDS, NUM_LANDMARKS
+
+
+# Output slot layout for hands: landmarks then (label index, score) per hand
+_LANDMARK_FLOATS = MAX_HANDS * NUM_LANDMARKS * 3
+_HANDEDNESS_FLOATS = MAX_HANDS * 2
+_HAND_LABELS = ("Left", "Right")
+
+
+class HandResults:
+    """Stand-in for MediaPipe Hands results (the fields the engines read)."""
+
+    __slots__ = ("multi_hand_landmarks", "multi_handedness")
+
+    def __init__(self, multi_hand_landmarks=None, multi_handedness=None):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+class SegmentationResults:
+    """Stand-in for SelfieSegmentation results."""
+
+    __slots__ = ("segmentation_mask",)
+
+    def __init__(self, segmentation_mask=None):
+        self.segmentation_mask = segmentation_mask
+
+
+def _hand_results(count, floats):
+    """(hands, output slot floats) → HandResults with landmark protobufs."""
+    if count == 0:
+        return HandResults()
+    from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+    points = floats[:_LANDMARK_FLOATS].reshape(MAX_HANDS, NUM_LANDMARKS, 3)
+    handedness = floats[_LANDMARK_FLOATS:_LANDMARK_FLOATS + _HANDEDNESS_FLOATS].reshape(MAX_HANDS, 2)
+    hands, labels = [], []
+    for i in range(count):
+        hand = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in points[i].tolist():
+            hand.landmark.add(x=x, y=y, z=z)
+        hands.append(hand)
+        index, score = int(handedness[i, 0]), float(handedness[i, 1])
+        label = classification_pb2.ClassificationList()
+        label.classification.add(index=index, score=score, label=_HAND_LABELS[index])
+        labels.append(label)
+    return HandResults(hands, labels)
+
+
+def _worker_main(tasks, results, in_name, out_name, in_bytes, out_bytes):
+    """Worker process: attach the shared blocks, serve jobs until None."""
+    import mediapipe as mp
+
+    # Ctrl+C reaches the whole process group; the parent decides when we stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    inputs = shared_memory.SharedMemory(name=in_name)
+    outputs = shared_memory.SharedMemory(name=out_name)
+    models = {}
+    try:
+        while True:
+            job = tasks.get()
+            if job is None:
+                break
+            job_id, kind, slot, shape = job
+            try:
+                image = np.ndarray(shape, dtype=np.uint8, buffer=inputs.buf,
+                                   offset=slot * in_bytes)
+                model = models.get(kind)
+                if model is None:
+                    if kind == "hands":
+                        model = mp.solutions.hands.Hands(
+                            static_image_mode=True, max_num_hands=MAX_HANDS,
+                            min_detection_confidence=0.7, model_complexity=0)
+                    else:
+                        model = mp.solutions.selfie_segmentation.SelfieSegmentation(
+                            model_selection=1)
+                    models[kind] = model
+                out = model.process(image)
+
+                if kind == "hands":
+                    floats = np.ndarray(_LANDMARK_FLOATS + _HANDEDNESS_FLOATS, dtype=np.float32,
+                                        buffer=outputs.buf, offset=slot * out_bytes)
+                    hands = (out.multi_hand_landmarks or [])[:MAX_HANDS]
+                    for i, hand in enumerate(hands):
+                        floats[i * NUM_LANDMARKS * 3:(i + 1) * NUM_LANDMARKS * 3] = [
+                            v for lm in hand.landmark for v in (lm.x, lm.y, lm.z)]
+                    for i, label in enumerate((out.multi_handedness or [])[:len(hands)]):
+                        c = label.classification[0]
+                        floats[_LANDMARK_FLOATS + 2 * i:_LANDMARK_FLOATS + 2 * i + 2] = (c.index, c.score)
+                    results.put((job_id, slot, len(hands), None, None))
+                else:
+                    mask = out.segmentation_mask
+                    dest = np.ndarray(mask.shape, dtype=np.float32, buffer=outputs.buf,
+                                      offset=slot * out_bytes)
+                    dest[...] = mask
+                    results.put((job_id, slot, 1, mask.shape, None))
+            except Exception as e:
+                results.put((job_id, slot, 0, None, f"{type(e).__name__}: {e}"))
+    finally:
+        for model in models.values():
+            model.close()
+        inputs.close()
+        outputs.close()
+
+
+class ProcessInferencePool:
+    """
+    MediaPipe hands/segmentation in worker processes, frames handed over in
+    shared-memory ring slots.
+
+    Each worker has its own task queue and calls go to the worker with the
+    fewest outstanding jobs, so a worker that dies takes down only its own
+    queue: its calls fail immediately and a fresh worker and queue replace it.
+
+    Args:
+        workers: Worker processes (each owns one set of graphs).
+        slots: Ring slots = max calls in flight (default: 2 per worker).
+        max_pixels: Largest image (width x height) a slot holds.
+    """
+
+    def __init__(self, workers=2, slots=None, max_pixels=1280 * 720):
+        self.workers = max(1, int(workers))
+        self.slots = max(1, int(slots or self.workers * 2))
+        self.max_pixels = int(max_pixels)
+        # Slot strides, rounded up to 64 bytes so float32 views stay aligned
+        self._in_bytes = -(-self.max_pixels * 3 // 64) * 64
+        self._out_bytes = -(-max(self.max_pixels, _LANDMARK_FLOATS + _HANDEDNESS_FLOATS) * 4 // 64) * 64
+
+        self._inputs = self._outputs = None
+        self._free = queue.Queue()
+        self._jobs = {}           # job id → (future, slot, t_submit, worker)
+        self._next_job = 0
+        self._lock = threading.Lock()
+        self._ctx = None
+        self._processes = []
+        self._tasks = []          # per-worker task queues
+        self._load = []           # per-worker outstanding jobs
+        self._results = None
+        self._reader = None
+        self.running = False
+
+        self.calls = {kind: 0 for kind in MODEL_KINDS}
+        self.busy_seconds = {kind: 0.0 for kind in MODEL_KINDS}
+        self.wait_seconds = 0.0
+        self.batches = 0
+        self.batched_images = 0
+        self.restarts = 0
+
+    # ============================================================
+    # Lifecycle
+    # ============================================================
+    def start(self):
+        if self.running:
+            return self
+        self._ctx = mp_proc.get_context("spawn")
+        self._inputs = shared_memory.SharedMemory(create=True, size=self._in_bytes * self.slots)
+        self._outputs = shared_memory.SharedMemory(create=True, size=self._out_bytes * self.slots)
+        self._results = self._ctx.Queue()
+        for slot in range(self.slots):
+            self._free.put(slot)
+        self._tasks = [self._ctx.Queue() for _ in range(self.workers)]
+        self._load = [0] * self.workers
+        self._processes = [self._spawn(i) for i in range(self.workers)]
+        self.running = True
+        self._reader = threading.Thread(target=self._read_results, name="inference-results",
+                                        daemon=True)
+        self._reader.start()
+        return self
+
+    def _spawn(self, i):
+        p = self._ctx.Process(
+            target=_worker_main, name=f"inference-proc-{i}", daemon=True,
+            args=(self._tasks[i], self._results, self._inputs.name, self._outputs.name,
+                  self._in_bytes, self._out_bytes),
+        )
+        p.start()
+        return p
+
+    def stop(self, timeout=3.0):
+        if not self.running:
+            return
+        self.running = False
+        for tasks in self._tasks:
+            tasks.put(None)
+        for p in self._processes:
+            p.join(timeout=timeout)
+            if p.is_alive():
+                p.terminate()
+        self._processes = []
+        self._results.put(None)
+        self._reader.join(timeout=timeout)
+        for q in self._tasks + [self._results]:
+            q.close()
+            q.join_thread()
+        self._tasks, self._results = [], None
+        with self._lock:
+            pending, self._jobs = list(self._jobs.values()), {}
+        for future, _, _, _ in pending:
+            future.set_exception(RuntimeError("ProcessInferencePool stopped"))
+        # Callers blocked waiting for a slot wake up on the sentinel (each
+        # passes it on to the next) and raise; a restart gets a fresh queue
+        self._free.put(None)
+        self._free = queue.Queue()
+        for shm in (self._inputs, self._outputs):
+            shm.close()
+            shm.unlink()
+        self._inputs = self._outputs = None
+
+    # ============================================================
+    # Calls
+    # ============================================================
+    def model(self, kind):
+        """PooledModel for `kind` ("hands" or "segmentation")."""
+        return PooledModel(self, kind)
+
+    def submit(self, kind, image):
+        """Copy `image` into a free slot and queue it; blocks while none is free."""
+        free = self._free   # stop() wakes waiters on this queue, then replaces it
+        if not self.running:
+            raise RuntimeError("ProcessInferencePool is not running")
+        if kind not in MODEL_KINDS:
+            raise ValueError(f"Unknown model kind '{kind}' (expected one of {MODEL_KINDS})")
+        if image.dtype != np.uint8 or image.ndim != 3 or image.shape[2] != 3:
+            raise ValueError(f"Expected an HxWx3 uint8 image, got {image.dtype} {image.shape}")
+        if image.shape[0] * image.shape[1] > self.max_pixels:
+            raise ValueError(f"Image {image.shape[1]}x{image.shape[0]} exceeds the slot size "
+                             f"({self.max_pixels} pixels)")
+
+        slot = free.get()
+        if slot is None or not self.running:
+            free.put(None)
+            raise RuntimeError("ProcessInferencePool stopped")
+        np.ndarray(image.shape, dtype=np.uint8, buffer=self._inputs.buf,
+                   offset=slot * self._in_bytes)[...] = image
+        future = Future()
+        with self._lock:
+            job_id = self._next_job
+            self._next_job += 1
+            worker = min(range(self.workers), key=self._load.__getitem__)
+            self._load[worker] += 1
+            self._jobs[job_id] = (future, slot, time.perf_counter(), worker)
+            tasks = self._tasks[worker]
+        tasks.put((job_id, kind, slot, image.shape))
+        return future
+
+    def submit_batch(self, kind, images):
+        """Queue each image (one slot each); the Future yields the list of results."""
+        futures = [self.submit(kind, image) for image in images]
+        batch = Future()
+        remaining = [len(futures)]
+
+        def done(_):
+            with self._lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if not last:
+                return
+            errors = [f.exception() for f in futures if f.exception() is not None]
+            if errors:
+                batch.set_exception(errors[0])
+            else:
+                batch.set_result([f.result() for f in futures])
+
+        with self._lock:
+            self.batches += 1
+            self.batched_images += len(futures)
+        for f in futures:
+            f.add_done_callback(done)
+        return batch
+
+    def process(self, kind, image):
+        """Run one inference in a worker process and wait for the results."""
+        return self.submit(kind, image).result()
+
+    def pending(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def stats(self):
+        """Calls, worker round-trip time and slot usage per model kind."""
+        with self._lock:
+            total = sum(self.calls.values())
+            return {
+                "workers": self.workers,
+                "processes": True,
+                "slots": self.slots,
+                "pending": len(self._jobs),
+                "load": list(self._load),
+                "shared_mb": round((self._in_bytes + self._out_bytes) * self.slots / 2**20, 1),
+                "calls": dict(self.calls),
+                "busy_ms": {k: round(v * 1000.0, 1) for k, v in self.busy_seconds.items()},
+                "avg_roundtrip_ms": round(self.wait_seconds / total * 1000.0, 2) if total else 0.0,
+                "batches": self.batches,
+                "avg_batch": round(self.batched_images / self.batches, 2) if self.batches else 0.0,
+                "restarts": self.restarts,
+            }
+
+    # ============================================================
+    # Results
+    # ============================================================
+    def _check_workers(self):
+        """Replace dead workers and fail the calls they will never answer."""
+        for i, p in enumerate(self._processes):
+            if not self.running or p.is_alive():
+                continue
+            print(f"[INFERENCE] Worker {p.name} exited ({p.exitcode}) — restarting.")
+            with self._lock:
+                lost = [job_id for job_id, job in self._jobs.items() if job[3] == i]
+                jobs = [self._jobs.pop(job_id) for job_id in lost]
+                self._load[i] = 0
+                # Its queue may be wedged (killed mid-get): start over with a new one
+                self._tasks[i] = self._ctx.Queue()
+                self.restarts += 1
+            self._processes[i] = self._spawn(i)
+            for future, slot, _, _ in jobs:
+                self._free.put(slot)
+                future.set_exception(RuntimeError(f"Inference worker {p.name} exited"))
+
+    def _read_results(self):
+        last_check = time.perf_counter()
+        while True:
+            try:
+                message = self._results.get(timeout=0.5)
+            except queue.Empty:
+                message = ()
+            if time.perf_counter() - last_check > 0.5:
+                self._check_workers()
+                last_check = time.perf_counter()
+            if message == ():
+                continue
+            if message is None:
+                break
+            job_id, slot, count, shape, error = message
+            with self._lock:
+                job = self._jobs.pop(job_id, None)
+                if job is not None:
+                    self._load[job[3]] -= 1
+            if job is None:
+                continue
+            future, _, t_submit, _ = job
+            if error is not None:
+                self._free.put(slot)
+                future.set_exception(RuntimeError(f"Inference worker failed: {error}"))
+                continue
+
+            # Copy out of the slot before handing it to the next call
+            if shape is not None:
+                mask = np.ndarray(shape, dtype=np.float32, buffer=self._outputs.buf,
+                                  offset=slot * self._out_bytes).copy()
+                self._free.put(slot)
+                kind, results = "segmentation", SegmentationResults(mask)
+            else:
+                floats = np.ndarray(_LANDMARK_FLOATS + _HANDEDNESS_FLOATS, dtype=np.float32,
+                                    buffer=self._outputs.buf, offset=slot * self._out_bytes).copy()
+                self._free.put(slot)
+                kind, results = "hands", _hand_results(count, floats)
+
+            elapsed = time.perf_counter() - t_submit
+            with self._lock:
+                self.calls[kind] += 1
+                self.busy_seconds[kind] += elapsed
+                self.wait_seconds += elapsed
+            future.set_result(results)
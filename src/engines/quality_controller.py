@@ -0,0 +1,170 @@
+"""
+Quality Controller — Closed-Loop Frame-Time Budget
+===================================================
+Holds a target FPS by trading image quality for time. The FramePipeline
+reports how long each of its stage threads spends per frame; since the
+stages overlap, throughput is set by the slowest one, so that is compared
+against the frame budget (1 / target_fps):
+
+    output FPS < target and bottleneck > budget x high → step to a cheaper tier
+    bottleneck < budget x low for `upgrade_hold` s     → step back up
+
+It starts at tier 0 ("full"), which leaves the pipeline as configured, so
+quality only drops once the target is actually being missed. The cheaper
+tiers cap the knobs that dominate the stage costs (never raising a knob
+above what the pipeline was configured with):
+
+    inference_width   downscale for hand inference + segmentation (px)
+    mask_reuse        max frames served by one segmentation
+    jpeg_quality      encode stage quality
+    output_scale      resolution of the published frame
+
+Capture is excluded (it waits on the camera, it isn't work). Like the
+per-client ClientQualityLadder this is pure bookkeeping — the pipeline
+applies the tier.
+"""
+
+import time
+
+
+class QualityController:
+    """
+    Picks the pipeline quality tier for a target FPS.
+
+    Args:
+        target_fps: Frame rate to hold.
+        high, low: Step down above budget x high, up below budget x low.
+        cooldown: Minimum seconds between steps (lets the EMAs settle).
+        upgrade_hold: Seconds under budget x low before stepping up.
+        smoothing: EMA factor for per-stage frame times.
+        min_frames: Frames measured at a tier before it is judged (start-up
+            and post-switch outliers don't trigger a step on their own).
+        start_tier: Initial tier index (default: 0, the configured quality).
+    """
+
+    # (name, inference_width, mask_reuse, jpeg_quality, output_scale) — 0 is
+    # best; None keeps the pipeline's configured value
+    TIERS = (
+        ("full", None, None, None, 1.0),
+        ("standard", 640, 2, 80, 1.0),
+        ("balanced", 480, 4, 70, 1.0),
+        ("low", 384, 6, 60, 0.75),
+        ("minimal", 320, 8, 50, 0.5),
+    )
+    DEFAULT_TIER = 0
+
+    # Pipeline stage threads whose per-frame time is budgeted
+    STAGES = ("infer", "render", "encode")
+
+    def __init__(self, target_fps=30.0, high=0.9, low=0.6, cooldown=2.0,
+                 upgrade_hold=3.0, smoothing=0.1, min_frames=30, start_tier=None):
+        if target_fps <= 0:
+            raise ValueError(f"target_fps must be positive, got {target_fps}")
+        self.target_fps = float(target_fps)
+        self.budget = 1.0 / self.target_fps
+        self.high = high
+        self.low = low
+        self.cooldown = cooldown
+        self.upgrade_hold = upgrade_hold
+        self.smoothing = smoothing
+        self.min_frames = min_frames
+
+        self.level = self.DEFAULT_TIER if start_tier is None else start_tier
+        self.level = min(max(self.level, 0), len(self.TIERS) - 1)
+        self.stage_seconds = {}
+        self.fps = None           # EMA of the output frame rate
+        self._last_output = None
+        self.changes = 0
+        self._frames = 0
+        self._last_change = 0.0
+        self._healthy_since = None
+
+    @property
+    def tier(self):
+        """Current tier as a dict of knob values."""
+        name, width, reuse, quality, scale = self.TIERS[self.level]
+        return {
+            "name": name,
+            "inference_width": width,
+            "mask_reuse": reuse,
+            "jpeg_quality": quality,
+            "output_scale": scale,
+        }
+
+    def observe(self, stage, seconds):
+        """Fold one frame's time in `stage` into its EMA (any thread)."""
+        previous = self.stage_seconds.get(stage)
+        if previous is None:
+            self.stage_seconds[stage] = seconds
+        else:
+            self.stage_seconds[stage] = previous + self.smoothing * (seconds - previous)
+
+    def bottleneck(self):
+        """(stage, seconds) of the slowest stage, or (None, 0.0)."""
+        if not self.stage_seconds:
+            return None, 0.0
+        stage = max(self.stage_seconds, key=self.stage_seconds.get)
+        return stage, self.stage_seconds[stage]
+
+    def update(self, now=None):
+        """Count one output frame and re-evaluate the tier. Returns True if it changed."""
+        now = time.monotonic() if now is None else now
+        self._observe_output(now)
+        self._frames += 1
+        _, seconds = self.bottleneck()
+        if seconds <= 0.0 or self._frames < self.min_frames:
+            return False
+        if seconds > self.budget * self.high:
+            self._healthy_since = None
+            if self.fps is not None and self.fps < self.target_fps:
+                return self._step(+1, now)
+            return False
+        if seconds < self.budget * self.low:
+            if self._healthy_since is None:
+                self._healthy_since = now
+            elif now - self._healthy_since >= self.upgrade_hold and self._step(-1, now):
+                self._healthy_since = now
+                return True
+            return False
+        self._healthy_since = None
+        return False
+
+    def _observe_output(self, now):
+        """Fold the interval since the previous output frame into the FPS EMA."""
+        last, self._last_output = self._last_output, now
+        if last is None or now <= last:
+            return
+        fps = 1.0 / (now - last)
+        self.fps = fps if self.fps is None else self.fps + self.smoothing * (fps - self.fps)
+
+    def snapshot(self):
+        """JSON-friendly view for /status."""
+        stage, seconds = self.bottleneck()
+        return {
+            "tier": self.TIERS[self.level][0],
+            "level": self.level,
+            "levels": len(self.TIERS),
+            "target_fps": self.target_fps,
+            "fps": round(self.fps, 1) if self.fps is not None else None,
+            "budget_ms": round(self.budget * 1000.0, 1),
+            "bottleneck": stage,
+            "bottleneck_ms": round(seconds * 1000.0, 2),
+            "stage_ms": {k: round(v * 1000.0, 2) for k, v in self.stage_seconds.items()},
+            "settings": self.tier,
+            "changes": self.changes,
+        }
+
+    def _step(self, delta, now):
+        """Move `delta` tiers (positive = cheaper). Returns True if changed."""
+        if now - self._last_change < self.cooldown:
+            return False
+        new_level = min(max(self.level + delta, 0), len(self.TIERS) - 1)
+        if new_level == self.level:
+            return False
+        self.level = new_level
+        self._last_change = now
+        self.changes += 1
+        # New settings: measure them fresh rather than against the old EMAs
+        self.stage_seconds = {}
+        self._frames = 0
+        return True
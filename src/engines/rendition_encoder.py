@@ -0,0 +1,233 @@
+"""
+Rendition Encoder — Parallel, Subscription-Driven JPEG Encoding
+================================================================
+The pipeline's encode stage used to run cv2.imencode inline for a single
+fixed rendition, so every client got the same bitrate and the encode time
+came straight out of the frame budget. A RenditionEncoder takes the final
+BGR frame instead and encodes it on a small thread pool, once per rendition
+that somebody is watching:
+
+    full      captured resolution, pipeline JPEG quality
+    half      half resolution,     pipeline JPEG quality
+    low       captured resolution, quality 50
+    half_low  half resolution,     quality 50
+
+"Pipeline JPEG quality" follows the QualityController tier when one is
+attached. Each rendition publishes into its own FrameBroadcaster; a
+rendition with no subscribers (broadcaster clients or explicit hold()s) is
+not encoded at all. cv2.imencode releases the GIL, so renditions of one
+frame — and consecutive frames — encode in parallel.
+
+Backpressure: each rendition has at most `max_in_flight` encodes queued or
+running. When a rendition is at its limit the frame is skipped for it, and
+an encode that finishes after a newer frame of the same rendition was
+published is dropped, so viewers never see frames go backwards.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from src.utils.broadcaster import FrameBroadcaster
+
+
+# name → (scale, jpeg_quality); quality None = the pipeline's current quality
+RENDITIONS = {
+    "full": (1.0, None),
+    "half": (0.5, None),
+    "low": (1.0, 50),
+    "half_low": (0.5, 50),
+}
+DEFAULT_RENDITION = "full"
+
+
+class RenditionEncoder:
+    """
+    Encodes each output frame once per subscribed rendition on a thread pool.
+
+    Usage:
+        encoder = RenditionEncoder(workers=2).start()
+        encoder.attach(loop)                                  # server loop
+        encoder.submit(frame, frame_id, quality=85)           # encode stage
+        async for jpeg in encoder.broadcaster("half").subscribe(): ...
+
+    Args:
+        workers: Encoder threads.
+        renditions: name → (scale, jpeg_quality) (default: RENDITIONS).
+        max_in_flight: Queued or running encodes per rendition before frames
+            are skipped for it.
+        metrics: Optional MetricsRegistry to record into.
+        tracer: Optional FrameTracer for per-rendition encode spans.
+    """
+
+    def __init__(self, workers=2, renditions=None, max_in_flight=2, metrics=None, tracer=None):
+        self.workers = max(1, int(workers))
+        self.renditions = dict(renditions or RENDITIONS)
+        if DEFAULT_RENDITION not in self.renditions:
+            raise ValueError(f"Renditions must include '{DEFAULT_RENDITION}'")
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.tracer = tracer
+        self.broadcasters = {name: FrameBroadcaster() for name in self.renditions}
+        self.running = False
+        self._executor = None
+        self._lock = threading.Lock()
+        self._holds = {name: 0 for name in self.renditions}
+        self._in_flight = {name: 0 for name in self.renditions}
+        self._published_id = {name: 0 for name in self.renditions}
+        self.encoded = {name: 0 for name in self.renditions}
+        self.skipped = {name: 0 for name in self.renditions}    # at the in-flight limit
+        self.stale = {name: 0 for name in self.renditions}      # finished behind a newer frame
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self._encode_seconds = None
+        if metrics is not None:
+            self._register_metrics(metrics)
+
+    def _register_metrics(self, metrics):
+        self._encode_seconds = metrics.histogram(
+            "jutsu_rendition_encode_seconds", "JPEG encode time per rendition.", ("rendition",))
+        metrics.gauge(
+            "jutsu_rendition_subscribers", "Subscribers per rendition.", ("rendition",)
+        ).set_function(lambda: {(name,): self.subscribers(name) for name in self.renditions})
+        metrics.counter(
+            "jutsu_rendition_frames_total", "Frames encoded per rendition.", ("rendition",)
+        ).set_function(lambda: {(name,): n for name, n in self.encoded.items()})
+        metrics.counter(
+            "jutsu_rendition_skipped_total",
+            "Frames not encoded for a rendition at its in-flight limit.", ("rendition",)
+        ).set_function(lambda: {(name,): n for name, n in self.skipped.items()})
+
+    # ============================================================
+    # Lifecycle
+    # ============================================================
+    def start(self):
+        if self.running:
+            return self
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="jpeg-encode")
+        self.running = True
+        return self
+
+    def attach(self, loop):
+        """Bind every rendition's broadcaster to the server loop."""
+        for broadcaster in self.broadcasters.values():
+            broadcaster.attach(loop)
+
+    def stop(self):
+        self.running = False
+        for broadcaster in self.broadcasters.values():
+            broadcaster.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    # ============================================================
+    # Subscriptions
+    # ============================================================
+    def broadcaster(self, name):
+        """FrameBroadcaster of rendition `name` (KeyError if unknown)."""
+        return self.broadcasters[name]
+
+    def hold(self, name):
+        """Keep `name` encoded without subscribing to its broadcaster."""
+        with self._lock:
+            self._holds[name] += 1
+
+    def release(self, name):
+        with self._lock:
+            self._holds[name] = max(0, self._holds[name] - 1)
+
+    def subscribers(self, name):
+        return self.broadcasters[name].clients + self._holds[name]
+
+    def active(self):
+        """Renditions with at least one subscriber."""
+        return [name for name in self.renditions if self.subscribers(name)]
+
+    def latest(self, name=DEFAULT_RENDITION):
+        """Most recent JPEG of `name` (None before the first encode)."""
+        return self.broadcasters[name].latest()[1]
+
+    # ============================================================
+    # Encoding
+    # ============================================================
+    def submit(self, frame, frame_id, quality):
+        """
+        Queue `frame` for every subscribed rendition (non-blocking). The
+        frame must not be modified afterwards. Returns the number queued.
+        """
+        if not self.running:
+            return 0
+        queued = 0
+        for name in self.active():
+            with self._lock:
+                if self._in_flight[name] >= self.max_in_flight:
+                    self.skipped[name] += 1
+                    continue
+                self._in_flight[name] += 1
+            try:
+                self._executor.submit(self._encode, name, frame, frame_id, quality)
+            except RuntimeError:
+                # Executor shut down between the check and the call
+                with self._lock:
+                    self._in_flight[name] -= 1
+                break
+            queued += 1
+        return queued
+
+    def _encode(self, name, frame, frame_id, quality):
+        # Runs as an executor future nobody waits on: log failures here
+        try:
+            self._encode_rendition(name, frame, frame_id, quality)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"[ENCODE] Rendition '{name}' failed on frame {frame_id}: {e!r}")
+        finally:
+            with self._lock:
+                self._in_flight[name] -= 1
+
+    def _encode_rendition(self, name, frame, frame_id, quality):
+        scale, fixed_quality = self.renditions[name]
+        t0 = time.perf_counter()
+        if scale != 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, fixed_quality or quality])
+        t1 = time.perf_counter()
+        with self._lock:
+            self.busy_seconds += t1 - t0
+            if not ok:
+                raise RuntimeError("cv2.imencode returned no data")
+            if frame_id <= self._published_id[name]:
+                self.stale[name] += 1
+                return
+            self._published_id[name] = frame_id
+            self.encoded[name] += 1
+            # Under the lock: publications of one rendition stay in frame order
+            self.broadcasters[name].publish(jpeg.tobytes())
+        if self._encode_seconds is not None:
+            self._encode_seconds.observe(t1 - t0, rendition=name)
+        if self.tracer is not None:
+            self.tracer.span("encode", frame_id, t0, t1, rendition=name)
+
+    def stats(self):
+        """Per-rendition settings, subscribers and counters for /status."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "renditions": {
+                    name: {
+                        "scale": scale,
+                        "quality": quality,
+                        "subscribers": self.broadcasters[name].clients + self._holds[name],
+                        "encoded": self.encoded[name],
+                        "skipped": self.skipped[name],
+                        "stale": self.stale[name],
+                    }
+                    for name, (scale, quality) in self.renditions.items()
+                },
+                "busy_ms": round(self.busy_seconds * 1000.0, 1),
+                "errors": self.errors,
+            }
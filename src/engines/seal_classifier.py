@@ -0,0 +1,162 @@
+"""
+Seal Classifier — Vectorized Hand-Seal Templates
+=================================================
+Landmarks are converted once per frame into a fixed (2, 21, 3) float32
+array (missing hands are NaN), and every seal in the library is scored in
+a handful of NumPy calls — adding seals grows the index arrays, not the
+per-frame Python work.
+
+A seal template is a list of alternatives (any may match); an alternative
+is a set of contacts (all must hold); a contact is a landmark pair
+(hand_a, landmark_a, hand_b, landmark_b) that should touch. Two-hand
+contacts are mirrored automatically because MediaPipe's hand order is
+arbitrary (a one-hand contact on hand 0 is likewise tried on hand 1).
+
+    raw distance of a seal = min over alternatives of max over its contacts
+    score                  = raw distance / hand size (wrist → middle MCP)
+
+Contacts referencing a hand that is not present are NaN, which disables
+the alternative. The templates are contact heuristics, not trained poses —
+thresholds are in hand-size units and can be tuned per seal.
+"""
+
+import numpy as np
+
+
+MAX_HANDS = 2
+NUM_LANDMARKS = 21
+
+# MediaPipe landmark ids used by the templates
+WRIST, THUMB_TIP = 0, 4
+INDEX_MCP, INDEX_TIP = 5, 8
+MIDDLE_MCP, MIDDLE_TIP = 9, 12
+RING_MCP, RING_TIP = 13, 16
+PINKY_MCP, PINKY_TIP = 17, 20
+
+# name → list of alternatives, each a list of (hand_a, lm_a, hand_b, lm_b)
+SEALS = {
+    "rat":    [[(0, INDEX_TIP, 1, INDEX_MCP), (0, MIDDLE_TIP, 1, MIDDLE_MCP), (1, THUMB_TIP, 0, INDEX_MCP)]],
+    "ox":     [[(0, INDEX_TIP, 1, WRIST), (0, THUMB_TIP, 1, INDEX_MCP)]],
+    "tiger":  [[(0, INDEX_TIP, 1, INDEX_TIP), (0, MIDDLE_TIP, 1, MIDDLE_TIP), (0, THUMB_TIP, 1, THUMB_TIP)]],
+    "hare":   [[(0, MIDDLE_TIP, 1, MIDDLE_MCP), (0, INDEX_TIP, 1, INDEX_MCP)]],
+    "dog":    [[(0, MIDDLE_MCP, 1, MIDDLE_TIP), (0, WRIST, 1, INDEX_TIP)]],
+    "dragon": [[(0, THUMB_TIP, 1, THUMB_TIP), (0, MIDDLE_TIP, 1, MIDDLE_TIP), (0, PINKY_TIP, 1, PINKY_TIP)]],
+    "snake":  [[(0, INDEX_TIP, 1, INDEX_MCP), (1, INDEX_TIP, 0, INDEX_MCP), (0, THUMB_TIP, 1, THUMB_TIP)]],
+    "horse":  [[(0, INDEX_TIP, 1, INDEX_TIP), (0, THUMB_TIP, 1, THUMB_TIP)]],
+    "bird":   [[(0, PINKY_TIP, 1, PINKY_TIP), (0, THUMB_TIP, 1, THUMB_TIP)]],
+    "monkey": [[(0, INDEX_TIP, 1, PINKY_MCP), (0, MIDDLE_TIP, 1, RING_MCP)]],
+    # Ram keeps the original trigger: any index tip touching any middle tip
+    "ram":    [[(0, INDEX_TIP, 0, MIDDLE_TIP)], [(0, INDEX_TIP, 1, MIDDLE_TIP)]],
+    "boar":   [[(0, MIDDLE_TIP, 1, WRIST), (1, MIDDLE_TIP, 0, WRIST)]],
+}
+
+DEFAULT_THRESHOLD = 0.35
+
+
+def landmarks_array(results, out=None):
+    """
+    MediaPipe Hands results → (MAX_HANDS, 21, 3) float32, NaN where absent.
+
+    Pass `out` to fill a preallocated array instead of allocating one.
+    """
+    if out is None:
+        out = np.empty((MAX_HANDS, NUM_LANDMARKS, 3), dtype=np.float32)
+    out.fill(np.nan)
+    if results is not None and results.multi_hand_landmarks:
+        for i, hand in enumerate(results.multi_hand_landmarks[:MAX_HANDS]):
+            out[i] = [(lm.x, lm.y, lm.z) for lm in hand.landmark]
+    return out
+
+
+def _mirror(contacts):
+    return [(1 - ha, la, 1 - hb, lb) for ha, la, hb, lb in contacts]
+
+
+class SealClassifier:
+    """
+    Scores all seal templates against one landmark array.
+
+    Args:
+        seals: name → alternatives mapping (defaults to SEALS).
+        thresholds: name → max score (hand-size units); missing names use
+            DEFAULT_THRESHOLD.
+    """
+
+    def __init__(self, seals=None, thresholds=None):
+        seals = SEALS if seals is None else seals
+        thresholds = thresholds or {}
+        self.names = list(seals)
+
+        idx_a, idx_b = [], []      # flat (hand * 21 + landmark) indices per contact
+        alt_starts, seal_starts = [], []
+        contact_counts = []
+        for name in self.names:
+            alternatives = []
+            for contacts in seals[name]:
+                alternatives.append(contacts)
+                alternatives.append(_mirror(contacts))
+            seal_starts.append(len(alt_starts))
+            contact_counts.append(max(len(c) for c in seals[name]))
+            for contacts in alternatives:
+                alt_starts.append(len(idx_a))
+                for ha, la, hb, lb in contacts:
+                    idx_a.append(ha * NUM_LANDMARKS + la)
+                    idx_b.append(hb * NUM_LANDMARKS + lb)
+
+        self._idx_a = np.array(idx_a, dtype=np.intp)
+        self._idx_b = np.array(idx_b, dtype=np.intp)
+        self._alt_starts = np.array(alt_starts, dtype=np.intp)
+        self._seal_starts = np.array(seal_starts, dtype=np.intp)
+        self.thresholds = np.array(
+            [thresholds.get(n, DEFAULT_THRESHOLD) for n in self.names], dtype=np.float32
+        )
+        # More contacts == more specific pose; wins ties between nested templates
+        self._specificity = np.array(contact_counts, dtype=np.intp)
+
+    def index(self, name):
+        """Position of `name` in the distance/score arrays."""
+        return self.names.index(name)
+
+    def distances(self, landmarks):
+        """
+        Raw (normalized image coordinates) distance per seal, inf if unmatched.
+
+        Args:
+            landmarks: (MAX_HANDS, 21, 3) array from landmarks_array().
+        """
+        xy = landmarks[..., :2].reshape(-1, 2)
+        diff = xy[self._idx_a] - xy[self._idx_b]
+        contact = np.hypot(diff[:, 0], diff[:, 1])
+        # All contacts of an alternative must hold (NaN → missing hand → invalid)
+        per_alt = np.maximum.reduceat(contact, self._alt_starts)
+        # Any alternative may match (fmin skips the invalid ones)
+        per_seal = np.fmin.reduceat(per_alt, self._seal_starts)
+        return np.nan_to_num(per_seal, nan=np.inf)
+
+    @staticmethod
+    def hand_scale(landmarks):
+        """Mean wrist → middle-MCP length of the present hands (NaN if none)."""
+        d = landmarks[:, MIDDLE_MCP, :2] - landmarks[:, WRIST, :2]
+        lengths = np.hypot(d[:, 0], d[:, 1])
+        valid = lengths[~np.isnan(lengths)]
+        return float(valid.mean()) if valid.size else float("nan")
+
+    def scores(self, landmarks, distances=None):
+        """Hand-size-normalized distance per seal (inf if unmatched)."""
+        if distances is None:
+            distances = self.distances(landmarks)
+        scale = self.hand_scale(landmarks)
+        if not scale > 0:
+            return np.full(len(self.names), np.inf, dtype=np.float32)
+        return distances / scale
+
+    def classify(self, landmarks, distances=None):
+        """Best matching seal name, or None."""
+        scores = self.scores(landmarks, distances)
+        ratio = scores / self.thresholds
+        matched = np.flatnonzero(ratio < 1.0)
+        if matched.size == 0:
+            return None
+        # Most specific template first, then closest fit
+        order = np.lexsort((ratio[matched], -self._specificity[matched]))
+        return self.names[matched[order[0]]]
@@ -0,0 +1,167 @@
+"""
+Seal Sequence Recognizer — Streaming Jutsu Matching
+====================================================
+Real jutsu are sequences of seals. The recognizer is fed one classification
+per frame (a seal name or None, see src.engines.seal_classifier) and fires
+an event when a registered sequence completes within its time window.
+
+    per-frame label → debounce (confirm_frames) → seal event
+                    → every matcher advances by one step (KMP) → events
+
+Each matcher keeps only its partial-match position plus the timestamps of
+the matched seals, and falls back along a precomputed KMP failure table on
+mismatch or window expiry, so history is never re-scanned. A small ring
+buffer of recent seal events is kept for display / debugging only.
+"""
+
+import time
+from collections import deque
+
+
+# Canonical seal sequences (register any subset, or your own)
+JUTSU = {
+    "summoning": ("boar", "dog", "bird", "monkey", "ram"),
+    "fireball": ("snake", "ram", "monkey", "boar", "horse", "tiger"),
+    "chidori": ("ox", "hare", "monkey"),
+}
+
+
+def _failure_table(seq):
+    """KMP failure function: longest proper prefix that is also a suffix."""
+    fail = [0] * len(seq)
+    k = 0
+    for i in range(1, len(seq)):
+        while k and seq[i] != seq[k]:
+            k = fail[k - 1]
+        if seq[i] == seq[k]:
+            k += 1
+        fail[i] = k
+    return fail
+
+
+class _SequenceMatcher:
+    """Incremental matcher for one registered sequence."""
+
+    def __init__(self, name, seals, window, callback):
+        self.name = name
+        self.seals = tuple(seals)
+        self.window = window
+        self.callback = callback
+        self._fail = _failure_table(self.seals)
+        self._times = deque()      # timestamps of the currently matched prefix
+        self.completions = 0
+
+    @property
+    def progress(self):
+        return len(self._times)
+
+    def _fall_back(self):
+        k = self._fail[len(self._times) - 1]
+        while len(self._times) > k:
+            self._times.popleft()
+
+    def step(self, seal, now):
+        """Advance by one seal event; True if the sequence just completed."""
+        # Drop the oldest part of the partial match once it leaves the window
+        while self._times and now - self._times[0] > self.window:
+            self._fall_back()
+
+        while self._times and self.seals[len(self._times)] != seal:
+            self._fall_back()
+        if self.seals[len(self._times)] == seal:
+            self._times.append(now)
+
+        if len(self._times) == len(self.seals):
+            self.completions += 1
+            self._fall_back()
+            return True
+        return False
+
+    def reset(self):
+        self._times.clear()
+
+
+class SealSequenceRecognizer:
+    """
+    Streams per-frame seal labels through every registered sequence.
+
+    Args:
+        window: Default max seconds from first to last seal of a sequence.
+        confirm_frames: Consecutive frames a label must persist to count as
+            a seal event (suppresses one-frame misclassifications).
+        history: Size of the recent-events ring buffer.
+    """
+
+    def __init__(self, window=3.0, confirm_frames=2, history=32):
+        self.window = window
+        self.confirm_frames = max(1, int(confirm_frames))
+        self._matchers = []
+        self.recent = deque(maxlen=history)     # (t, seal) events
+        self.fired = deque(maxlen=history)      # (t, sequence name)
+
+        self._candidate = None
+        self._candidate_frames = 0
+        self._current = None
+
+    def register(self, name, seals, window=None, callback=None):
+        """
+        Add a sequence. `callback(name, t)` runs on completion (on the
+        feeding thread). Seals may repeat, e.g. ("tiger", "ram", "tiger").
+        """
+        if not seals:
+            raise ValueError("A seal sequence needs at least one seal")
+        self._matchers.append(
+            _SequenceMatcher(name, seals, self.window if window is None else window, callback)
+        )
+
+    def feed(self, seal, now=None):
+        """
+        Feed one frame's label (seal name or None).
+
+        Returns:
+            list of sequence names completed on this frame (usually empty).
+        """
+        now = time.monotonic() if now is None else now
+
+        if seal == self._candidate:
+            self._candidate_frames += 1
+        else:
+            self._candidate, self._candidate_frames = seal, 1
+        if self._candidate_frames != self.confirm_frames or seal == self._current:
+            return []
+
+        # A new, confirmed label: "no seal" only separates repeats of a seal
+        self._current = seal
+        if seal is None:
+            return []
+        self.recent.append((now, seal))
+
+        completed = []
+        for matcher in self._matchers:
+            if matcher.step(seal, now):
+                completed.append(matcher.name)
+                self.fired.append((now, matcher.name))
+                if matcher.callback is not None:
+                    matcher.callback(matcher.name, now)
+        return completed
+
+    def reset(self):
+        """Forget all partial matches."""
+        for matcher in self._matchers:
+            matcher.reset()
+        self._candidate, self._candidate_frames, self._current = None, 0, None
+
+    def stats(self):
+        """JSON-friendly matcher progress and recent events."""
+        return {
+            "sequences": {
+                m.name: {
+                    "seals": list(m.seals),
+                    "progress": m.progress,
+                    "completions": m.completions,
+                } for m in self._matchers
+            },
+            # list() snapshots the deques atomically (stats runs on other threads)
+            "recent_seals": [seal for _, seal in list(self.recent)],
+            "fired": [name for _, name in list(self.fired)],
+        }
@@ -0,0 +1,330 @@
+"""
+Benchmark — Camera-Free Per-Stage Measurements
+===============================================
+Times every hot-path stage on synthetic (or fixture) frames and masks, so
+performance can be measured and compared without a webcam:
+
+    inference_rgb     resize + BGR→RGB for MediaPipe
+    gesture.detect    GestureEngine.detect (MediaPipe Hands)
+    segment           CloneEngine SelfieSegmentation + refinement
+    composite.float   CloneEngine.render with a fixture mask, float path
+    composite.uint8   CloneEngine.render with a fixture mask, uint8 path
+    renderer.float    CloneRenderer.render (legacy, incl. segmentation)
+    renderer.uint8    CloneRenderer.render (legacy, incl. segmentation)
+    jpeg.encode       cv2.imencode at quality 85
+
+Each stage reports latency percentiles, throughput and peak traced memory
+(NumPy/Python allocations via tracemalloc, measured in a separate pass so
+tracing does not skew the timings). Results are plain JSON dicts — one run
+can be saved as a baseline and later runs compared against it.
+"""
+
+import cv2
+import glob
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.utils.frame_ops import inference_rgb, scale_for_width
+
+
+RESOLUTIONS = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+
+STAGES = (
+    "inference_rgb", "gesture.detect", "segment",
+    "composite.float", "composite.uint8",
+    "renderer.float", "renderer.uint8", "jpeg.encode",
+)
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+
+# ============================================================
+# Inputs
+# ============================================================
+def synthetic_frame(width, height, seed=0):
+    """
+    Deterministic BGR test frame: shaded background, a person-sized
+    silhouette (head + torso) and sensor-like noise.
+    """
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(40, 140, width, dtype=np.float32)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = np.stack([ramp, ramp * 0.9, ramp * 0.8], axis=-1).astype(np.uint8)
+    cx = width // 2
+    cv2.ellipse(frame, (cx, int(height * 0.30)), (width // 14, height // 9), 0, 0, 360,
+                (150, 170, 200), -1)
+    cv2.ellipse(frame, (cx, int(height * 0.85)), (width // 7, int(height * 0.42)), 0, 0, 360,
+                (90, 60, 170), -1)
+    noise = rng.integers(0, 12, size=frame.shape, dtype=np.uint8)
+    cv2.add(frame, noise, dst=frame)
+    return frame
+
+
+def synthetic_mask(width, height):
+    """Refined-style float32 mask of the synthetic silhouette (3x3 blurred)."""
+    mask = np.zeros((height, width), dtype=np.float32)
+    cx = width // 2
+    cv2.ellipse(mask, (cx, int(height * 0.30)), (width // 14, height // 9), 0, 0, 360, 1.0, -1)
+    cv2.ellipse(mask, (cx, int(height * 0.85)), (width // 7, int(height * 0.42)), 0, 0, 360, 1.0, -1)
+    return cv2.GaussianBlur(mask, (3, 3), 0)
+
+
+def load_fixtures(directory, width, height):
+    """
+    Frames (and masks) from a fixture directory, resized to (width, height).
+
+    Every image `name.png|jpg` is a frame; an optional `name_mask.png`
+    next to it is used as its mask (else the synthetic mask is used).
+    """
+    frames = []
+    for path in sorted(glob.glob(os.path.join(directory, "*"))):
+        stem, ext = os.path.splitext(os.path.basename(path))
+        if ext.lower() not in (".png", ".jpg", ".jpeg") or stem.endswith("_mask"):
+            continue
+        frame = cv2.imread(path, cv2.IMREAD_COLOR)
+        if frame is None:
+            continue
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        mask_path = os.path.join(directory, f"{stem}_mask.png")
+        if os.path.exists(mask_path):
+            mask = cv2.imread(mask_path, cv2.IMREAD_GRAYSCALE)
+            mask = cv2.resize(mask, (width, height)).astype(np.float32) / 255.0
+        else:
+            mask = synthetic_mask(width, height)
+        frames.append((frame, mask))
+    return frames
+
+
+# ============================================================
+# Stage runners
+# ============================================================
+def _stage_runners(stages):
+    """
+    name → setup() returning step(frame, mask). Engines are built lazily so
+    a run restricted to a few stages does not load unused MediaPipe graphs.
+    """
+    def infer_rgb():
+        def step(frame, mask):
+            inference_rgb(frame, scale_for_width(frame.shape[1], 640))
+        return step
+
+    def gesture():
+        from src.engines.gesture_engine import GestureEngine
+        engine = GestureEngine()
+
+        def step(frame, mask):
+            engine.detect(inference_rgb(frame, scale_for_width(frame.shape[1], 640)))
+        return step
+
+    def segment():
+        from src.engines.clone_engine import CloneEngine
+        engine = CloneEngine()
+
+        def step(frame, mask):
+            engine._segment(inference_rgb(frame, scale_for_width(frame.shape[1], 640)))
+        return step
+
+    def composite(compositor):
+        def setup():
+            from src.engines.clone_engine import CloneEngine
+            engine = CloneEngine(compositor=compositor)
+            scratch = {}
+
+            def step(frame, mask):
+                # Composite in place on a reused copy (no per-call allocation)
+                buf = scratch.get(frame.shape)
+                if buf is None:
+                    buf = scratch[frame.shape] = np.empty_like(frame)
+                np.copyto(buf, frame)
+                engine.render(buf, active=True, mask=mask, inplace=True)
+            return step
+        return setup
+
+    def renderer(compositor):
+        def setup():
+            from src.app.clone_engine import CloneRenderer
+            engine = CloneRenderer(compositor=compositor)
+            scratch = {}
+
+            def step(frame, mask):
+                buf = scratch.get(frame.shape)
+                if buf is None:
+                    buf = scratch[frame.shape] = np.empty_like(frame)
+                np.copyto(buf, frame)
+                engine.render(buf, active=True, inplace=True)
+            return step
+        return setup
+
+    def jpeg():
+        params = [cv2.IMWRITE_JPEG_QUALITY, 85]
+
+        def step(frame, mask):
+            cv2.imencode('.jpg', frame, params)
+        return step
+
+    runners = {
+        "inference_rgb": infer_rgb,
+        "gesture.detect": gesture,
+        "segment": segment,
+        "composite.float": composite("float"),
+        "composite.uint8": composite("uint8"),
+        "renderer.float": renderer("float"),
+        "renderer.uint8": renderer("uint8"),
+        "jpeg.encode": jpeg,
+    }
+    return {name: runners[name] for name in stages}
+
+
+def _percentiles(samples_ms):
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    p50, p90, p99 = np.percentile(arr, (50, 90, 99))
+    mean = float(arr.mean())
+    return {
+        "mean_ms": round(mean, 3),
+        "p50_ms": round(float(p50), 3),
+        "p90_ms": round(float(p90), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(arr.max()), 3),
+        "fps": round(1000.0 / mean, 1) if mean > 0 else 0.0,
+    }
+
+
+def bench_stage(step, inputs, iterations=100, warmup=10, memory_iterations=5):
+    """
+    Time `step` over `inputs` (cycled), then measure its traced peak memory.
+
+    Returns:
+        dict of latency percentiles, fps and peak_traced_bytes.
+    """
+    n = len(inputs)
+    for i in range(warmup):
+        step(*inputs[i % n])
+
+    samples = []
+    for i in range(iterations):
+        frame, mask = inputs[i % n]
+        t0 = time.perf_counter()
+        step(frame, mask)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    result = _percentiles(samples)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    for i in range(memory_iterations):
+        step(*inputs[i % n])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["peak_traced_bytes"] = int(peak - base)
+    return result
+
+
+def run_benchmarks(resolutions=("480p", "720p", "1080p"), stages=STAGES,
+                   iterations=100, warmup=10, fixtures=None, log=print):
+    """
+    Run every stage at every resolution.
+
+    Returns:
+        JSON-friendly report: {"meta": {...}, "results": {res: {stage: {...}}}}
+    """
+    runners = _stage_runners(stages)
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "iterations": iterations,
+            "fixtures": fixtures,
+        },
+        "results": {},
+    }
+    steps = {}
+    for res in resolutions:
+        w, h = RESOLUTIONS[res]
+        inputs = load_fixtures(fixtures, w, h) if fixtures else []
+        if not inputs:
+            mask = synthetic_mask(w, h)
+            inputs = [(synthetic_frame(w, h, seed), mask) for seed in range(4)]
+
+        report["results"][res] = {}
+        for name in stages:
+            if name not in steps:
+                steps[name] = runners[name]()
+            stats = bench_stage(steps[name], inputs, iterations, warmup)
+            report["results"][res][name] = stats
+            log(f"[BENCH] {res:>5} {name:<16} p50 {stats['p50_ms']:8.2f} ms  "
+                f"p99 {stats['p99_ms']:8.2f} ms  {stats['fps']:7.1f} fps  "
+                f"peak {stats['peak_traced_bytes'] / 1e6:7.2f} MB")
+    return report
+
+
+# ============================================================
+# Baselines
+# ============================================================
+def save_report(report, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_reports(baseline, current, tolerance=0.10, metric="p50_ms"):
+    """
+    Compare `metric` per (resolution, stage) present in both reports.
+
+    Returns:
+        (rows, regressions): rows are dicts with base/current/change; a row
+        is a regression when current > base * (1 + tolerance).
+    """
+    rows, regressions = [], []
+    for res, stages in current["results"].items():
+        base_stages = baseline["results"].get(res, {})
+        for stage, stats in stages.items():
+            if stage not in base_stages:
+                continue
+            base = base_stages[stage][metric]
+            cur = stats[metric]
+            change = (cur - base) / base if base > 0 else 0.0
+            row = {
+                "resolution": res,
+                "stage": stage,
+                "base": base,
+                "current": cur,
+                "change": round(change, 4),
+                "regression": change > tolerance,
+            }
+            rows.append(row)
+            if row["regression"]:
+                regressions.append(row)
+    return rows, regressions
+
+
+def format_comparison(rows, metric="p50_ms"):
+    """Human-readable comparison table."""
+    lines = [f"{'res':>5}  {'stage':<16} {'base':>9} {'current':>9} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['resolution']:>5}  {row['stage']:<16} {row['base']:9.2f} "
+            f"{row['current']:9.2f} {row['change'] * 100:+7.1f}%{flag}"
+        )
+    lines.append(f"(metric: {metric})")
+    return "\n".join(lines)
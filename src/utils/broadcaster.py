@@ -0,0 +1,105 @@
+"""
+Frame Broadcaster — Encode-Once Async Fan-Out
+==============================================
+The camera thread publishes each encoded frame exactly once; any number of
+asyncio clients await a "new frame" notification and read the latest frame.
+Clients never poll and never queue: a slow client simply wakes up to the
+newest frame and skips whatever it missed, so it can't hold back the
+producer or the other viewers.
+"""
+
+import asyncio
+import threading
+
+
+class FrameBroadcaster:
+    """
+    Single-slot publish/subscribe hub bridging a producer thread to asyncio.
+
+    Usage:
+        broadcaster.attach(asyncio.get_running_loop())   # at startup
+        broadcaster.publish(jpeg_bytes)                   # from any thread
+        async for frame in broadcaster.subscribe(): ...   # per client
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self._seq = 0
+        self._loop = None
+        self._event = None
+        self._closed = False
+        self.clients = 0
+        self.published = 0
+        self.skipped = 0       # frames subscribers missed (summed over clients)
+
+    def attach(self, loop):
+        """Bind to the event loop that serves the subscribers."""
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._closed = False
+
+    def publish(self, frame):
+        """Store a new frame and wake all waiting subscribers (thread-safe)."""
+        with self._lock:
+            self._frame = frame
+            self._seq += 1
+            self.published += 1
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:
+                # Loop shut down between the check and the call
+                pass
+
+    def latest(self):
+        """Return (seq, frame) for the most recent publication."""
+        with self._lock:
+            return self._seq, self._frame
+
+    def close(self):
+        """Release all subscribers (called on server shutdown)."""
+        self._closed = True
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:
+                pass
+
+    def _wake(self):
+        """Runs on the event loop: fire the current event and arm a fresh one."""
+        event, self._event = self._event, asyncio.Event()
+        if event is not None:
+            event.set()
+
+    async def wait_next(self, last_seq):
+        """
+        Wait until a frame newer than `last_seq` exists.
+
+        Returns:
+            (seq, frame), or (last_seq, None) once the broadcaster is closed.
+        """
+        while not self._closed:
+            event = self._event
+            seq, frame = self.latest()
+            if seq != last_seq and frame is not None:
+                return seq, frame
+            await event.wait()
+        return last_seq, None
+
+    async def subscribe(self):
+        """Async generator yielding each new frame (skipping missed ones)."""
+        self.clients += 1
+        try:
+            seq = 0
+            while True:
+                prev = seq
+                seq, frame = await self.wait_next(seq)
+                if frame is None:
+                    return
+                if prev and seq > prev + 1:
+                    self.skipped += seq - prev - 1
+                yield frame
+        finally:
+            self.clients -= 1
@@ -0,0 +1,53 @@
+"""
+Buffer Arena — Shape-Keyed Scratch Buffers
+===========================================
+Frame-sized scratch arrays are allocated once per resolution and handed
+back on every subsequent frame. A buffer is only reallocated when its
+requested shape or dtype changes (i.e. the camera resolution changed), and
+every allocation is counted so steady-state "zero large allocations" can be
+verified from /status.
+"""
+
+import numpy as np
+
+
+class BufferArena:
+    """
+    Named, reusable NumPy buffers.
+
+    Usage:
+        acc = arena.get("acc", (h, w, 3), np.uint16)   # same object every frame
+
+    Contents are NOT cleared between calls — callers must fully overwrite
+    (np.copyto / ufunc out= / cv2 dst=) before reading.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self.allocations = 0
+        self.bytes_allocated = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """Return the buffer `name`, (re)allocating only if shape/dtype differ."""
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+            self.allocations += 1
+            self.bytes_allocated += buf.nbytes
+        return buf
+
+    def clear(self):
+        """Drop all buffers (they will be reallocated on next use)."""
+        self._buffers.clear()
+
+    def stats(self):
+        """Allocation counters and current resident size."""
+        return {
+            "buffers": len(self._buffers),
+            "allocations": self.allocations,
+            "bytes_allocated": self.bytes_allocated,
+            "resident_bytes": sum(b.nbytes for b in self._buffers.values()),
+        }
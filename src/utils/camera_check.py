@@ -1,50 +1,146 @@
 import cv2
+import json
+import os
+import sys
+import time
 import numpy as np
 
-def probe_cameras(max_indices=5):
+# Last successful probe (index, backend, resolution, channels), validated on next launch
+CACHE_PATH = os.environ.get(
+    "JUTSU_CAMERA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".shadow_clone_jutsu", "camera.json"),
+)
+
+# Capture API cameras are opened with: DirectShow on Windows 11 (the verified
+# setup), AVFoundation on macOS, V4L2 on Linux
+if sys.platform == "win32":
+    PROBE_API = cv2.CAP_DSHOW
+elif sys.platform == "darwin":
+    PROBE_API = cv2.CAP_AVFOUNDATION
+else:
+    PROBE_API = cv2.CAP_V4L2
+
+
+def _check_index(idx, api=PROBE_API, warmup=5):
     """
-    Probes camera indices 0-4 to find a valid BGR stream (excluding IR/Greyscale).
-    Returns the optimal index or raises Exception.
+    Opens one index and checks for a BGR stream.
+    Returns (cap, info) with the capture still OPEN, or (None, reason).
     """
+    cap = cv2.VideoCapture(idx, api)
+
+    if not cap.isOpened():
+        cap.release()
+        return None, "Failed to open."
+
+    # Warmup and read
+    for _ in range(warmup):
+        cap.read()
+    ret, frame = cap.read()
+
+    if not ret or frame is None:
+        cap.release()
+        return None, "Skipped (No frame or invalid format)."
+
+    # Windows Hello IR cameras often appear as single channel.
+    # User rule: "If a frame is single-channel (grayscale), it is the IR sensor."
+    if len(frame.shape) == 2 or frame.shape[2] != 3:
+        cap.release()
+        return None, "Skipped (Single Channel / Grayscale IR)."
+
+    info = {
+        "index": idx,
+        "api": int(api),
+        "backend": cap.getBackendName(),
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "channels": int(frame.shape[2]),
+    }
+    return cap, info
+
+
+def _probe(max_indices=5):
+    """Scans indices 0..max_indices-1; returns (cap, info) for the first BGR stream."""
     print("Probing camera indices...")
     for idx in range(max_indices):
         print(f"Checking index {idx}...")
-        # Enforce DirectShow for Windows 11 compatibility
-        cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
-        
-        if not cap.isOpened():
-            print(f"Index {idx}: Failed to open.")
-            cap.release()
+        cap, info = _check_index(idx)
+        if cap is None:
+            print(f"Index {idx}: {info}")
             continue
-            
-        # Warmup and read
-        for _ in range(5):
-            cap.read()
-        ret, frame = cap.read()
-        
-        width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-        height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
-        cap.release()
-        
-        if ret and frame is not None:
-            # Check frame channels
-            # Windows Hello IR cameras often appear as single channel or very low variance 3-channel
-            # Simple heuristic: If it's valid BGR, we take it.
-            # User rule: "If a frame is single-channel (grayscale), it is the IR sensor."
-            
-            if len(frame.shape) == 2:
-                 print(f"Index {idx}: Skipped (Single Channel / Grayscale IR).")
-                 continue
-                 
-            if len(frame.shape) == 3 and frame.shape[2] == 3:
-                # Additional check: Some IR cameras return 3 channels but are visually greyscale.
-                # We can check for color variance but let's stick to the explicit rule first.
-                print(f"Index {idx}: Found valid BGR stream ({int(width)}x{int(height)}).")
-                return idx
-            
-        print(f"Index {idx}: Skipped (No frame or invalid format).")
-    
-    raise Exception("No valid BGR camera found in indices 0-4.")
+        print(f"Index {idx}: Found valid BGR stream ({info['width']}x{info['height']}).")
+        return cap, info
+
+    raise Exception(f"No valid BGR camera found in indices 0-{max_indices - 1}.")
+
+
+def probe_cameras(max_indices=5):
+    """
+    Probes camera indices 0-4 to find a valid BGR stream (excluding IR/Greyscale).
+    Returns the optimal index or raises Exception.
+    """
+    cap, info = _probe(max_indices)
+    cap.release()
+    return info["index"]
+
+
+def load_camera_cache(path=CACHE_PATH):
+    """Cached probe result dict, or None."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_camera_cache(info, path=CACHE_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(dict(info, probed_at=time.strftime("%Y-%m-%dT%H:%M:%S")), f, indent=2)
+    except OSError as e:
+        print(f"[CAMERA] Could not write probe cache ({e}).")
+
+
+def clear_camera_cache(path=CACHE_PATH):
+    """Forget the cached probe (next open_camera() runs a full scan)."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def open_camera(max_indices=5, use_cache=True, cache_path=CACHE_PATH):
+    """
+    Returns (index, cap) with the VideoCapture already OPEN and warmed up.
+
+    The cached probe is tried first: its index is opened once and validated
+    (same capture API and backend, delivers a 3-channel frame at the cached
+    resolution). A cache written under another API is a miss without
+    opening anything. On a miss or a failed validation the full probe runs,
+    keeps the winning capture open instead of releasing and reopening it,
+    and refreshes the cache.
+    """
+    if use_cache:
+        cached = load_camera_cache(cache_path)
+        if cached and cached.get("api") != int(PROBE_API):
+            print("[CAMERA] Cached probe used another capture API — re-probing.")
+            cached = None
+        if cached:
+            cap, info = _check_index(cached["index"], PROBE_API, warmup=1)
+            keys = ("backend", "width", "height", "channels")
+            if cap is not None and all(info[k] == cached.get(k) for k in keys):
+                print(f"[CAMERA] Using cached probe: index {info['index']} "
+                      f"({info['width']}x{info['height']}, {info['backend']}).")
+                return info["index"], cap
+            if cap is not None:
+                cap.release()
+            print("[CAMERA] Cached probe is stale — re-probing.")
+
+    cap, info = _probe(max_indices)
+    if use_cache:
+        save_camera_cache(info, cache_path)
+    return info["index"], cap
+
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,101 @@
+"""
+Frame Context — One Frame, Memoized Derived Views
+==================================================
+Carries a captured frame through the pipeline together with lazily computed,
+cached views of it, so each conversion (mirror, BGR→RGB, downscale, float)
+runs at most once per frame no matter how many engines consume it:
+
+    ctx = FrameContext(raw, frame_id, mirror=True, inference_scale=0.5)
+    gesture.detect(ctx.small_rgb)                      # resize + cvtColor
+    cloner.render(ctx.frame, active, frame_rgb=ctx.small_rgb)   # cache hit
+
+Views are derived from the frame as captured. Compositors write into
+`ctx.frame` in place, so request any view you need BEFORE rendering.
+"""
+
+import cv2
+import numpy as np
+
+from src.utils.frame_ops import inference_size
+
+
+class FrameContext:
+    """
+    Args:
+        raw: BGR frame as read from the source.
+        frame_id: Monotonic frame number (for tracing / logging).
+        mirror: Flip horizontally for the selfie view (`frame`).
+        inference_scale: Downscale factor for `small` / `small_rgb`.
+        t_capture: Capture timestamp (time.time()), if known.
+    """
+
+    __slots__ = ("raw", "frame_id", "mirror", "inference_scale", "t_capture",
+                 "_frame", "_rgb", "_small", "_small_rgb", "_float", "conversions")
+
+    def __init__(self, raw, frame_id=0, mirror=False, inference_scale=1.0, t_capture=None):
+        self.raw = raw
+        self.frame_id = frame_id
+        self.mirror = mirror
+        self.inference_scale = inference_scale
+        self.t_capture = t_capture
+        self._frame = None
+        self._rgb = None
+        self._small = None
+        self._small_rgb = None
+        self._float = None
+        self.conversions = 0   # views actually computed (not served from cache)
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    @property
+    def frame(self):
+        """Display-orientation BGR frame (mirrored if requested)."""
+        if self._frame is None:
+            self._frame = cv2.flip(self.raw, 1) if self.mirror else self.raw
+            self.conversions += self.mirror
+        return self._frame
+
+    @property
+    def rgb(self):
+        """Full-resolution RGB of `frame`."""
+        if self._rgb is None:
+            self._rgb = cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB)
+            self.conversions += 1
+        return self._rgb
+
+    @property
+    def small(self):
+        """`frame` downscaled by inference_scale (INTER_AREA), BGR."""
+        if self._small is None:
+            if self.inference_scale == 1.0:
+                self._small = self.frame
+            else:
+                h, w = self.frame.shape[:2]
+                self._small = cv2.resize(self.frame, inference_size(w, h, self.inference_scale),
+                                         interpolation=cv2.INTER_AREA)
+                self.conversions += 1
+        return self._small
+
+    @property
+    def small_rgb(self):
+        """
+        Inference input: downscaled RGB (resize before cvtColor, as in
+        src.utils.frame_ops.inference_rgb). Same object as `rgb` at scale 1.
+        """
+        if self._small_rgb is None:
+            if self.inference_scale == 1.0:
+                self._small_rgb = self.rgb
+            else:
+                self._small_rgb = cv2.cvtColor(self.small, cv2.COLOR_BGR2RGB)
+                self.conversions += 1
+        return self._small_rgb
+
+    @property
+    def float(self):
+        """`frame` as float32 in [0, 255]."""
+        if self._float is None:
+            self._float = self.frame.astype(np.float32)
+            self.conversions += 1
+        return self._float
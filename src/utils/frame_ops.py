@@ -0,0 +1,34 @@
+"""
+Frame Ops — Shared Frame Conversions
+=====================================
+Small helpers for preparing camera frames for MediaPipe inference.
+"""
+
+import cv2
+
+
+def inference_size(width, height, scale):
+    """(w, h) of a frame after applying the inference scale (min 1 px)."""
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def inference_rgb(frame_bgr, scale=1.0):
+    """
+    Downscale a BGR frame by `scale` and convert it to RGB.
+
+    Resizing happens BEFORE the color conversion so cvtColor touches fewer
+    pixels. MediaPipe returns normalized landmarks and a mask at the input
+    resolution, so callers only need to upscale the mask, never landmarks.
+    """
+    if scale != 1.0:
+        h, w = frame_bgr.shape[:2]
+        frame_bgr = cv2.resize(frame_bgr, inference_size(w, h, scale),
+                               interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+
+
+def scale_for_width(width, max_width=640):
+    """Inference scale that caps the inference width at `max_width` (0/None = no cap)."""
+    if width <= 0 or not max_width:
+        return 1.0
+    return min(1.0, max_width / float(width))
@@ -0,0 +1,327 @@
+"""
+Frame Sources — Camera, Files, Synthetic and Recorded Sessions
+===============================================================
+Everything that feeds frames to the engines speaks the small slice of the
+cv2.VideoCapture API the entry points use — read(), isOpened(), release(),
+get(CAP_PROP_*) and getBackendName() — so FramePipeline and the GUI loop
+take a live camera or any of these interchangeably:
+
+    camera              cached probe → open VideoCapture (src.utils.camera_check)
+    camera:N            camera index N
+    synthetic[:WxH]     generated frames (no hardware, no files)
+    path/to/video.mp4   video file
+    path/to/images/     directory of .png/.jpg frames (sorted by name)
+    session:path/       recorded session: raw frames, memory-mapped
+
+Non-camera sources replay at their native FPS by default; realtime=False
+replays as fast as the consumer reads (throughput measurement).
+
+Recorded session layout (see record_session):
+    session.json   {"width", "height", "channels", "frames", "fps"}
+    frames.raw     frames * height * width * channels uint8, back to back
+The raw file is memory-mapped read-only, so a read is a zero-copy view of
+the page cache. Session and synthetic frames are not writeable: consumers that composite in place
+must mirror (FrameContext(mirror=True) flips into a new array) or copy.
+"""
+
+import abc
+import cv2
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+
+SESSION_HEADER = "session.json"
+SESSION_FRAMES = "frames.raw"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource(abc.ABC):
+    """
+    Base class: VideoCapture-compatible reads with optional real-time pacing.
+
+    Subclasses must implement _next() → frame or None (end of stream) and
+    _rewind(); width/height/fps/frame_count are plain attributes.
+    """
+
+    BACKEND = "source"
+
+    def __init__(self, fps=30.0, realtime=True, loop=True):
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.realtime = realtime
+        self.loop = loop
+        self.width = self.height = 0
+        self.frame_count = 0
+        self.frames_read = 0
+        self._opened = True
+        self._t_start = None
+
+    # --- VideoCapture surface -------------------------------------
+    def read(self):
+        if not self._opened:
+            return False, None
+        frame = self._next()
+        if frame is None and self.loop and self.frames_read:
+            self._rewind()
+            frame = self._next()
+        if frame is None:
+            return False, None
+        self._pace()
+        self.frames_read += 1
+        return True, frame
+
+    def isOpened(self):
+        return self._opened
+
+    def release(self):
+        self._opened = False
+
+    def get(self, prop):
+        return {
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_COUNT: self.frame_count,
+        }.get(prop, 0.0)
+
+    def getBackendName(self):
+        return self.BACKEND
+
+    # --- Helpers ---------------------------------------------------
+    def _pace(self):
+        """Sleep until this frame is due (real-time replay only)."""
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._t_start is None:
+            self._t_start = now
+        due = self._t_start + self.frames_read / self.fps
+        if due > now:
+            time.sleep(due - now)
+        elif now - due > 1.0:
+            # Consumer fell far behind: resync instead of bursting
+            self._t_start = now - self.frames_read / self.fps
+
+    @abc.abstractmethod
+    def _next(self):
+        """Next frame, or None at the end of the stream."""
+
+    @abc.abstractmethod
+    def _rewind(self):
+        """Restart from the first frame."""
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file."""
+
+    BACKEND = "file"
+
+    def __init__(self, path, realtime=True, loop=True):
+        self._cap = cv2.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Cannot open video '{path}'")
+        super().__init__(self._cap.get(cv2.CAP_PROP_FPS), realtime, loop)
+        self.width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    def _next(self):
+        ret, frame = self._cap.read()
+        return frame if ret else None
+
+    def _rewind(self):
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def release(self):
+        super().release()
+        self._cap.release()
+
+
+class ImageDirSource(FrameSource):
+    """Still images from a directory, in file-name order."""
+
+    BACKEND = "images"
+
+    def __init__(self, directory, fps=30.0, realtime=True, loop=True):
+        super().__init__(fps, realtime, loop)
+        self._paths = sorted(
+            p for p in glob.glob(os.path.join(directory, "*"))
+            if p.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self._paths:
+            raise RuntimeError(f"No images found in '{directory}'")
+        first = cv2.imread(self._paths[0], cv2.IMREAD_COLOR)
+        self.height, self.width = first.shape[:2]
+        self.frame_count = len(self._paths)
+        self._pos = 0
+
+    def _next(self):
+        if self._pos >= len(self._paths):
+            return None
+        frame = cv2.imread(self._paths[self._pos], cv2.IMREAD_COLOR)
+        self._pos += 1
+        if frame is not None and frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def _rewind(self):
+        self._pos = 0
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames (see src.utils.benchmark.synthetic_frame), cycled from a
+    small precomputed set so generation never shows up in measurements.
+    """
+
+    BACKEND = "synthetic"
+
+    def __init__(self, width=1280, height=720, fps=30.0, realtime=True, variants=8):
+        super().__init__(fps, realtime, loop=True)
+        from src.utils.benchmark import synthetic_frame
+        self.width, self.height = width, height
+        self._frames = [synthetic_frame(width, height, seed) for seed in range(variants)]
+        for frame in self._frames:
+            # Shared across reads: read-only, like session views
+            frame.setflags(write=False)
+        self._pos = 0
+
+    def _next(self):
+        frame = self._frames[self._pos % len(self._frames)]
+        self._pos += 1
+        return frame
+
+    def _rewind(self):
+        self._pos = 0
+
+
+class RecordedSession(FrameSource):
+    """Raw frames replayed from a memory-mapped session file."""
+
+    BACKEND = "session"
+
+    def __init__(self, directory, realtime=True, loop=True):
+        with open(os.path.join(directory, SESSION_HEADER)) as f:
+            header = json.load(f)
+        super().__init__(header.get("fps", 30.0), realtime, loop)
+        self.width, self.height = header["width"], header["height"]
+        self.frame_count = header["frames"]
+        channels = header.get("channels", 3)
+        # Read-only mapping: each read is a view, no decode and no copy
+        self._frames = np.memmap(
+            os.path.join(directory, SESSION_FRAMES), dtype=np.uint8, mode="r",
+            shape=(self.frame_count, self.height, self.width, channels),
+        )
+        self._pos = 0
+
+    def _next(self):
+        if self._pos >= self.frame_count:
+            return None
+        frame = self._frames[self._pos]
+        self._pos += 1
+        return frame
+
+    def _rewind(self):
+        self._pos = 0
+
+    def release(self):
+        super().release()
+        self._frames = None
+
+
+def record_session(source, directory, frames, log=print):
+    """
+    Record `frames` frames from any source into a session directory.
+
+    Returns:
+        Number of frames written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written, shape = 0, None
+    t0 = time.perf_counter()
+    with open(os.path.join(directory, SESSION_FRAMES), "wb") as f:
+        while written < frames:
+            ret, frame = source.read()
+            if not ret:
+                break
+            if shape is None:
+                shape = frame.shape
+            elif frame.shape != shape:
+                raise RuntimeError(f"Frame size changed mid-recording: {frame.shape} != {shape}")
+            f.write(np.ascontiguousarray(frame).tobytes())
+            written += 1
+    if shape is None:
+        raise RuntimeError("Source delivered no frames")
+
+    elapsed = time.perf_counter() - t0
+    fps = source.get(cv2.CAP_PROP_FPS) or (written / elapsed if elapsed > 0 else 30.0)
+    with open(os.path.join(directory, SESSION_HEADER), "w") as f:
+        json.dump({
+            "width": shape[1],
+            "height": shape[0],
+            "channels": shape[2] if len(shape) == 3 else 1,
+            "frames": written,
+            "fps": fps,
+        }, f, indent=2)
+    log(f"[SOURCE] Recorded {written} frames ({shape[1]}x{shape[0]}) to {directory}")
+    return written
+
+
+def open_source(spec=None, realtime=True, loop=True):
+    """
+    Open a frame source from a spec string (see module docstring).
+
+    Returns:
+        (label, source): a short description and a VideoCapture-like object.
+    """
+    if spec in (None, "", "camera"):
+        from src.utils.camera_check import open_camera
+        idx, cap = open_camera()
+        return f"camera:{idx}", cap
+
+    if spec.startswith("camera:"):
+        from src.utils.camera_check import PROBE_API
+        idx = int(spec.split(":", 1)[1])
+        cap = cv2.VideoCapture(idx, PROBE_API)
+        if not cap.isOpened():
+            raise RuntimeError(f"Camera index {idx} failed to open")
+        return spec, cap
+
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        width, height = 1280, 720
+        if ":" in spec:
+            width, height = (int(v) for v in spec.split(":", 1)[1].lower().split("x"))
+        return f"synthetic:{width}x{height}", SyntheticSource(width, height, realtime=realtime)
+
+    if spec.startswith("session:"):
+        path = spec.split(":", 1)[1]
+        return spec, RecordedSession(path, realtime, loop)
+
+    if os.path.isdir(spec):
+        if os.path.exists(os.path.join(spec, SESSION_HEADER)):
+            return f"session:{spec}", RecordedSession(spec, realtime, loop)
+        return f"images:{spec}", ImageDirSource(spec, realtime=realtime, loop=loop)
+
+    if os.path.isfile(spec):
+        return f"file:{spec}", VideoFileSource(spec, realtime, loop)
+
+    raise ValueError(f"Unknown frame source '{spec}'")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record a frame source into a session")
+    parser.add_argument("source", help="Source spec (camera, synthetic:640x480, video.mp4, ...)")
+    parser.add_argument("output", help="Session directory to create")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to record")
+    args = parser.parse_args()
+
+    _, src = open_source(args.source, realtime=False, loop=False)
+    try:
+        record_session(src, args.output, args.frames)
+    finally:
+        src.release()
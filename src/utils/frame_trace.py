@@ -0,0 +1,83 @@
+"""
+Frame Trace — Per-Frame Span Ring Buffer (Chrome Trace Export)
+===============================================================
+Records (stage, frame, start, end, thread) spans into a fixed-size ring
+buffer: recording is one tuple store and an index bump, so it stays on in
+production. On demand the buffer is exported in Chrome trace-event format
+(load it in chrome://tracing or https://ui.perfetto.dev) to see which frame
+and which stage caused a stutter.
+
+    tracer = FrameTracer()
+    t0 = time.perf_counter(); ...; tracer.span("encode", frame_id, t0, time.perf_counter())
+    json.dump(tracer.export(), f)
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class FrameTracer:
+    """
+    Lock-free-ish span recorder (single list slot assignment is atomic under
+    the GIL; a concurrent export may miss the span being written).
+
+    Args:
+        capacity: Number of spans kept (oldest are overwritten).
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = max(1, int(capacity))
+        self._spans = [None] * self.capacity
+        self._next = 0
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+
+    def span(self, name, frame_id, t_start, t_end, **args):
+        """Record one span; times are time.perf_counter() seconds."""
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        i = self._next
+        self._spans[i % self.capacity] = (name, frame_id, t_start, t_end, tid, args or None)
+        self._next = i + 1
+
+    def clear(self):
+        self._spans = [None] * self.capacity
+        self._next = 0
+
+    def __len__(self):
+        return min(self._next, self.capacity)
+
+    def export(self):
+        """Chrome trace-event JSON object (complete "X" events, µs)."""
+        spans = [s for s in list(self._spans) if s is not None]
+        spans.sort(key=lambda s: s[2])
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        for name, frame_id, t_start, t_end, tid, extra in spans:
+            args = {"frame": frame_id}
+            if extra:
+                args.update(extra)
+            events.append({
+                "name": name,
+                "cat": "frame",
+                "ph": "X",
+                "ts": round((t_start - self._origin) * 1e6, 1),
+                "dur": round((t_end - t_start) * 1e6, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path):
+        """Write export() to `path`; returns the number of spans written."""
+        trace = self.export()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return sum(1 for e in trace["traceEvents"] if e["ph"] == "X")
@@ -0,0 +1,55 @@
+"""
+Latest Queue — Bounded Latest-Wins Handoff
+===========================================
+Thread-safe bounded queue used between pipeline stages. When a producer
+outruns its consumer the OLDEST item is dropped instead of blocking, so a
+slow stage never builds up latency — it always works on the freshest frame.
+"""
+
+import threading
+from collections import deque
+
+
+class LatestQueue:
+    """
+    Bounded FIFO where `put` never blocks.
+
+    When full, the oldest queued item is discarded and counted in `dropped`.
+    `get` blocks up to `timeout` seconds and returns None if nothing arrived
+    (or the queue was closed), so consumer loops can re-check their run flag.
+    """
+
+    def __init__(self, maxsize=1):
+        self.maxsize = max(1, int(maxsize))
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        """Enqueue an item, evicting the oldest one if the queue is full."""
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Dequeue the oldest item, or None on timeout / close."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def qsize(self):
+        """Current number of queued items."""
+        return len(self._items)
+
+    def close(self):
+        """Wake up all waiting consumers; subsequent gets drain then return None."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
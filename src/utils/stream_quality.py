@@ -0,0 +1,107 @@
+"""
+Stream Quality — Per-Client Adaptive JPEG Ladder
+=================================================
+Tracks one WebSocket viewer's acknowledgement latency and steps its JPEG
+quality / output scale down when it falls behind, and back up once the link
+has been healthy for a while. Pure bookkeeping — no I/O, no OpenCV.
+"""
+
+import time
+
+
+class ClientQualityLadder:
+    """
+    Picks (jpeg_quality, scale) for a single client.
+
+    Signals:
+        on_ack(rtt_ms)  → round-trip between frame send and client ack
+        on_skip()       → a frame was skipped because too many were in flight
+
+    Step DOWN when the smoothed RTT exceeds `high_ms` or frames get skipped;
+    step UP when the smoothed RTT stays under `low_ms` for `upgrade_hold` s.
+    Any step waits `cooldown` s after the previous one to avoid oscillation.
+
+    `levels` replaces LEVELS, e.g. with the (quality, scale) of pre-encoded
+    renditions, cheapest last; a None quality means "as encoded upstream".
+    """
+
+    # (jpeg_quality, scale) — index 0 is the full-quality rendition
+    LEVELS = (
+        (85, 1.0),
+        (70, 1.0),
+        (60, 0.75),
+        (50, 0.5),
+        (35, 0.5),
+    )
+
+    def __init__(self, high_ms=150.0, low_ms=60.0, cooldown=1.0,
+                 upgrade_hold=2.0, smoothing=0.2, levels=None):
+        if levels is not None:
+            self.LEVELS = tuple(levels)
+        self.high_ms = high_ms
+        self.low_ms = low_ms
+        self.cooldown = cooldown
+        self.upgrade_hold = upgrade_hold
+        self.smoothing = smoothing
+
+        self.level = 0
+        self.rtt_ms = None
+        self.skipped = 0
+        self._last_change = 0.0
+        self._healthy_since = None
+
+    @property
+    def quality(self):
+        return self.LEVELS[self.level][0]
+
+    @property
+    def scale(self):
+        return self.LEVELS[self.level][1]
+
+    def on_ack(self, rtt_ms, now=None):
+        """Fold a new RTT sample into the EMA and re-evaluate the level."""
+        now = time.monotonic() if now is None else now
+        if self.rtt_ms is None:
+            self.rtt_ms = rtt_ms
+        else:
+            self.rtt_ms += self.smoothing * (rtt_ms - self.rtt_ms)
+
+        if self.rtt_ms > self.high_ms:
+            self._healthy_since = None
+            self._step(+1, now)
+        elif self.rtt_ms < self.low_ms:
+            if self._healthy_since is None:
+                self._healthy_since = now
+            elif now - self._healthy_since >= self.upgrade_hold:
+                if self._step(-1, now):
+                    self._healthy_since = now
+        else:
+            self._healthy_since = None
+
+    def on_skip(self, now=None):
+        """The client is not keeping up with the frame rate."""
+        now = time.monotonic() if now is None else now
+        self.skipped += 1
+        self._healthy_since = None
+        self._step(+1, now)
+
+    def snapshot(self):
+        """JSON-friendly view for status reporting."""
+        return {
+            "level": self.level,
+            "quality": self.quality,
+            "scale": self.scale,
+            "rtt_ms": round(self.rtt_ms, 1) if self.rtt_ms is not None else None,
+            "skipped": self.skipped,
+        }
+
+    def _step(self, delta, now):
+        """Move `delta` levels (positive = cheaper). Returns True if changed."""
+        if now - self._last_change < self.cooldown:
+            return False
+        new_level = min(max(self.level + delta, 0), len(self.LEVELS) - 1)
+        if new_level == self.level:
+            return False
+        self.level = new_level
+        self._last_change = now
+        return True
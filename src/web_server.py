@@ -4,147 +4,198 @@ Web Server — FastAPI MJPEG Streaming
 Serves the Shadow Clone Jutsu video feed over HTTP as an MJPEG stream.
 The heavy processing runs on the server (Python/NumPy/MediaPipe),
 while the browser renders the result in a modern glassmorphism UI.
+Frames flow through a staged FramePipeline (capture → hands → clones →
+JPEG) so the stages overlap across cores.
 
 Endpoints:
     GET /            → index.html (Floating UI)
-    GET /video_feed  → MJPEG streaming response
-    GET /status      → JSON with current jutsu state & FPS
+    GET /video_feed  → MJPEG streaming response (?rendition=full|half|low|half_low)
+    WS  /ws/video    → Binary JPEG frames with per-client adaptive quality
+    GET /status      → JSON with current jutsu state, FPS & pipeline queues
+
+Several cameras can be served at once (JUTSU_SOURCES, set by run_web.py
+--sources): each gets its own CameraSession (src.engines.camera_session)
+and routes, and all of them share one bounded InferencePool for MediaPipe.
+The routes above serve the first (default) stream.
+
+    GET /streams                   → stream ids + shared inference pool stats
+    GET /streams/{id}/video_feed   → MJPEG stream of one camera (?rendition=...)
+    WS  /streams/{id}/ws/video     → WebSocket stream of one camera
+    GET /streams/{id}/status       → /status for one camera
+    GET /streams/{id}/metrics      → /metrics for one camera
+
+Browsers without a server-side camera can upload their own webcam instead
+(index.html?mode=upload): frames go up over a WebSocket and the composited
+frames come back on it. The MediaPipe calls of all upload sessions are
+grouped into pool jobs (see src.engines.inference_pool MicroBatcher); the
+models and workers for this are only created when the first browser connects.
+
+    WS  /ws/upload                 → [uint32 seq][JPEG] up, same framing down
+    GET /uploads                   → upload sessions + call grouping stats
+    GET /uploads/{id}              → status of one upload session
 """
 
-import cv2
+import os
 import time
-import threading
-import numpy as np
+import json
+import struct
+import asyncio
 import mediapipe as mp
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
-from fastapi.responses import StreamingResponse, HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from src.utils.camera_check import probe_cameras
-from src.engines.gesture_engine import GestureEngine
-from src.engines.clone_engine import CloneEngine
+from src.engines.camera_session import SessionRegistry, UploadSession, parse_sources
+from src.engines.inference_pool import InferencePool, MicroBatcher
+from src.engines.process_inference import ProcessInferencePool
+from src.engines.rendition_encoder import DEFAULT_RENDITION
+from src.utils.stream_quality import ClientQualityLadder
+from src.utils.metrics import CONTENT_TYPE, MetricsRegistry
+from src.utils.frame_trace import FrameTracer
 
 # ============================================================
-# Global State (Thread-safe via GIL for simple reads/writes)
+# Sessions (one per camera; thread-safe via GIL for simple reads/writes)
 # ============================================================
-_state = {
-    "jutsu_active": False,
-    "fps": 0,
-    "debug_mode": False,
-    "camera_index": -1,
-    "resolution": "unknown",
-    "running": False,
-}
-
-_latest_frame = None
-_frame_lock = threading.Lock()
-_camera_thread = None
-
-# ============================================================
-# Camera Processing Thread
-# ============================================================
-def camera_loop():
+# JUTSU_SOURCES (run_web.py --sources) lists several cameras; JUTSU_SOURCE
+# (--source) swaps the single webcam for a file, image directory, synthetic
+# generator or recorded session
+_streams = parse_sources(os.environ.get("JUTSU_SOURCES") or os.environ.get("JUTSU_SOURCE"))
+_realtime = os.environ.get("JUTSU_SOURCE_FAST") != "1"
+
+# Shared MediaPipe workers: on by default with more than one camera,
+# JUTSU_INFERENCE_WORKERS=N forces N workers (0 = private models per camera).
+# JUTSU_INFERENCE_PROCESSES=N runs them as N worker processes instead, with
+# frames handed over in shared memory, so inference leaves this process's GIL
+_pool_processes = int(os.environ.get("JUTSU_INFERENCE_PROCESSES") or 0)
+_pool_workers = os.environ.get("JUTSU_INFERENCE_WORKERS")
+_pool_workers = int(_pool_workers) if _pool_workers else (2 if len(_streams) > 1 else 0)
+_pool = None    # built at startup (see _make_pool), not at import
+
+# Per-frame span ring buffer (dumped from /debug/trace)
+_tracer = FrameTracer()
+
+# Prometheus-style metrics (scraped from /metrics); the default stream
+# records here, additional streams into their own registries
+_metrics = MetricsRegistry()
+
+# Adaptive quality: each camera steps its quality tier to hold this FPS
+# (JUTSU_TARGET_FPS, run_web.py --target-fps; unset or 0 = fixed quality)
+_target_fps = float(os.environ.get("JUTSU_TARGET_FPS") or 0.0)
+
+# JPEG encoder threads per camera (JUTSU_ENCODE_WORKERS, run_web.py
+# --encode-workers); each subscribed rendition is encoded in parallel
+_encode_workers = int(os.environ.get("JUTSU_ENCODE_WORKERS") or 2)
+
+# Opt-in engine modes (run_web.py --roi-tracking, --adaptive-rate,
+# --seal-sequences, --mask-reuse, --motion-threshold, --compositor); unset
+# settings keep the engines' defaults (camera_session.ENGINE_OPTIONS)
+_engine_options = {}
+if os.environ.get("JUTSU_ROI_TRACKING") == "1":
+    _engine_options["roi_tracking"] = True
+if os.environ.get("JUTSU_ADAPTIVE_RATE") == "1":
+    _engine_options["adaptive_rate"] = True
+if os.environ.get("JUTSU_SEAL_SEQUENCES") == "1":
+    _engine_options["seal_sequences"] = True
+if os.environ.get("JUTSU_MASK_REUSE"):
+    _engine_options["mask_reuse"] = int(os.environ["JUTSU_MASK_REUSE"])
+if os.environ.get("JUTSU_MOTION_THRESHOLD"):
+    _engine_options["motion_threshold"] = float(os.environ["JUTSU_MOTION_THRESHOLD"])
+if os.environ.get("JUTSU_COMPOSITOR"):
+    _engine_options["compositor"] = os.environ["JUTSU_COMPOSITOR"]
+if os.environ.get("JUTSU_INFERENCE_WIDTH"):
+    _engine_options["inference_width"] = int(os.environ["JUTSU_INFERENCE_WIDTH"])
+
+_sessions = SessionRegistry(engine_options=_engine_options)
+for _i, (_stream_id, _spec) in enumerate(_streams):
+    if _i == 0:
+        _sessions.add(_stream_id, _spec, _realtime, metrics=_metrics, tracer=_tracer,
+                      target_fps=_target_fps, encode_workers=_encode_workers)
+    else:
+        _sessions.add(_stream_id, _spec, _realtime, target_fps=_target_fps,
+                      encode_workers=_encode_workers)
+
+
+def _make_pool():
     """
-    Background thread that captures frames, runs gesture detection
-    and clone rendering, and stores the latest JPEG-encoded frame.
+    The configured shared inference pool (or None). Called from the lifespan
+    startup, so importing the app (tests, uvicorn's reloader) creates no
+    worker threads, processes or shared memory.
     """
-    global _latest_frame
-
-    # 1. Camera Init
-    try:
-        cam_idx = probe_cameras()
-        cap = cv2.VideoCapture(cam_idx, cv2.CAP_DSHOW)
-        if not cap.isOpened():
-            print("[FATAL] Camera failed to open.")
-            return
-    except Exception as e:
-        print(f"[FATAL] Camera probe failed: {e}")
-        return
-
-    w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    _state["camera_index"] = cam_idx
-    _state["resolution"] = f"{w}x{h}"
-    _state["running"] = True
-
-    print(f"[CAMERA] Index {cam_idx} | {w}x{h} | Backend: {cap.getBackendName()}")
-
-    # 2. Engine Init
-    gesture = GestureEngine(touch_threshold=0.05)
-    cloner = CloneEngine(offset_x=350, clone_alpha=0.7, tint_bgr=(255, 100, 100))
-
-    prev_time = time.time()
-    frame_count = 0
-
-    while _state["running"]:
-        ret, frame = cap.read()
-        if not ret:
-            continue
-
-        frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Gesture Detection
-        active, hand_results = gesture.detect(frame_rgb)
-        _state["jutsu_active"] = active
-
-        # Clone Rendering
-        output = cloner.render(frame, active=active)
-
-        # Debug overlay (optional, toggled via /toggle_debug)
-        if _state["debug_mode"]:
-            output = gesture.draw_landmarks(output, hand_results)
-            status_color = (0, 255, 0) if active else (0, 0, 255)
-            label = "JUTSU: ACTIVE" if active else "JUTSU: INACTIVE"
-            cv2.putText(output, label, (10, 60),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
-
-        # FPS
-        now = time.time()
-        elapsed = now - prev_time
-        fps = 1.0 / elapsed if elapsed > 0 else 0
-        prev_time = now
-        _state["fps"] = round(fps, 1)
-        frame_count += 1
-
-        # FPS overlay
-        cv2.putText(output, f"FPS: {int(fps)}", (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-
-        # Encode to JPEG
-        _, jpeg = cv2.imencode('.jpg', output, [cv2.IMWRITE_JPEG_QUALITY, 85])
-
-        with _frame_lock:
-            _latest_frame = jpeg.tobytes()
-
-        # Periodic log
-        if frame_count % 300 == 0:
-            print(f"[PERF] Frame {frame_count} | FPS: {int(fps)} | Jutsu: {'ON' if active else 'OFF'}")
-
-    cap.release()
-    print("[CAMERA] Released.")
-
+    if _pool_processes > 0:
+        pool = ProcessInferencePool(workers=_pool_processes)
+    elif _pool_workers > 0:
+        pool = InferencePool(workers=_pool_workers)
+    else:
+        return None
+    _metrics.counter(
+        "jutsu_inference_calls_total", "Shared inference pool calls.", ("model",)
+    ).set_function(lambda: {(kind,): n for kind, n in pool.calls.items()})
+    _metrics.gauge(
+        "jutsu_inference_pending", "Inference jobs waiting for a pool worker."
+    ).set_function(pool.pending)
+    return pool
+
+
+# Browser uploads: every upload session's MediaPipe calls are grouped into
+# jobs on the camera pool (or a pool of their own when cameras have private
+# models). Created on the first upload, so servers nobody uploads to pay nothing.
+_upload_pool = None
+_upload_hands = None
+_upload_segmentor = None
+_uploads = {}   # upload id → UploadSession
+UPLOAD_MAX_SESSIONS = int(os.environ.get("JUTSU_MAX_UPLOADS") or 16)
+
+_upload_seconds = _metrics.histogram(
+    "jutsu_upload_process_seconds", "Decode → inference → composite → encode per uploaded frame.")
+_metrics.gauge("jutsu_upload_sessions", "Connected upload sessions.").set_function(
+    lambda: len(_uploads))
+_metrics.counter(
+    "jutsu_upload_dropped_frames_total", "Uploaded frames superseded before processing."
+).set_function(lambda: sum(u.dropped for u in list(_uploads.values())))
+
+
+def _session(stream_id):
+    """Session for `stream_id` or a 404."""
+    session = _sessions.get(stream_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown stream '{stream_id}'")
+    return session
+
+
+def _trace_response(tracer, filename):
+    """A FrameTracer's spans as a downloadable Chrome trace JSON file."""
+    return JSONResponse(
+        tracer.export(),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-def generate_mjpeg():
-    """Generator that yields MJPEG frames for StreamingResponse."""
-    while _state["running"]:
-        with _frame_lock:
-            frame = _latest_frame
 
-        if frame is None:
-            time.sleep(0.01)
-            continue
+async def generate_mjpeg(session, rendition=DEFAULT_RENDITION):
+    """
+    Async generator that yields MJPEG parts for StreamingResponse.
 
+    Runs on the event loop (no threadpool worker per client): it awaits the
+    rendition broadcaster's new-frame notification, so each frame is sent at
+    most once and a slow client skips straight to the newest frame. While
+    subscribed, the client keeps its rendition being encoded.
+    """
+    client = id(asyncio.current_task())
+    async for frame in session.encoder.broadcaster(rendition).subscribe():
+        frame_id = session.last_output_id
+        t0 = time.perf_counter()
         yield (
             b"--frame\r\n"
             b"Content-Type: image/jpeg\r\n\r\n"
             + frame
             + b"\r\n"
         )
-        # Throttle to ~60fps max to avoid overwhelming the client
-        time.sleep(0.016)
+        # Resumed once the server has written the part to the client
+        t1 = time.perf_counter()
+        session.stage_seconds.observe(t1 - t0, stage="send")
+        session.tracer.span("send", frame_id, t0, t1, transport="mjpeg", client=client,
+                            rendition=rendition)
 
 
 # ============================================================
@@ -153,20 +204,25 @@ def generate_mjpeg():
 @asynccontextmanager
 async def lifespan(app):
     """Modern lifespan handler — clean startup & shutdown."""
-    global _camera_thread
-
+    global _pool
     # — Startup —
-    _camera_thread = threading.Thread(target=camera_loop, daemon=True)
-    _camera_thread.start()
-    print("[SERVER] Camera thread started.")
+    _pool = _make_pool()
+    _sessions.use_pool(_pool)
+    _sessions.start(asyncio.get_running_loop())
+    print(f"[SERVER] Camera threads started: {', '.join(_sessions.ids())}"
+          + (f" (shared inference: {_pool.workers} "
+             f"{'processes' if _pool_processes else 'workers'})" if _pool is not None else ""))
 
     yield  # App is running
 
     # — Shutdown (Ctrl+C) —
-    print("[SERVER] Shutting down camera thread...")
-    _state["running"] = False
-    if _camera_thread is not None:
-        _camera_thread.join(timeout=3.0)
+    print("[SERVER] Shutting down camera threads...")
+    if _upload_hands is not None:
+        _upload_hands.stop()
+        _upload_segmentor.stop()
+    _sessions.stop()
+    if _upload_pool is not None and _upload_pool is not _pool:
+        _upload_pool.stop()
     print("[SERVER] Clean shutdown complete.")
 
 
@@ -187,32 +243,311 @@ async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-@app.get("/video_feed")
-async def video_feed():
-    """MJPEG streaming endpoint."""
+def _mjpeg_response(session, rendition):
+    if rendition not in session.encoder.renditions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown rendition '{rendition}' "
+                   f"(expected one of {', '.join(session.encoder.renditions)})")
     return StreamingResponse(
-        generate_mjpeg(),
+        generate_mjpeg(session, rendition),
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
 
+@app.get("/video_feed")
+async def video_feed(rendition: str = DEFAULT_RENDITION):
+    """MJPEG streaming endpoint."""
+    return _mjpeg_response(_sessions.default, rendition)
+
+
+@app.get("/streams/{stream_id}/video_feed")
+async def stream_video_feed(stream_id: str, rendition: str = DEFAULT_RENDITION):
+    """MJPEG stream of one camera."""
+    return _mjpeg_response(_session(stream_id), rendition)
+
+
+# WebSocket video: at most this many unacknowledged frames per client
+WS_MAX_IN_FLIGHT = 2
+# Ladder levels → encoder renditions, by bytes per frame (cheapest last)
+WS_RENDITIONS = ("full", "low", "half", "half_low")
+# Forget un-acked frames older than this (lost acks must not stall a client)
+WS_ACK_TIMEOUT = 2.0
+
+
+async def _serve_ws_video(websocket, session):
+    """
+    Binary WebSocket video transport.
+
+    Each message is a 4-byte big-endian sequence number followed by a JPEG.
+    The client answers every decoded frame with a text `{"ack": seq}`; the
+    measured round-trip drives a per-client ClientQualityLadder whose levels
+    are the session encoder's renditions (WS_RENDITIONS), so clients share
+    the encodes instead of re-encoding per client. Clients that have too
+    many frames in flight skip frames and get stepped down to a cheaper
+    rendition instead of forcing the server to buffer.
+    """
+    await websocket.accept()
+    encoder = session.encoder
+    ladder = ClientQualityLadder(levels=[
+        (quality, scale) for scale, quality in (encoder.renditions[n] for n in WS_RENDITIONS)])
+    key = id(websocket)
+    session.ws_clients[key] = ladder
+    # Keep the client's current rendition encoded while it is connected
+    rendition = WS_RENDITIONS[ladder.level]
+    encoder.hold(rendition)
+    in_flight = {}  # seq → send timestamp
+
+    async def receive_acks():
+        try:
+            while True:
+                message = await websocket.receive_text()
+                try:
+                    seq = json.loads(message).get("ack")
+                except (ValueError, AttributeError):
+                    continue
+                sent_at = in_flight.pop(seq, None)
+                if sent_at is not None:
+                    ladder.on_ack((time.monotonic() - sent_at) * 1000.0)
+        except WebSocketDisconnect:
+            pass
+
+    ack_task = asyncio.create_task(receive_acks())
+    try:
+        seq = 0
+        frame_seq = 0   # broadcaster seq of the last rendition frame taken
+        while True:
+            if WS_RENDITIONS[ladder.level] != rendition:
+                encoder.release(rendition)
+                rendition = WS_RENDITIONS[ladder.level]
+                encoder.hold(rendition)
+                # Only frames encoded from now on (an idle rendition's last one is stale)
+                frame_seq = encoder.broadcaster(rendition).latest()[0]
+            prev = frame_seq
+            frame_seq, jpeg = await encoder.broadcaster(rendition).wait_next(frame_seq)
+            if jpeg is None or ack_task.done():
+                break
+            if prev and frame_seq > prev + 1:
+                session.ws_skipped += frame_seq - prev - 1
+
+            now = time.monotonic()
+            for stale in [s for s, t in in_flight.items() if now - t > WS_ACK_TIMEOUT]:
+                del in_flight[stale]
+            if len(in_flight) >= WS_MAX_IN_FLIGHT:
+                ladder.on_skip(now)
+                session.ws_backpressure.inc()
+                continue
+
+            seq = (seq + 1) & 0xFFFFFFFF
+            in_flight[seq] = time.monotonic()
+            frame_id = session.last_output_id
+            t0 = time.perf_counter()
+            await websocket.send_bytes(struct.pack(">I", seq) + jpeg)
+            t1 = time.perf_counter()
+            session.stage_seconds.observe(t1 - t0, stage="send")
+            session.tracer.span("send", frame_id, t0, t1,
+                                transport="ws", client=key, rendition=rendition)
+    except (WebSocketDisconnect, RuntimeError):
+        # Client went away mid-send
+        pass
+    finally:
+        ack_task.cancel()
+        session.ws_clients.pop(key, None)
+        encoder.release(rendition)
+
+
+@app.websocket("/ws/video")
+async def ws_video(websocket: WebSocket):
+    """WebSocket video of the default stream (see _serve_ws_video)."""
+    await _serve_ws_video(websocket, _sessions.default)
+
+
+@app.websocket("/streams/{stream_id}/ws/video")
+async def stream_ws_video(websocket: WebSocket, stream_id: str):
+    """WebSocket video of one camera."""
+    session = _sessions.get(stream_id)
+    if session is None:
+        await websocket.close(code=1008)
+        return
+    await _serve_ws_video(websocket, session)
+
+
+def _upload_models():
+    """(hands, segmentor) call groupers shared by all uploads, started on first use."""
+    global _upload_pool, _upload_hands, _upload_segmentor
+    if _upload_hands is None:
+        _upload_pool = _pool if _pool is not None else InferencePool(
+            workers=int(os.environ.get("JUTSU_UPLOAD_WORKERS") or 2)).start()
+        _upload_hands = MicroBatcher(_upload_pool, "hands").start()
+        _upload_segmentor = MicroBatcher(_upload_pool, "segmentation").start()
+    return _upload_hands, _upload_segmentor
+
+
+@app.websocket("/ws/upload")
+async def ws_upload(websocket: WebSocket):
+    """
+    Browser-upload processing.
+
+    The client sends its webcam frames as [uint32 seq][JPEG] and receives
+    the composited frame with the same framing and seq. The first message
+    from the server is a text `{"upload": id}` (for /uploads/{id}). Only the
+    newest unprocessed upload is kept, so a client that sends faster than
+    it can be served sees one frame of queueing, never a backlog.
+    """
+    await websocket.accept()
+    if len(_uploads) >= UPLOAD_MAX_SESSIONS:
+        await websocket.close(code=1013)  # Try again later
+        return
+    session = UploadSession(*_upload_models(), engine_options=_engine_options)
+    _uploads[session.id] = session
+    latest = [None]   # newest upload not yet processed
+    ready = asyncio.Event()
+
+    async def receive_uploads():
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                data = message.get("bytes")
+                if data and len(data) > 4:
+                    if latest[0] is not None:
+                        session.dropped += 1
+                    latest[0] = data
+                    ready.set()
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            ready.set()
+
+    receive_task = asyncio.create_task(receive_uploads())
+    try:
+        await websocket.send_text(json.dumps({"upload": session.id}))
+        while True:
+            await ready.wait()
+            ready.clear()
+            data, latest[0] = latest[0], None
+            if data is None:
+                if receive_task.done():
+                    break
+                continue
+            t0 = time.perf_counter()
+            jpeg, _ = await asyncio.to_thread(session.process, data[4:])
+            _upload_seconds.observe(time.perf_counter() - t0)
+            if jpeg is not None:
+                await websocket.send_bytes(data[:4] + jpeg)
+    except (WebSocketDisconnect, RuntimeError):
+        # Client went away mid-send, or the call groupers shut down
+        pass
+    finally:
+        receive_task.cancel()
+        _uploads.pop(session.id, None)
+
+
+def _upload(upload_id):
+    """Upload session for `upload_id` or a 404."""
+    session = _uploads.get(upload_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown upload session {upload_id}")
+    return session
+
+
+@app.get("/uploads")
+async def uploads():
+    """Connected upload sessions and the inference pool serving them."""
+    return JSONResponse({
+        "uploads": [u.status() for u in list(_uploads.values())],
+        "max_sessions": UPLOAD_MAX_SESSIONS,
+        "inference_pool": _upload_pool.stats() if _upload_pool is not None else None,
+    })
+
+
+@app.get("/uploads/{upload_id}")
+async def upload_status(upload_id: int):
+    """Status of one upload session."""
+    return JSONResponse(_upload(upload_id).status())
+
+
+@app.post("/uploads/{upload_id}/toggle_debug")
+async def upload_toggle_debug(upload_id: int):
+    """Toggle the landmark overlay of one upload session."""
+    state = _upload(upload_id).state
+    state["debug_mode"] = not state["debug_mode"]
+    return JSONResponse({
+        "debug_mode": state["debug_mode"]
+    })
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition: stage histograms, frame/drop counters, clients."""
+    return Response(_metrics.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/streams/{stream_id}/metrics")
+async def stream_metrics(stream_id: str):
+    """Prometheus text exposition for one camera."""
+    return Response(_session(stream_id).metrics.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/debug/trace")
+async def debug_trace():
+    """
+    Recent per-frame spans (capture → send) in Chrome trace-event format.
+    Open the downloaded file in chrome://tracing or ui.perfetto.dev.
+    """
+    return _trace_response(_tracer, "jutsu_trace.json")
+
+
+@app.get("/streams/{stream_id}/debug/trace")
+async def stream_debug_trace(stream_id: str):
+    """/debug/trace for one camera."""
+    session = _session(stream_id)
+    return _trace_response(session.tracer, f"jutsu_trace_{session.id}.json")
+
+
 @app.get("/status")
 async def status():
     """JSON endpoint for current jutsu state."""
+    return JSONResponse(dict(_sessions.default.status(), streams=_sessions.ids()))
+
+
+@app.get("/streams")
+async def streams():
+    """Configured streams and the shared inference pool."""
     return JSONResponse({
-        "jutsu_active": _state["jutsu_active"],
-        "fps": _state["fps"],
-        "debug_mode": _state["debug_mode"],
-        "camera_index": _state["camera_index"],
-        "resolution": _state["resolution"],
-        "running": _state["running"],
+        "streams": [
+            {"id": s.id, "source": s.state["source"], "resolution": s.state["resolution"],
+             "running": s.state["running"], "fps": s.state["fps"],
+             "quality": s.controller.tier["name"] if s.controller is not None else None,
+             "renditions": s.encoder.active()}
+            for s in _sessions
+        ],
+        "inference_pool": _pool.stats() if _pool is not None else None,
     })
 
 
+@app.get("/streams/{stream_id}/status")
+async def stream_status(stream_id: str):
+    """/status for one camera."""
+    return JSONResponse(_session(stream_id).status())
+
+
 @app.post("/toggle_debug")
 async def toggle_debug():
     """Toggle debug overlay on the video stream."""
-    _state["debug_mode"] = not _state["debug_mode"]
+    state = _sessions.default.state
+    state["debug_mode"] = not state["debug_mode"]
+    return JSONResponse({
+        "debug_mode": state["debug_mode"]
+    })
+
+
+@app.post("/streams/{stream_id}/toggle_debug")
+async def stream_toggle_debug(stream_id: str):
+    """Toggle the debug overlay of one camera."""
+    state = _session(stream_id).state
+    state["debug_mode"] = not state["debug_mode"]
     return JSONResponse({
-        "debug_mode": _state["debug_mode"]
+        "debug_mode": state["debug_mode"]
     })
@@ -1,8 +1,22 @@
 /**
  * Shadow Clone Jutsu — Client-side Controller
  * Polls the /status endpoint and updates the UI in real-time.
+ * Streams video over the /ws/video WebSocket (binary JPEG frames with
+ * per-frame acks for adaptive quality), falling back to MJPEG.
+ * With ?mode=upload the browser's own webcam is sent to /ws/upload instead
+ * and the server returns the composited frames.
  */
 
+const PARAMS = new URLSearchParams(location.search);
+const UPLOAD_MODE = PARAMS.get('mode') === 'upload';
+// ?rendition=half|low|half_low streams that MJPEG rendition instead of the WebSocket
+const RENDITION = PARAMS.get('rendition');
+let uploadId = null; // assigned by the server on /ws/upload
+
+function statusUrl() {
+    return UPLOAD_MODE && uploadId !== null ? `/uploads/${uploadId}` : '/status';
+}
+
 // ============================================================
 // State Polling
 // ============================================================
@@ -10,7 +24,8 @@ const POLL_INTERVAL = 250; // ms
 
 async function pollStatus() {
     try {
-        const res = await fetch('/status');
+        if (UPLOAD_MODE && uploadId === null) return;
+        const res = await fetch(statusUrl());
         if (!res.ok) return;
         const data = await res.json();
 
@@ -37,9 +52,24 @@ async function pollStatus() {
 
         // Update Status Panel
         const statusCamera = document.getElementById('status-camera');
-        statusCamera.textContent = `●  Index ${data.camera_index} (${data.resolution})`;
+        statusCamera.textContent = data.upload !== undefined
+            ? `●  Browser (${data.resolution})`
+            : `●  Index ${data.camera_index} (${data.resolution})`;
         statusCamera.className = 'status-value ' + (data.running ? 'status-ok' : 'status-inactive');
 
+        // Adaptive quality tier (null when quality is fixed)
+        const statusQuality = document.getElementById('status-quality');
+        if (data.quality) {
+            const q = data.quality;
+            statusQuality.textContent = `${q.tier} (${q.level + 1}/${q.levels}) → ${q.target_fps} fps`;
+            statusQuality.title = `Bottleneck: ${q.bottleneck} ${q.bottleneck_ms} ms / ${q.budget_ms} ms budget`;
+            statusQuality.className = 'status-value ' + (q.level > 0 ? 'status-inactive' : 'status-ok');
+        } else {
+            statusQuality.textContent = 'Fixed';
+            statusQuality.title = '';
+            statusQuality.className = 'status-value';
+        }
+
         const statusJutsu = document.getElementById('status-jutsu');
         if (data.jutsu_active) {
             statusJutsu.textContent = '●  ACTIVE';
@@ -68,12 +98,184 @@ setInterval(pollStatus, POLL_INTERVAL);
 // Initial poll
 pollStatus();
 
+// ============================================================
+// Video Transport (WebSocket → MJPEG fallback)
+// ============================================================
+const RECONNECT_DELAY = 1000; // ms
+
+let shownFrameUrl = null;
+let pendingFrame = null; // { url, seq } — set as src, not yet decoded
+
+function setStreamStatus(transport) {
+    const statusStream = document.getElementById('status-stream');
+    statusStream.textContent = transport === 'websocket' ? '●  WebSocket'
+        : transport === 'mjpeg' ? '●  MJPEG'
+        : transport === 'upload' ? '●  Upload'
+        : '○  Connecting...';
+}
+
+function startMjpeg() {
+    setStreamStatus('mjpeg');
+    document.getElementById('video-feed').src = RENDITION
+        ? `/video_feed?rendition=${encodeURIComponent(RENDITION)}` : '/video_feed';
+}
+
+function ackFrame(socket, seq) {
+    if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ ack: seq }));
+    }
+}
+
+function startVideoSocket() {
+    if (!('WebSocket' in window)) {
+        startMjpeg();
+        return;
+    }
+
+    const videoFeed = document.getElementById('video-feed');
+    const proto = location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${proto}://${location.host}/ws/video`);
+    socket.binaryType = 'arraybuffer';
+    let received = false;
+
+    // Ack once the browser has actually decoded the frame, so the server's
+    // round-trip measurement includes our download + decode time.
+    videoFeed.onload = () => {
+        if (!pendingFrame || videoFeed.src !== pendingFrame.url) return;
+        if (shownFrameUrl) URL.revokeObjectURL(shownFrameUrl);
+        shownFrameUrl = pendingFrame.url;
+        ackFrame(socket, pendingFrame.seq);
+        pendingFrame = null;
+    };
+
+    socket.onmessage = (event) => {
+        if (!received) {
+            received = true;
+            setStreamStatus('websocket');
+        }
+        // [uint32 seq (big-endian)][JPEG bytes]
+        const seq = new DataView(event.data).getUint32(0);
+        const blob = new Blob([new Uint8Array(event.data, 4)], { type: 'image/jpeg' });
+
+        // Superseded before it decoded: drop it but still ack the receipt
+        if (pendingFrame) {
+            URL.revokeObjectURL(pendingFrame.url);
+            ackFrame(socket, pendingFrame.seq);
+        }
+        pendingFrame = { url: URL.createObjectURL(blob), seq };
+        videoFeed.src = pendingFrame.url;
+    };
+
+    socket.onclose = () => {
+        videoFeed.onload = null;
+        if (!received) {
+            // WebSocket unavailable (proxy, old server) — use MJPEG
+            startMjpeg();
+        } else {
+            setStreamStatus('connecting');
+            setTimeout(startVideoSocket, RECONNECT_DELAY);
+        }
+    };
+}
+
+// ============================================================
+// Upload Mode (browser webcam → server → composited frames)
+// ============================================================
+const UPLOAD_WIDTH = 640;
+const UPLOAD_QUALITY = 0.7;
+const UPLOAD_STALL = 1000; // ms without a reply before sending again
+
+async function startUploadSocket() {
+    const videoFeed = document.getElementById('video-feed');
+    let stream;
+    try {
+        stream = await navigator.mediaDevices.getUserMedia({
+            video: { width: { ideal: UPLOAD_WIDTH } }, audio: false,
+        });
+    } catch (err) {
+        console.error('Webcam unavailable:', err);
+        setStreamStatus('connecting');
+        return;
+    }
+    const camera = document.createElement('video');
+    camera.muted = true;
+    camera.playsInline = true;
+    camera.srcObject = stream;
+    await camera.play();
+
+    const canvas = document.createElement('canvas');
+    const proto = location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${proto}://${location.host}/ws/upload`);
+    socket.binaryType = 'arraybuffer';
+    let seq = 0;
+    let sentAt = 0; // 0 = nothing in flight
+
+    // One frame in flight: the next one is captured when the reply arrives,
+    // so the upload rate follows what the server can process for us
+    function sendFrame() {
+        if (socket.readyState !== WebSocket.OPEN || sentAt || !camera.videoWidth) return;
+        const scale = Math.min(1, UPLOAD_WIDTH / camera.videoWidth);
+        canvas.width = Math.round(camera.videoWidth * scale);
+        canvas.height = Math.round(camera.videoHeight * scale);
+        canvas.getContext('2d').drawImage(camera, 0, 0, canvas.width, canvas.height);
+        sentAt = performance.now();
+        canvas.toBlob(async (blob) => {
+            if (!blob || socket.readyState !== WebSocket.OPEN) { sentAt = 0; return; }
+            const header = new DataView(new ArrayBuffer(4));
+            seq = (seq + 1) >>> 0;
+            header.setUint32(0, seq);
+            socket.send(new Blob([header, blob]));
+        }, 'image/jpeg', UPLOAD_QUALITY);
+    }
+
+    const stallTimer = setInterval(() => {
+        if (sentAt && performance.now() - sentAt > UPLOAD_STALL) {
+            sentAt = 0;
+            sendFrame();
+        }
+    }, UPLOAD_STALL / 2);
+
+    socket.onopen = () => setStreamStatus('upload');
+
+    socket.onmessage = (event) => {
+        if (typeof event.data === 'string') {
+            uploadId = JSON.parse(event.data).upload;
+            sendFrame();
+            return;
+        }
+        const blob = new Blob([new Uint8Array(event.data, 4)], { type: 'image/jpeg' });
+        if (shownFrameUrl) URL.revokeObjectURL(shownFrameUrl);
+        shownFrameUrl = URL.createObjectURL(blob);
+        videoFeed.src = shownFrameUrl;
+        sentAt = 0;
+        sendFrame();
+    };
+
+    socket.onclose = () => {
+        clearInterval(stallTimer);
+        stream.getTracks().forEach((track) => track.stop());
+        uploadId = null;
+        setStreamStatus('connecting');
+        setTimeout(startUploadSocket, RECONNECT_DELAY);
+    };
+}
+
+if (UPLOAD_MODE) {
+    startUploadSocket();
+} else if (RENDITION) {
+    startMjpeg();
+} else {
+    startVideoSocket();
+}
+
 // ============================================================
 // Controls
 // ============================================================
 async function toggleDebug() {
     try {
-        await fetch('/toggle_debug', { method: 'POST' });
+        const url = UPLOAD_MODE && uploadId !== null
+            ? `/uploads/${uploadId}/toggle_debug` : '/toggle_debug';
+        await fetch(url, { method: 'POST' });
         pollStatus(); // Immediate refresh
     } catch (err) {
         console.error('Toggle debug failed:', err);